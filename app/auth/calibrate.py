@@ -0,0 +1,76 @@
+from app.auth.password import build_context, hash_parameters
+from statistics import median
+
+import click
+import os
+import time
+
+
+# python -m app.auth.calibrate --target-ms 250
+
+MIN_MEMORY_COST = 19456  # Kio, minimum recommandé par l'OWASP pour argon2id
+MAX_TIME_COST = 20
+
+
+def measure(time_cost, memory_cost, parallelism, samples=5):
+    """Renvoie la durée médiane (en secondes) d'un hachage argon2 avec les paramètres donnés."""
+    context = build_context(time_cost, memory_cost, parallelism)
+    durations = []
+
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration")
+        durations.append(time.perf_counter() - start)
+
+    return median(durations)
+
+
+def calibrate(target, memory_cost, parallelism, samples=5, min_memory_cost=MIN_MEMORY_COST):
+    """
+    Cherche les paramètres argon2 dont la durée de hachage approche la cible (en secondes) sans la dépasser.
+
+    La mémoire est réduite de moitié tant qu'un seul passage dépasse la cible, puis le nombre
+    de passages est augmenté tant que la cible n'est pas atteinte. Renvoie (paramètres, durée).
+    """
+    time_cost = 1
+    duration = measure(time_cost, memory_cost, parallelism, samples)
+
+    while duration > target and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        duration = measure(time_cost, memory_cost, parallelism, samples)
+
+    while time_cost < MAX_TIME_COST:
+        next_duration = measure(time_cost + 1, memory_cost, parallelism, samples)
+        if next_duration > target:
+            break
+        time_cost += 1
+        duration = next_duration
+
+    return {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism}, duration
+
+
+@click.command()
+@click.option("--target-ms", type=click.IntRange(min=1), default=250, show_default=True,
+              help="Durée cible d'un hachage, en millisecondes.")
+@click.option("--memory-cost", type=click.IntRange(min=8), default=hash_parameters("standard")["memory_cost"],
+              show_default=True, help="Mémoire de départ, en Kio.")
+@click.option("--parallelism", type=click.IntRange(min=1), default=min(4, os.cpu_count() or 1),
+              show_default=True, help="Nombre de voies de calcul.")
+@click.option("--samples", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Nombre de hachages mesurés par combinaison de paramètres.")
+def main(target_ms, memory_cost, parallelism, samples):
+    """Calibre les paramètres argon2 pour une durée de hachage cible sur la machine courante."""
+    current = hash_parameters()
+    print(f"Paramètres courants : {current} -> "
+          f"{measure(**current, samples=samples) * 1000:.0f} ms par hachage")
+
+    parameters, duration = calibrate(target_ms / 1000, memory_cost, parallelism, samples)
+    print(f"Paramètres calibrés : {parameters} -> {duration * 1000:.0f} ms par hachage")
+    print("\nVariables d'environnement à ajouter au fichier .env :")
+    print(f"ARGON2_TIME_COST={parameters['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={parameters['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={parameters['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
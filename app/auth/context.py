@@ -0,0 +1,82 @@
+from app.auth.session import load_token
+from app.auth.token import decode_access_token
+from app.models.models import Employee, Role
+from datetime import datetime, timezone
+from sqlalchemy import select
+
+import click
+import hashlib
+
+
+# Contextes déjà vérifiés, indexés par l'empreinte du token et conservés jusqu'à son expiration
+_contexts = {}
+
+# Clé du contexte dans click.Context.meta : le fichier de token n'est lu qu'une fois par commande
+META_KEY = "epic_events.auth"
+
+
+class AuthContext:
+    """Utilisateur authentifié : payload vérifié du token et ligne Employee résolue à la demande."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.employee_number = payload["emp_number"]
+        self.role_id = payload["role_id"]
+        self.exp = payload["exp"]
+        self._employee = None
+
+    def is_expired(self):
+        return self.exp <= datetime.now(tz=timezone.utc).timestamp()
+
+    def get_employee(self, session):
+        """
+        Renvoie l'employé connecté (id, numéro, nom, email, rôle) sous forme de ligne en lecture seule.
+
+        La ligne est chargée une seule fois puis réutilisée par les commandes suivantes du shell.
+        """
+        if self._employee is None:
+            statement = (
+                select(Employee.id, Employee.employee_number, Employee.first_name, Employee.last_name,
+                       Employee.email, Employee.role_id, Role.name.label("role_name"))
+                .outerjoin(Role, Employee.role_id == Role.id)
+                .where(Employee.employee_number == self.employee_number)
+            )
+            self._employee = session.execute(statement).first()
+
+            if self._employee is None:
+                raise ValueError(f"Aucun employé trouvé avec le numéro {self.employee_number}.")
+
+        return self._employee
+
+
+def get_auth_context():
+    """
+    Renvoie le contexte d'authentification de l'utilisateur connecté, ou None sans token.
+
+    Lève une exception si le token est invalide ou expiré.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and META_KEY in ctx.meta:
+        return ctx.meta[META_KEY]
+
+    token = load_token()
+    if not token:
+        return None
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    auth = _contexts.get(key)
+
+    if auth is None or auth.is_expired():
+        _contexts.pop(key, None)
+        auth = AuthContext(decode_access_token(token))
+        _contexts[key] = auth
+
+    if ctx is not None:
+        ctx.meta[META_KEY] = auth
+
+    return auth
+
+
+def clear_auth_contexts():
+    """Oublie les contextes en cache (connexion, modification ou suppression d'un employé)."""
+    _contexts.clear()
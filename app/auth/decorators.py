@@ -1,5 +1,5 @@
-from app.auth.session import load_token
-from app.auth.token import decode_access_token
+from app.auth.context import get_auth_context
+from app.auth.permissions import get_permission, role_label
 
 from rich.console import Console
 from rich.text import Text
@@ -7,75 +7,46 @@ from rich.text import Text
 import functools
 
 
+# Messages sur la sortie d'erreur : la sortie standard peut être redirigée (export)
+console = Console(stderr=True)
+
+
 def require_token(func):
     """Vérifie la présence d'un token d'authentification."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        token = load_token()
-        console = Console()
-        if not token:
-            console.print(Text("Aucun token trouvé. Veuillez vous connecter.", style="red"))
-            return
         try:
-            payload = decode_access_token(token)
-            console.print(Text(f"Token valide pour l'utilisateur : {payload['emp_number']}", style="green"))
+            auth = get_auth_context()
         except Exception as e:
             console.print(Text(f"Token invalide ou expiré : {str(e)}", style="red"))
             return
 
+        if not auth:
+            console.print(Text("Aucun token trouvé. Veuillez vous connecter.", style="red"))
+            return
+
+        console.print(Text(f"Token valide pour l'utilisateur : {auth.employee_number}", style="green"))
         return func(*args, **kwargs)
     return wrapper
 
 
-def is_salesperson_or_manager(func):
-    """Vérifie si l'utilisateur est un commercial ou un manager."""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        token = load_token()
-        payload = decode_access_token(token)
-        console = Console()
-        if payload['role_id'] == 1:
-            console.print(Text("Accès autorisé (Commercial)", style="green"))
-            return func(*args, **kwargs)
-        elif payload['role_id'] == 3:
-            console.print(Text("Accès autorisé (Gestion)", style="green"))
-            return func(*args, **kwargs)
-        else:
-            console.print(Text("Accès refusé : cette action est réservée au département commercial.", style="red"))
-            return
-    return wrapper
-
+def require_permission(resource, action):
+    """
+    Vérifie que le rôle de l'utilisateur l'autorise à effectuer l'action (voir app/auth/permissions.py).
 
-def is_support_or_manager(func):
-    """Vérifie si l'utilisateur est un support ou un manager."""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        token = load_token()
-        payload = decode_access_token(token)
-        console = Console()
-        if payload['role_id'] == 2:
-            console.print(Text("Accès autorisé (Support)", style="green"))
-            return func(*args, **kwargs)
-        elif payload['role_id'] == 3:
-            console.print(Text("Accès autorisé (Gestion)", style="green"))
-            return func(*args, **kwargs)
-        else:
-            console.print(Text("Accès refusé : cette action est réservée au département support.", style="red"))
-            return
-    return wrapper
+    Les règles de propriété (OWN) sont ensuite contrôlées en SQL par les fonctions CRUD.
+    """
+    permission = get_permission(resource, action)
 
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            role_id = get_auth_context().role_id
+            if not permission.allows_role(role_id):
+                console.print(Text(permission.denied_message(), style="red"))
+                return
 
-def is_manager(func):
-    """Vérifie si l'utilisateur est un manager."""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        token = load_token()
-        payload = decode_access_token(token)
-        console = Console()
-        if payload['role_id'] == 3:
-            console.print(Text("Accès autorisé (Gestion)", style="green"))
+            console.print(Text(f"Accès autorisé ({role_label(role_id)})", style="green"))
             return func(*args, **kwargs)
-        else:
-            console.print(Text("Accès refusé : cette action est réservée au département gestion.", style="red"))
-            return
-    return wrapper
+        return wrapper
+    return decorator
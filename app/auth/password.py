@@ -1,11 +1,66 @@
 from passlib.context import CryptContext
+from app.config import PASSWORD_HASH_PROFILE, ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 
+import os
 
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    default="argon2",
-    deprecated="auto"
-)
+
+# Profils de coût argon2 (mémoire en Kio). Les hachages produits avec un autre profil restent valides
+# et sont recalculés avec le profil courant à la connexion suivante.
+HASH_PROFILES = {
+    # Valeurs par défaut de passlib (~250 ms sur un poste de développement)
+    "standard": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},
+    # Minimum recommandé par l'OWASP, pour les petites machines virtuelles
+    "light": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    # Tests et génération de données uniquement : n'offre aucune résistance à la force brute
+    "fast": {"time_cost": 1, "memory_cost": 8, "parallelism": 1},
+}
+
+
+def hash_parameters(profile=PASSWORD_HASH_PROFILE, time_cost=ARGON2_TIME_COST, memory_cost=ARGON2_MEMORY_COST,
+                    parallelism=ARGON2_PARALLELISM):
+    """Renvoie les paramètres argon2 d'un profil, éventuellement surchargés."""
+    if profile not in HASH_PROFILES:
+        raise ValueError(f"Le profil de hachage '{profile}' n'existe pas. Profils disponibles : "
+                         f"{', '.join(HASH_PROFILES)}.")
+
+    parameters = dict(HASH_PROFILES[profile])
+    overrides = {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism}
+
+    for name, value in overrides.items():
+        if value is not None:
+            parameters[name] = int(value)
+
+    return parameters
+
+
+def build_context(time_cost, memory_cost, parallelism):
+    """Construit un contexte passlib argon2 avec les paramètres donnés."""
+    return CryptContext(
+        schemes=["argon2"],
+        default="argon2",
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+pwd_parameters = hash_parameters()
+pwd_context = build_context(**pwd_parameters)
+
+
+def use_parameters(parameters):
+    """Applique des paramètres argon2 au processus courant."""
+    global pwd_parameters, pwd_context
+    pwd_parameters = dict(parameters)
+    pwd_context = build_context(**pwd_parameters)
+
+
+def use_profile(profile):
+    """Applique un profil argon2 au processus courant, sans surcharge (tests, génération de données)."""
+    use_parameters(hash_parameters(profile, None, None, None))
 
 
 def hash_password(password):
@@ -14,3 +69,35 @@ def hash_password(password):
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password, hashed_password):
+    """
+    Vérifie un mot de passe et renvoie (valide, nouveau hachage).
+
+    Le nouveau hachage n'est pas None lorsque le mot de passe est valide mais que son hachage
+    a été produit avec d'autres paramètres que ceux du profil courant.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+@contextmanager
+def password_hasher(workers=None):
+    """
+    Fournit une fonction qui hache une liste de mots de passe en parallèle sur un pool de processus.
+
+    Les processus reçoivent les paramètres argon2 du processus courant. Avec un seul processus,
+    le hachage est fait sur place.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        yield lambda passwords: [hash_password(password) for password in passwords]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_parameters, initargs=(pwd_parameters,)) as pool:
+        def hash_many(passwords):
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(hash_password, passwords, chunksize=chunksize))
+
+        yield hash_many
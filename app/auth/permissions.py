@@ -0,0 +1,139 @@
+from app.crud.role import role_cache
+from app.models.models import Employee
+from sqlalchemy import and_, exists, false, or_
+
+
+# Département de chaque rôle, utilisé dans les messages d'autorisation. Les identifiants des rôles sont lus
+# dans le cache des rôles (app/crud/role.py).
+DEPARTMENTS = {
+    "Commercial": "commercial",
+    "Support": "support",
+    "Management": "gestion",
+}
+
+# Règles de propriété
+ANY = "any"  # sur tous les objets
+OWN = "own"  # uniquement sur les objets dont l'employé est le contact (commercial ou support)
+
+# Politique d'accès : (ressource, action, rôle, règle de propriété).
+# Une action absente de la table pour un rôle lui est refusée.
+POLICY = [
+    ("employee", "create", "Management", ANY),
+    ("employee", "import", "Management", ANY),
+    ("employee", "update", "Management", ANY),
+    ("employee", "update-password", "Management", ANY),
+    ("employee", "delete", "Management", ANY),
+    ("employee", "handover", "Management", ANY),
+
+    ("customer", "create", "Commercial", ANY),
+    ("customer", "create", "Management", ANY),
+    ("customer", "import", "Commercial", ANY),
+    ("customer", "import", "Management", ANY),
+    ("customer", "update", "Commercial", OWN),
+    ("customer", "update", "Management", ANY),
+    ("customer", "update-contact", "Management", ANY),
+    ("customer", "delete", "Management", ANY),
+
+    ("contract", "create", "Management", ANY),
+    ("contract", "update", "Commercial", OWN),
+    ("contract", "update", "Management", ANY),
+    ("contract", "delete", "Management", ANY),
+
+    # Le propriétaire d'un événement à créer est le commercial du contrat
+    ("event", "create", "Commercial", OWN),
+    ("event", "create", "Management", ANY),
+    ("event", "update", "Support", OWN),
+    ("event", "update", "Management", ANY),
+    ("event", "update-contact", "Management", ANY),
+    ("event", "auto-assign", "Management", ANY),
+    ("event", "delete", "Management", ANY),
+
+    ("report", "sales", "Management", ANY),
+]
+
+
+class Permission:
+    """
+    Règles compilées d'une action : rôles autorisés sur tous les objets et rôles limités à leurs objets.
+
+    Les règles sont indexées par nom de rôle ; l'identifiant de rôle du token est traduit par le cache des rôles.
+    """
+
+    def __init__(self, resource, action):
+        self.resource = resource
+        self.action = action
+        self.rules = {}
+        self.any_roles = []
+        self.own_roles = []
+        self.departments = []
+
+    def add(self, role, rule):
+        if role not in DEPARTMENTS:
+            raise ValueError(f"Le rôle '{role}' n'existe pas.")
+        self.rules[role] = rule
+        (self.any_roles if rule == ANY else self.own_roles).append(role)
+        self.departments.append(DEPARTMENTS[role])
+
+    def allows_role(self, role_id, session=None):
+        """Indique si le rôle peut effectuer l'action sur au moins une partie des objets."""
+        return role_cache.name_of(role_id, session) in self.rules
+
+    def allows(self, role_id, employee_id, owner_id, session=None):
+        """Indique si l'employé peut effectuer l'action sur un objet dont le contact est owner_id."""
+        rule = self.rules.get(role_cache.name_of(role_id, session))
+        return rule == ANY or (rule == OWN and owner_id is not None and owner_id == employee_id)
+
+    def clause(self, employee_number, owner_column, session=None):
+        """
+        Expression SQL vraie si l'employé peut effectuer l'action sur la ligne courante.
+
+        La sous-requête EXISTS porte sur l'index unique employee_number et est corrélée à la colonne
+        du contact : le contrôle de propriété se fait dans la même requête que la lecture de l'objet.
+        """
+        any_ids = [role_cache.id_of(role, session) for role in self.any_roles]
+        own_ids = [role_cache.id_of(role, session) for role in self.own_roles]
+
+        conditions = []
+        if any_ids:
+            conditions.append(Employee.role_id.in_(any_ids))
+        if own_ids:
+            conditions.append(and_(Employee.role_id.in_(own_ids), Employee.id == owner_column))
+
+        if not conditions:
+            return false()
+
+        return exists().where(Employee.employee_number == employee_number, or_(*conditions))
+
+    def denied_message(self):
+        if len(self.departments) == 1:
+            return f"Accès refusé : cette action est réservée au département {self.departments[0]}."
+        return (f"Accès refusé : cette action est réservée aux départements "
+                f"{', '.join(self.departments[:-1])} et {self.departments[-1]}.")
+
+
+def role_label(role_id, session=None):
+    """Renvoie le libellé du département d'un rôle (ex : Gestion)."""
+    return DEPARTMENTS.get(role_cache.name_of(role_id, session), "inconnu").capitalize()
+
+
+def compile_policy(policy):
+    """Compile la table de politique en dictionnaire (ressource, action) -> Permission."""
+    permissions = {}
+
+    for resource, action, role, rule in policy:
+        if rule not in (ANY, OWN):
+            raise ValueError(f"La règle de propriété '{rule}' n'existe pas.")
+        permissions.setdefault((resource, action), Permission(resource, action)).add(role, rule)
+
+    return permissions
+
+
+PERMISSIONS = compile_policy(POLICY)
+
+
+def get_permission(resource, action):
+    """Renvoie les règles compilées d'une action."""
+    try:
+        return PERMISSIONS[(resource, action)]
+    except KeyError:
+        raise ValueError(f"Aucune règle d'accès définie pour l'action '{resource} {action}'.")
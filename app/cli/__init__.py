@@ -1,3 +1 @@
-from . import auth, role, employee, customer, contract, event
-
-__all__ = ["auth", "role", "employee", "customer", "contract", "event"]
+# Les modules de commandes sont importés à la demande par app.cli.group.LazyGroup
@@ -2,9 +2,10 @@ from getpass import getpass
 from app.cli.core import cli, safe_execute
 from app.crud import employee as crud_employee
 
-from app.auth.password import verify_password
-from app.auth.token import create_access_token, decode_access_token
-from app.auth.session import save_token_locally, load_token
+from app.auth.password import verify_password, verify_and_update
+from app.auth.token import create_access_token
+from app.auth.session import save_token_locally
+from app.auth.context import clear_auth_contexts, get_auth_context
 from app.auth.decorators import require_token
 
 from app.db.database import Session
@@ -26,10 +27,16 @@ def login():
 
     user = employees[0]
 
-    if verify_password(password, user.password):
+    valid, new_hash = verify_and_update(password, user.password)
+
+    if valid:
         print(f"Connexion réussie pour l'employé : {user.first_name} {user.last_name}")
+        if new_hash:
+            # Hachage produit avec d'anciens paramètres argon2 : recalculé avec le profil courant
+            safe_execute(crud_employee.update_password_hash, db, user, new_hash)
         token = create_access_token(data={"emp_number": emp_number, "role_id": user.role_id})
         save_token_locally(token)
+        clear_auth_contexts()
     else:
         print("Échec de la connexion : numéro d'employé ou mot de passe incorrect.")
 
@@ -39,8 +46,7 @@ def login():
 def change_password():
     """Changer le mot de passe de l'utilisateur connecté."""
     print("Demande de changement du mot de passe pour l'utilisateur connecté.")
-    token = load_token()
-    employee_number = decode_access_token(token)["emp_number"]
+    employee_number = get_auth_context().employee_number
     employees = crud_employee.get_employees(db, {"employee_number": employee_number}, None)
 
     try:
@@ -1,10 +1,11 @@
-from app.cli.core import cli, safe_execute, attr_val_to_dict, sort_to_dict
-from app.auth.token import decode_access_token
-from app.auth.session import load_token
-from app.auth.decorators import require_token, is_salesperson_or_manager, is_manager
+from app.cli.core import cli, safe_execute, attr_val_to_dict, filter_to_dict, sort_to_dict, \
+    export_rows, write_list
+from app.auth.context import get_auth_context
+from app.auth.decorators import require_token, require_permission
 from app.db.database import Session
 from app.crud import customer as crud_customer
 from app.crud import contract as crud_contract
+from app.crud.pagination import next_cursor
 from app.ui import views
 
 import click
@@ -21,7 +22,7 @@ def contract():
 
 @contract.command("create")
 @require_token
-@is_manager
+@require_permission("contract", "create")
 def create_contract():
     """Créer un nouveau contrat."""
     while True:
@@ -108,33 +109,104 @@ def create_contract():
         views.display_contracts([contract], "create")
 
 
+@contract.command("export")
+@click.option(
+    "--filter", "-f",
+    multiple=True,
+    help="Critère de filtrage au format attribut=valeur (mêmes critères que la commande list)."
+)
+@click.option(
+    "--sort", "-s",
+    multiple=True,
+    help="Critère de tri au format attribut=asc|desc."
+)
+@click.option(
+    "--output", "-o",
+    default="-",
+    show_default=True,
+    help="Fichier de destination ('-' pour la sortie standard)."
+)
+@click.option(
+    "--format", "-F", "file_format",
+    type=click.Choice(["csv", "ndjson"]),
+    help="Format de sortie. Par défaut : déduit de l'extension du fichier, sinon csv."
+)
+@click.option(
+    "--batch-size", "-b",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Nombre de lignes lues par aller-retour avec la base de données."
+)
+@require_token
+def export_contracts(filter, sort, output, file_format, batch_size):
+    """
+    Exporte les contrats au format CSV ou NDJSON, au fil de la lecture.
+
+    Exemple : contract export -f signed=True -s created_at=asc -o contrats.ndjson
+    """
+    filters = filter_to_dict(filter)
+    sorts = sort_to_dict(sort)
+
+    rows = safe_execute(crud_contract.stream_contracts, db, filters, sorts, batch_size)
+    if rows is not None:
+        safe_execute(export_rows, rows, crud_contract.EXPORT_FIELDS, output, file_format)
+
+
 @contract.command("list")
 @click.option(
     "--filter", "-f",
     multiple=True,
-    help="Critère de filtrage au format attribut=valeur. Exemple: -f sale_contact_id=1 -f signed=False"
+    help="Critère de filtrage au format attribut=valeur ou attribut>=valeur.\n"
+         "Exemple: -f signed=False -f total_amount>=1000"
 )
 @click.option(
     "--sort", "-s",
     multiple=True,
     help="Critère de tri au format attribut=asc|desc. Exemple: -s last_name=asc"
 )
+@click.option(
+    "--limit", "-l",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Nombre maximum de résultats par page."
+)
+@click.option(
+    "--after", "-a",
+    help="Curseur de la page suivante (ou id du dernier résultat sans critère de tri)."
+)
+@click.option(
+    "--format", "-F", "output_format",
+    type=click.Choice(["table", "json", "ndjson", "csv", "tsv"]),
+    default="table",
+    show_default=True,
+    help="Format d'affichage. Les formats autres que table sont écrits au fil de la lecture, sans mise en forme."
+)
 @require_token
-def get_contracts(filter, sort):
+def get_contracts(filter, sort, limit, after, output_format):
     """Récupère la liste des contrats en fonction des critères du filtrage et du tri."""
 
-    filters = attr_val_to_dict(filter)
+    filters = filter_to_dict(filter)
     sorts = sort_to_dict(sort)
 
-    contracts = safe_execute(crud_contract.get_contracts, db, filters, sorts)
+    if output_format != "table":
+        rows = safe_execute(crud_contract.stream_contracts, db, filters, sorts, limit=limit, after=after)
+        if rows is not None:
+            safe_execute(write_list, rows, crud_contract.EXPORT_FIELDS, output_format, sorts, limit)
+        return
+
+    contracts = safe_execute(crud_contract.get_contracts, db, filters, sorts, limit, after,
+                             views.CONTRACT_LOAD_PLAN)
     views.display_contracts(contracts, "list")
+    views.display_next_page(next_cursor(contracts, sorts, limit))
 
 
 @contract.command("update")
 @click.argument("contract_id", type=int)
 @click.argument("update", nargs=-1, required=True)
 @require_token
-@is_salesperson_or_manager
+@require_permission("contract", "update")
 def update_contract(contract_id, update):
     """
     Met à jour un contrat.
@@ -143,7 +215,7 @@ def update_contract(contract_id, update):
     """
     updates = attr_val_to_dict(update)
 
-    req_emp_num = decode_access_token(load_token())["emp_number"]
+    req_emp_num = get_auth_context().employee_number
 
     contract = safe_execute(crud_contract.update_contract, db, contract_id, updates, req_emp_num)
     if contract:
@@ -153,7 +225,7 @@ def update_contract(contract_id, update):
 @contract.command("delete")
 @click.argument("contract_id")
 @require_token
-@is_manager
+@require_permission("contract", "delete")
 def delete_contract(contract_id):
     """Supprime un contrat."""
     contracts = safe_execute(crud_contract.get_contracts, db, {"id": contract_id}, None)
@@ -1,30 +1,28 @@
+from app.cli.group import cli  # noqa: F401 (réexporté pour les modules de commandes)
 from app.db.database import Session
-from app.crud import employee as crud_employee
 
-from app.auth.token import decode_access_token
-from app.auth.session import load_token
+from app.auth.context import get_auth_context
+from app.crud.pagination import cursor_after
+from app.ui.formats import detect_format, read_rows, row_writer, write_rows
+from app.ui import views
 
 import click
+import os
+import re
 import sentry_sdk
+import time
 
 
 db = Session()
 
 
-@click.group()
-def cli():
-    """Epic Events CLI - Gestion complète des rôles, employés, clients, contrats et événements"""
-    pass
-
-
 def prepare_sentry_scope(extra_context=None):
     """Prépare le contexte Sentry pour la capture des erreurs."""
     user = None
     try:
-        emp_number = decode_access_token(load_token())["emp_number"]
-        employees = crud_employee.get_employees(db, {"employee_number": emp_number}, None)
-        if employees:
-            user = employees[0]
+        auth = get_auth_context()
+        if auth:
+            user = auth.get_employee(db)
     except Exception:
         pass
 
@@ -85,6 +83,24 @@ def attr_val_to_dict(attr_val_pairs):
     return attrs
 
 
+def filter_to_dict(filter):
+    """
+    Convertit une liste de critères de filtrage en dictionnaire.
+
+    Les opérateurs >=, <=, > et < sont conservés en tête de la valeur (ex : total_amount>=1000).
+    """
+    filters = {}
+
+    for f in filter:
+        match = re.match(r"^(\w+)\s*(>=|<=|>|<|=)(.*)$", f, re.DOTALL)
+        if not match:
+            raise click.BadParameter("Chaque filtre doit être au format attribut=valeur ou attribut>=valeur.")
+        attribute, symbol, value = match.groups()
+        filters[attribute] = value if symbol == "=" else symbol + value
+
+    return filters
+
+
 def sort_to_dict(sort):
     """Convertit une liste de critères de tri en dictionnaire."""
     sorts = {}
@@ -99,3 +115,80 @@ def sort_to_dict(sort):
         sorts[attribute] = order
 
     return sorts
+
+
+def export_rows(rows, fields, output, file_format=None):
+    """
+    Exporte des lignes au format CSV ou NDJSON dans un fichier, ou sur la sortie standard si output vaut '-'.
+
+    Sans format explicite, il est déduit de l'extension du fichier (CSV par défaut).
+    """
+    if not file_format:
+        file_format = "csv" if output == "-" else detect_format(output)
+
+    with click.open_file(output, "w", encoding="utf-8") as stream:
+        count = write_rows(stream, file_format, fields, rows)
+
+    if output != "-":
+        print(f"{count} lignes exportées vers {output}.")
+
+    return count
+
+
+def write_list(rows, fields, output_format, sorts, limit):
+    """
+    Écrit les résultats d'une commande list sur la sortie standard au format json, ndjson, csv ou tsv.
+
+    Rich n'intervient pas : chaque ligne est écrite dès sa lecture. Le curseur de la page suivante
+    est affiché sur la sortie d'erreur pour ne pas se mêler aux données.
+    """
+    last = None
+
+    def remember(rows):
+        nonlocal last
+        for row in rows:
+            last = row
+            yield row
+
+    count = write_rows(click.get_text_stream("stdout"), output_format, fields, remember(rows))
+
+    if limit and count == limit and all(attr in last for attr in sorts):
+        click.echo(f"Page suivante : --after {cursor_after(last, sorts)}", err=True)
+
+    return count
+
+
+def run_import(label, file, rejects, reject_fields, import_func, *args):
+    """
+    Importe un fichier CSV ou NDJSON avec import_func(session, lignes, *args, on_reject=...) et affiche le bilan.
+
+    Les lignes rejetées sont écrites, avec leur numéro et la raison du rejet, dans le fichier rejects
+    (par défaut <fichier>.rejects.<extension>), supprimé s'il ne contient aucune ligne.
+    """
+    try:
+        file_format = detect_format(file)
+    except ValueError as e:
+        print(f"[ERREUR] : {e}")
+        return
+
+    if not rejects:
+        base, extension = file.rsplit(".", 1)
+        rejects = f"{base}.rejects.{extension}"
+
+    with open(rejects, "w", encoding="utf-8", newline="") as rejects_file:
+        writer = row_writer(rejects_file, file_format, list(reject_fields) + ["line", "reason"])
+
+        def on_reject(line_number, row, reason):
+            writer.write({**row, "line": line_number, "reason": reason})
+
+        start = time.perf_counter()
+        result = safe_execute(import_func, db, read_rows(file, file_format), *args, on_reject=on_reject)
+        elapsed = time.perf_counter() - start
+
+    if result and not result[1]:
+        # Aucun rejet : inutile de conserver un fichier vide
+        os.remove(rejects)
+        rejects = None
+
+    if result:
+        views.display_import_report(label, *result, elapsed, rejects)
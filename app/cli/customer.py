@@ -1,10 +1,10 @@
-from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, sort_to_dict
-from app.auth.token import decode_access_token
-from app.auth.session import load_token
-from app.auth.decorators import require_token, is_salesperson_or_manager, is_manager
+from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, filter_to_dict, sort_to_dict, \
+    export_rows, run_import, write_list
+from app.auth.context import get_auth_context
+from app.auth.decorators import require_token, require_permission
 from app.db.database import Session
-from app.crud import employee as crud_employee
 from app.crud import customer as crud_customer
+from app.crud.pagination import next_cursor
 from app.ui import views
 
 import click
@@ -21,7 +21,7 @@ def customer():
 
 @customer.command("create")
 @require_token
-@is_salesperson_or_manager
+@require_permission("customer", "create")
 def create_customer():
     """Crée un nouveau client."""
     first_name = input_with_limit("Prénom du client : ", 100)
@@ -37,8 +37,7 @@ def create_customer():
     phone = input_with_limit("Téléphone du client : ", 15)
     company = input_with_limit("Entreprise du client : ", 100)
 
-    employee_number = decode_access_token(load_token())["emp_number"]
-    employee_id = crud_employee.get_employees(db, {"employee_number": employee_number}, None)[0].id
+    employee_id = get_auth_context().get_employee(db).id
 
     data = {
         "first_name": first_name,
@@ -55,33 +54,134 @@ def create_customer():
         views.display_customers([customer], "create")
 
 
+@customer.command("import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--chunk-size", "-c",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Nombre de lignes validées et insérées par transaction."
+)
+@click.option(
+    "--rejects", "-r",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Fichier recevant les lignes rejetées. Par défaut : <fichier>.rejects.<extension>"
+)
+@require_token
+@require_permission("customer", "import")
+def import_customers(file, chunk_size, rejects):
+    """
+    Importe des clients depuis un fichier CSV ou NDJSON.
+
+    Colonnes attendues : first_name, last_name, email, phone, company.
+    Les clients importés sont rattachés à l'employé connecté.
+
+    Exemple : customer import clients.csv --chunk-size 5000
+    """
+    employee_id = get_auth_context().get_employee(db).id
+
+    run_import("clients", file, rejects, crud_customer.IMPORT_FIELDS, crud_customer.import_customers,
+               employee_id, chunk_size)
+
+
+@customer.command("export")
+@click.option(
+    "--filter", "-f",
+    multiple=True,
+    help="Critère de filtrage au format attribut=valeur (mêmes critères que la commande list)."
+)
+@click.option(
+    "--sort", "-s",
+    multiple=True,
+    help="Critère de tri au format attribut=asc|desc."
+)
+@click.option(
+    "--output", "-o",
+    default="-",
+    show_default=True,
+    help="Fichier de destination ('-' pour la sortie standard)."
+)
+@click.option(
+    "--format", "-F", "file_format",
+    type=click.Choice(["csv", "ndjson"]),
+    help="Format de sortie. Par défaut : déduit de l'extension du fichier, sinon csv."
+)
+@click.option(
+    "--batch-size", "-b",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Nombre de lignes lues par aller-retour avec la base de données."
+)
+@require_token
+def export_customers(filter, sort, output, file_format, batch_size):
+    """
+    Exporte les clients au format CSV ou NDJSON, au fil de la lecture.
+
+    Exemple : customer export -f company=Acme* -o clients.csv
+    """
+    filters = filter_to_dict(filter)
+    sorts = sort_to_dict(sort)
+
+    rows = safe_execute(crud_customer.stream_customers, db, filters, sorts, batch_size)
+    if rows is not None:
+        safe_execute(export_rows, rows, crud_customer.EXPORT_FIELDS, output, file_format)
+
+
 @customer.command("list")
 @click.option(
     "--filter", "-f",
     multiple=True,
-    help="Critère de filtrage au format attribut=valeur. Exemple: -f first_name=Alice -f sale_contact_id=1"
+    help="Critère de filtrage au format attribut=valeur. Exemple: -f company=Acme* -f sale_contact_id=1"
 )
 @click.option(
     "--sort", "-s",
     multiple=True,
     help="Critère de tri au format attribut=asc|desc.\nExemple: -s last_name=asc"
 )
+@click.option(
+    "--limit", "-l",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Nombre maximum de résultats par page."
+)
+@click.option(
+    "--after", "-a",
+    help="Curseur de la page suivante (ou id du dernier résultat sans critère de tri)."
+)
+@click.option(
+    "--format", "-F", "output_format",
+    type=click.Choice(["table", "json", "ndjson", "csv", "tsv"]),
+    default="table",
+    show_default=True,
+    help="Format d'affichage. Les formats autres que table sont écrits au fil de la lecture, sans mise en forme."
+)
 @require_token
-def get_customers(filter, sort):
+def get_customers(filter, sort, limit, after, output_format):
     """Récupère la liste des clients en fonction des critères du filtrage et du tri."""
 
-    filters = attr_val_to_dict(filter)
+    filters = filter_to_dict(filter)
     sorts = sort_to_dict(sort)
 
-    customers = safe_execute(crud_customer.get_customers, db, filters, sorts)
+    if output_format != "table":
+        rows = safe_execute(crud_customer.stream_customers, db, filters, sorts, limit=limit, after=after)
+        if rows is not None:
+            safe_execute(write_list, rows, crud_customer.EXPORT_FIELDS, output_format, sorts, limit)
+        return
+
+    customers = safe_execute(crud_customer.get_customers, db, filters, sorts, limit, after,
+                             views.CUSTOMER_LOAD_PLAN)
     views.display_customers(customers, "list")
+    views.display_next_page(next_cursor(customers, sorts, limit))
 
 
 @customer.command("update")
 @click.argument("customer_id", type=int)
 @click.argument("update", nargs=-1, required=True)
 @require_token
-@is_salesperson_or_manager
+@require_permission("customer", "update")
 def update_customer(customer_id, update):
     """
     Met à jour un client.
@@ -90,7 +190,7 @@ def update_customer(customer_id, update):
     """
     updates = attr_val_to_dict(update)
 
-    req_emp_num = decode_access_token(load_token())["emp_number"]
+    req_emp_num = get_auth_context().employee_number
 
     customer = safe_execute(crud_customer.update_customer, db, customer_id, updates, req_emp_num)
     if customer:
@@ -101,7 +201,7 @@ def update_customer(customer_id, update):
 @click.argument("customer_id", type=int)
 @click.argument("sale_contact")
 @require_token
-@is_manager
+@require_permission("customer", "update-contact")
 def update_customer_sale_contact(customer_id, sale_contact):
     """
     Met à jour le contact commercial d'un client.
@@ -116,7 +216,7 @@ def update_customer_sale_contact(customer_id, sale_contact):
 @customer.command("delete")
 @click.argument("customer_id")
 @require_token
-@is_manager
+@require_permission("customer", "delete")
 def delete_customer(customer_id):
     """Supprime un client."""
     customers = safe_execute(crud_customer.get_customers, db, {"id": customer_id}, None)
@@ -1,8 +1,11 @@
 
-from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, sort_to_dict
-from app.auth.decorators import require_token, is_manager
+from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, filter_to_dict, sort_to_dict, \
+    export_rows, run_import, write_list
+from app.auth.context import clear_auth_contexts
+from app.auth.decorators import require_token, require_permission
 from app.db.database import Session
 from app.crud import employee as crud_employee
+from app.crud.pagination import next_cursor
 from app.crud import role as crud_role
 from app.ui import views
 
@@ -21,7 +24,7 @@ def employee():
 
 @employee.command("create")
 @require_token
-@is_manager
+@require_permission("employee", "create")
 def create_employee():
     """Créer un nouvel employé"""
     first_name = input_with_limit("Prénom : ", 100)
@@ -45,11 +48,14 @@ def create_employee():
     roles = safe_execute(crud_role.get_roles, db)
     views.display_roles(roles)
 
+    role_ids = [role.id for role in roles or []]
+    choices = ", ".join(str(role_id) for role_id in role_ids)
+
     while True:
-        role = input(">>> ID du rôle (1, 2 ou 3) : ")
+        role = input(f">>> ID du rôle ({choices}) : ")
         try:
             role_id = int(role)
-            if role_id in (1, 2, 3):
+            if role_id in role_ids:
                 break
         except ValueError:
             print("L'ID du rôle est incorrect.")
@@ -67,6 +73,87 @@ def create_employee():
         views.display_employees([new_employee], "create")
 
 
+@employee.command("import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--chunk-size", "-c",
+    type=click.IntRange(min=1),
+    default=500,
+    show_default=True,
+    help="Nombre de lignes hachées et insérées par transaction."
+)
+@click.option(
+    "--workers", "-w",
+    type=click.IntRange(min=1),
+    help="Nombre de processus de hachage des mots de passe. Par défaut : un par cœur."
+)
+@click.option(
+    "--rejects", "-r",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Fichier recevant les lignes rejetées (sans mot de passe). Par défaut : <fichier>.rejects.<extension>"
+)
+@require_token
+@require_permission("employee", "import")
+def import_employees(file, chunk_size, workers, rejects):
+    """
+    Importe des employés depuis un fichier CSV ou NDJSON.
+
+    Colonnes attendues : first_name, last_name, email, password et role (ID ou nom du rôle).
+    Les numéros d'employés sont attribués automatiquement.
+
+    Exemple : employee import saisonniers.csv --workers 8
+    """
+    reject_fields = [field for field in crud_employee.IMPORT_FIELDS if field != "password"]
+
+    run_import("employés", file, rejects, reject_fields, crud_employee.create_employees, chunk_size, workers)
+
+
+@employee.command("export")
+@click.option(
+    "--filter", "-f",
+    multiple=True,
+    help="Critère de filtrage au format attribut=valeur (mêmes critères que la commande list)."
+)
+@click.option(
+    "--sort", "-s",
+    multiple=True,
+    help="Critère de tri au format attribut=asc|desc."
+)
+@click.option(
+    "--output", "-o",
+    default="-",
+    show_default=True,
+    help="Fichier de destination ('-' pour la sortie standard)."
+)
+@click.option(
+    "--format", "-F", "file_format",
+    type=click.Choice(["csv", "ndjson"]),
+    help="Format de sortie. Par défaut : déduit de l'extension du fichier, sinon csv."
+)
+@click.option(
+    "--batch-size", "-b",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Nombre de lignes lues par aller-retour avec la base de données."
+)
+@require_token
+def export_employees(filter, sort, output, file_format, batch_size):
+    """
+    Exporte les employés au format CSV ou NDJSON, au fil de la lecture.
+
+    Le mot de passe n'est pas exporté.
+
+    Exemple : employee export -F ndjson > employes.ndjson
+    """
+    filters = filter_to_dict(filter)
+    sorts = sort_to_dict(sort)
+
+    rows = safe_execute(crud_employee.stream_employees, db, filters, sorts, batch_size)
+    if rows is not None:
+        safe_execute(export_rows, rows, crud_employee.EXPORT_FIELDS, output, file_format)
+
+
 @employee.command("list")
 @click.option(
     "--filter", "-f",
@@ -78,22 +165,48 @@ def create_employee():
     multiple=True,
     help="Critère de tri au format attribut=asc|desc. Exemple: -s last_name=asc"
 )
+@click.option(
+    "--limit", "-l",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Nombre maximum de résultats par page."
+)
+@click.option(
+    "--after", "-a",
+    help="Curseur de la page suivante (ou id du dernier résultat sans critère de tri)."
+)
+@click.option(
+    "--format", "-F", "output_format",
+    type=click.Choice(["table", "json", "ndjson", "csv", "tsv"]),
+    default="table",
+    show_default=True,
+    help="Format d'affichage. Les formats autres que table sont écrits au fil de la lecture, sans mise en forme."
+)
 @require_token
-def get_employees(filter, sort):
+def get_employees(filter, sort, limit, after, output_format):
     """Récupère la liste des employés en fonction des critères du filtrage et du tri."""
 
-    filters = attr_val_to_dict(filter)
+    filters = filter_to_dict(filter)
     sorts = sort_to_dict(sort)
 
-    employees = safe_execute(crud_employee.get_employees, db, filters, sorts)
+    if output_format != "table":
+        rows = safe_execute(crud_employee.stream_employees, db, filters, sorts, limit=limit, after=after)
+        if rows is not None:
+            safe_execute(write_list, rows, crud_employee.EXPORT_FIELDS, output_format, sorts, limit)
+        return
+
+    employees = safe_execute(crud_employee.get_employees, db, filters, sorts, limit, after,
+                             views.EMPLOYEE_LOAD_PLAN)
     views.display_employees(employees, "list")
+    views.display_next_page(next_cursor(employees, sorts, limit))
 
 
 @employee.command("update")
 @click.argument("employee")
 @click.argument("update", nargs=-1, required=True)
 @require_token
-@is_manager
+@require_permission("employee", "update")
 def update_employee(employee, update):
     """
     Met à jour un employé.
@@ -104,13 +217,38 @@ def update_employee(employee, update):
 
     employee = safe_execute(crud_employee.update_employee, db, employee, updates)
     if employee:
+        clear_auth_contexts()
         views.display_employees([employee], "update")
 
 
+@employee.command("handover")
+@click.argument("from_employee")
+@click.argument("to_employee")
+@click.option("--dry-run", is_flag=True, help="Affiche le nombre de clients et contrats concernés sans rien modifier.")
+@require_token
+@require_permission("employee", "handover")
+def handover_employee(from_employee, to_employee, dry_run):
+    """
+    Transfère tous les clients et contrats d'un commercial à un autre.
+
+    Exemple : employee handover EMP0001 EMP0002 --dry-run
+    """
+    counts = safe_execute(crud_employee.handover_sale_contact, db, from_employee, to_employee, dry_run)
+    if counts is None:
+        return
+
+    customers, contracts = counts
+    if dry_run:
+        print(f"{customers} client(s) et {contracts} contrat(s) seraient transférés de {from_employee} "
+              f"à {to_employee}.")
+    else:
+        print(f"{customers} client(s) et {contracts} contrat(s) transférés de {from_employee} à {to_employee}.")
+
+
 @employee.command("update-password")
 @click.argument("employee")
 @require_token
-@is_manager
+@require_permission("employee", "update-password")
 def update_employee_password(employee):
     """Met à jour le mot de passe d'un employé."""
 
@@ -142,7 +280,7 @@ def update_employee_password(employee):
 @employee.command("delete")
 @click.argument("employee")
 @require_token
-@is_manager
+@require_permission("employee", "delete")
 def delete_employee(employee):
     """Supprime un employé."""
 
@@ -166,6 +304,7 @@ def delete_employee(employee):
         if confirmation.lower() == "oui":
             views.display_employees([employee], "delete")
             safe_execute(crud_employee.delete_employee, db, employee)
+            clear_auth_contexts()
             break
         elif confirmation.lower() == "non":
             print("Suppression annulée.")
@@ -1,11 +1,12 @@
-from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, sort_to_dict
-from app.auth.token import decode_access_token
-from app.auth.session import load_token
-from app.auth.decorators import require_token, is_salesperson_or_manager, is_support_or_manager, is_manager
+from app.cli.core import cli, input_with_limit, safe_execute, attr_val_to_dict, filter_to_dict, sort_to_dict, \
+    export_rows, write_list
+from app.auth.context import get_auth_context
+from app.auth.decorators import require_token, require_permission
+from app.auth.permissions import get_permission
 from app.db.database import Session
-from app.crud import employee as crud_employee
 from app.crud import contract as crud_contract
 from app.crud import event as crud_event
+from app.crud.pagination import next_cursor
 from app.ui import views
 
 import click
@@ -23,11 +24,12 @@ def event():
 
 @event.command("create")
 @require_token
-@is_salesperson_or_manager
+@require_permission("event", "create")
 def create_event():
     """Créer un nouvel événement."""
-    req_emp_num = decode_access_token(load_token())["emp_number"]
-    employee = safe_execute(crud_employee.get_employees, db, {"employee_number": req_emp_num}, None)[0]
+    auth = get_auth_context()
+    employee = auth.get_employee(db)
+    permission = get_permission("event", "create")
 
     name = input_with_limit("Nom de l'événement : ", 100)
 
@@ -46,14 +48,12 @@ def create_event():
             print(f"Un événement est déjà associé au contrat {contract_id}.")
             continue
 
-        if contract.sale_contact:
-            if contract.sale_contact.employee_number != req_emp_num and employee.role.name != "Management":
-                print("Vous n'êtes pas autorisé à créer un événement pour ce contrat.")
-                continue
-        else:
-            if employee.role.name != "Management":
+        if not permission.allows(auth.role_id, employee.id, contract.sale_contact_id, db):
+            if contract.sale_contact_id is None:
                 print("Seul un manager peut créer un événement si le contrat n'a pas de commercial associé.")
-                continue
+            else:
+                print("Vous n'êtes pas autorisé à créer un événement pour ce contrat.")
+            continue
 
         if contract.signed is False:
             print(f"Le contrat {contract_id} n'est pas signé.")
@@ -121,33 +121,128 @@ def create_event():
         views.display_events([event], "create")
 
 
+@event.command("export")
+@click.option(
+    "--filter", "-f",
+    multiple=True,
+    help="Critère de filtrage au format attribut=valeur (mêmes critères que la commande list)."
+)
+@click.option(
+    "--sort", "-s",
+    multiple=True,
+    help="Critère de tri au format attribut=asc|desc."
+)
+@click.option(
+    "--output", "-o",
+    default="-",
+    show_default=True,
+    help="Fichier de destination ('-' pour la sortie standard)."
+)
+@click.option(
+    "--format", "-F", "file_format",
+    type=click.Choice(["csv", "ndjson"]),
+    help="Format de sortie. Par défaut : déduit de l'extension du fichier, sinon csv."
+)
+@click.option(
+    "--batch-size", "-b",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Nombre de lignes lues par aller-retour avec la base de données."
+)
+@require_token
+def export_events(filter, sort, output, file_format, batch_size):
+    """
+    Exporte les événements au format CSV ou NDJSON, au fil de la lecture.
+
+    Exemple : event export -f start_date>=2025-01-01 -o evenements.csv
+    """
+    filters = filter_to_dict(filter)
+    sorts = sort_to_dict(sort)
+
+    rows = safe_execute(crud_event.stream_events, db, filters, sorts, batch_size)
+    if rows is not None:
+        safe_execute(export_rows, rows, crud_event.EXPORT_FIELDS, output, file_format)
+
+
 @event.command("list")
 @click.option(
     "--filter", "-f",
     multiple=True,
-    help="Critère de filtrage au format attribut=valeur. Exemple: -f sale_contact_id=1 -f signed=False"
+    help="Critère de filtrage au format attribut=valeur ou attribut>=valeur.\n"
+         "Exemple: -f support_contact_id=None -f start_date=2025-01-01..2025-06-30"
 )
 @click.option(
     "--sort", "-s",
     multiple=True,
     help="Critère de tri au format attribut=asc|desc.\nExemple: -s last_name=asc"
 )
+@click.option(
+    "--limit", "-l",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Nombre maximum de résultats par page."
+)
+@click.option(
+    "--after", "-a",
+    help="Curseur de la page suivante (ou id du dernier résultat sans critère de tri)."
+)
+@click.option(
+    "--format", "-F", "output_format",
+    type=click.Choice(["table", "json", "ndjson", "csv", "tsv"]),
+    default="table",
+    show_default=True,
+    help="Format d'affichage. Les formats autres que table sont écrits au fil de la lecture, sans mise en forme."
+)
 @require_token
-def get_events(filter, sort):
+def get_events(filter, sort, limit, after, output_format):
     """Récupère la liste des événements en fonction des critères du filtrage et du tri."""
 
-    filters = attr_val_to_dict(filter)
+    filters = filter_to_dict(filter)
     sorts = sort_to_dict(sort)
 
-    events = safe_execute(crud_event.get_events, db, filters, sorts)
+    if output_format != "table":
+        rows = safe_execute(crud_event.stream_events, db, filters, sorts, limit=limit, after=after)
+        if rows is not None:
+            safe_execute(write_list, rows, crud_event.EXPORT_FIELDS, output_format, sorts, limit)
+        return
+
+    events = safe_execute(crud_event.get_events, db, filters, sorts, limit, after,
+                          views.EVENT_LOAD_PLAN)
     views.display_events(events, "list")
+    views.display_next_page(next_cursor(events, sorts, limit))
+
+
+@event.command("conflicts")
+@click.option(
+    "--since", "-S",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]),
+    help="Ignore les événements terminés avant cette date. Par défaut : maintenant."
+)
+@click.option(
+    "--resource", "-r", "resources",
+    multiple=True,
+    type=click.Choice(list(crud_event.CONFLICT_RESOURCES)),
+    help="Ressource contrôlée (support_contact_id ou location). Par défaut : les deux."
+)
+@require_token
+def event_conflicts(since, resources):
+    """
+    Liste les événements qui se chevauchent pour un même contact support ou un même lieu.
+
+    Exemple : event conflicts --since 2025-01-01 -r location
+    """
+    conflicts = safe_execute(crud_event.find_event_conflicts, db, since, resources or crud_event.CONFLICT_RESOURCES)
+    if conflicts is not None:
+        views.display_event_conflicts(conflicts)
 
 
 @event.command("update")
 @click.argument("event_id", type=int)
 @click.argument("update", nargs=-1, required=True)
 @require_token
-@is_support_or_manager
+@require_permission("event", "update")
 def update_event(event_id, update):
     """
     Met à jour un événement.
@@ -156,7 +251,7 @@ def update_event(event_id, update):
     """
     updates = attr_val_to_dict(update)
 
-    req_emp_num = decode_access_token(load_token())["emp_number"]
+    req_emp_num = get_auth_context().employee_number
 
     event = safe_execute(crud_event.update_event, db, event_id, updates, req_emp_num)
     if event:
@@ -167,7 +262,7 @@ def update_event(event_id, update):
 @click.argument("event_id", type=int)
 @click.argument("support_contact")
 @require_token
-@is_manager
+@require_permission("event", "update-contact")
 def update_event_support_contact(event_id, support_contact):
     """
     Met à jour le contact support d'un événement.
@@ -179,10 +274,34 @@ def update_event_support_contact(event_id, support_contact):
         views.display_events([event], "update")
 
 
+@event.command("auto-assign")
+@click.option(
+    "--since", "-S",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]),
+    help="Affecte les événements commençant après cette date. Par défaut : maintenant."
+)
+@click.option("--dry-run", is_flag=True, help="Affiche l'affectation proposée sans rien modifier.")
+@require_token
+@require_permission("event", "auto-assign")
+def auto_assign_events(since, dry_run):
+    """
+    Affecte un support à tous les événements à venir qui n'en ont pas.
+
+    Chaque événement est confié au support disponible (sans autre événement sur le créneau) le moins chargé.
+
+    Exemple : event auto-assign --dry-run
+    """
+    result = safe_execute(crud_event.auto_assign_events, db, since, dry_run)
+
+    if result is not None:
+        assignments, unassigned, skipped = result
+        views.display_support_assignment(assignments, unassigned, skipped, dry_run)
+
+
 @event.command("delete")
 @click.argument("event_id")
 @require_token
-@is_manager
+@require_permission("event", "delete")
 def delete_event(event_id):
     """Supprime un événement."""
     events = safe_execute(crud_event.get_events, db, {"id": event_id}, None)
@@ -0,0 +1,60 @@
+from click.utils import make_default_short_help
+
+import click
+import importlib
+
+
+# Commandes de premier niveau : module qui les déclare et aide courte affichée par --help.
+# Le module n'est importé qu'au moment où la commande est invoquée.
+LAZY_COMMANDS = {
+    "login": ("app.cli.auth", "Se connecter en tant qu'employé."),
+    "change-password": ("app.cli.auth", "Changer le mot de passe de l'utilisateur connecté."),
+    "role": ("app.cli.role", "Groupe de commandes pour gérer les rôles"),
+    "employee": ("app.cli.employee", "Groupe de commandes pour gérer les employés"),
+    "customer": ("app.cli.customer", "Groupe de commandes pour gérer les clients."),
+    "contract": ("app.cli.contract", "Groupe de commandes pour gérer les contrats."),
+    "event": ("app.cli.event", "Groupe de commandes pour gérer les événements."),
+    "search": ("app.cli.search", "Recherche un texte dans les clients, les événements et les employés."),
+    "report": ("app.cli.report", "Groupe de commandes pour les rapports."),
+    "shell": ("app.cli.shell", "Ouvre un shell interactif qui conserve la connexion et le token entre les commandes."),
+}
+
+
+class LazyGroup(click.Group):
+    """Groupe click qui importe le module d'une sous-commande uniquement lorsqu'elle est invoquée."""
+
+    def list_commands(self, ctx):
+        return sorted(set(LAZY_COMMANDS) | set(self.commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in LAZY_COMMANDS:
+            # Le module enregistre ses commandes sur le groupe cli à l'import
+            importlib.import_module(LAZY_COMMANDS[cmd_name][0])
+        return self.commands.get(cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        """Affiche les commandes à partir de l'aide déclarée, sans importer leurs modules."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+
+        for name in names:
+            if name in self.commands:
+                rows.append((name, self.commands[name].get_short_help_str(limit)))
+            else:
+                rows.append((name, make_default_short_help(LAZY_COMMANDS[name][1], limit)))
+
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
+@click.pass_context
+def cli(ctx):
+    """Epic Events CLI - Gestion complète des rôles, employés, clients, contrats et événements"""
+    on_invoke = (ctx.obj or {}).get("on_invoke")
+    if on_invoke:
+        on_invoke()
@@ -0,0 +1,51 @@
+from app.cli.core import cli, safe_execute
+from app.auth.decorators import require_token, require_permission
+from app.db.database import Session
+from app.crud import report as crud_report
+from app.ui import views
+
+import click
+
+
+db = Session()
+
+
+@cli.group()
+def report():
+    """Groupe de commandes pour les rapports."""
+    pass
+
+
+@report.command("sales")
+@click.option(
+    "--by", "-b",
+    multiple=True,
+    type=click.Choice(list(crud_report.SALES_DIMENSIONS)),
+    help="Axe de regroupement, répétable. Par défaut : sale_contact. Exemple: -b sale_contact -b month"
+)
+@click.option(
+    "--top", "-t",
+    type=click.IntRange(min=1),
+    help="N'affiche que les groupes de plus gros montant total."
+)
+@click.option(
+    "--live",
+    is_flag=True,
+    help="Calcule les totaux sur la table des contrats plutôt que de les lire dans le résumé des ventes."
+)
+@require_token
+@require_permission("report", "sales")
+def sales_report(by, top, live):
+    """
+    Affiche le montant total et le restant dû des contrats par commercial, client, mois ou statut de signature.
+
+    Les totaux sont lus dans le résumé des ventes, tenu à jour à chaque création, modification ou suppression
+    de contrat.
+
+    Exemple : report sales -b sale_contact -b signed --top 10
+    """
+    by = by or ("sale_contact",)
+    rows = safe_execute(crud_report.sales_report, db, by, live, top)
+
+    if rows is not None:
+        views.display_sales_report(rows, by)
@@ -0,0 +1,49 @@
+from app.cli.core import cli, safe_execute
+from app.auth.decorators import require_token
+from app.db.database import Session
+from app.crud import search as crud_search
+from app.ui import views
+
+import click
+
+
+db = Session()
+
+
+@cli.command("search")
+@click.argument("text", nargs=-1, required=True)
+@click.option(
+    "--type", "-t", "kinds",
+    multiple=True,
+    type=click.Choice(crud_search.SEARCH_KINDS),
+    help="Limite la recherche à un type de résultat. Exemple: -t customer -t event"
+)
+@click.option(
+    "--limit", "-l",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Nombre maximum de résultats par page."
+)
+@click.option(
+    "--after", "-a",
+    help="Curseur de la page suivante."
+)
+@require_token
+def search(text, kinds, limit, after):
+    """
+    Recherche un texte dans les clients, les événements et les employés.
+
+    Sont parcourus les noms, emails et entreprises des clients, les noms, lieux et notes des événements et les
+    noms des employés. Chaque mot doit être présent, éventuellement en début de mot : "dup par" trouve
+    "Dupont, Paris". Les résultats sont classés du plus au moins pertinent.
+
+    Exemple : search acme -t customer
+    """
+    text = " ".join(text)
+    found = safe_execute(crud_search.search, db, text, kinds, limit, after)
+
+    if found is not None:
+        results, cursor = found
+        views.display_search_results(results, text)
+        views.display_next_page(cursor)
@@ -0,0 +1,89 @@
+from app.cli import core
+from app.cli.core import cli, prepare_sentry_scope
+from app.auth.context import get_auth_context
+from app.db.database import get_pool_stats
+from sqlalchemy import text
+from sqlalchemy.orm import close_all_sessions, configure_mappers
+import click
+import sentry_sdk
+import shlex
+
+try:
+    import readline  # noqa: F401 (historique et édition de ligne, absent sous Windows)
+except ImportError:
+    pass
+
+
+EXIT_COMMANDS = ("exit", "quit")
+
+
+def warm_up():
+    """Prépare les mappers ORM, le pool de connexions et le token décodé avant la première commande."""
+    configure_mappers()
+
+    try:
+        core.db.execute(text("SELECT 1"))
+        core.db.close()
+    except Exception as e:
+        print(f"[ERREUR] Connexion à la base de données impossible : {e}")
+
+    try:
+        get_auth_context()
+    except Exception:
+        pass
+
+
+def run_command(args):
+    """Exécute une commande du groupe cli sans quitter le processus."""
+    try:
+        cli.main(args=args, prog_name="epic-events", standalone_mode=False)
+    except click.exceptions.Abort:
+        print("Commande annulée.")
+    except click.ClickException as e:
+        e.show()
+    except Exception as e:
+        print(f"[ERREUR] : {e}")
+        prepare_sentry_scope({"command": " ".join(args)})
+        sentry_sdk.capture_exception(e)
+    finally:
+        # Libère les connexions et vide les identity maps pour que chaque commande relise des données fraîches
+        close_all_sessions()
+
+
+@cli.command("shell")
+def shell():
+    """Ouvre un shell interactif qui conserve la connexion et le token entre les commandes."""
+    warm_up()
+    print("Shell Epic Events. Tapez 'help' pour la liste des commandes, 'pool-stats' pour l'état du pool "
+          "de connexions, 'exit' pour quitter.")
+
+    while True:
+        try:
+            line = input("epic-events> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            break
+
+        if not line:
+            continue
+
+        if line in EXIT_COMMANDS:
+            break
+
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            print(f"[ERREUR] : {e}")
+            continue
+
+        if args[0] == "help":
+            args = ["--help"]
+        elif args[0] == "shell":
+            print("Le shell est déjà ouvert.")
+            continue
+        elif args[0] == "pool-stats":
+            for name, value in get_pool_stats().items():
+                print(f"{name} : {value}")
+            continue
+
+        run_command(args)
@@ -3,11 +3,41 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-DATABASE_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}" \
-               f"@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
+# Base de données : serveur MySQL (par défaut) ou SQLite embarqué, dans le fichier DB_PATH ou en mémoire
+# (DB_PATH=:memory:). DATABASE_URL, si elle est définie, remplace cette sélection.
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+DB_PATH = os.getenv("DB_PATH", "epic_events.db")
+
+if os.getenv("DATABASE_URL"):
+    DATABASE_URL = os.getenv("DATABASE_URL")
+elif DB_BACKEND == "sqlite":
+    DATABASE_URL = f"sqlite:///{DB_PATH}"
+elif DB_BACKEND == "mysql":
+    DATABASE_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}" \
+                   f"@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
+else:
+    raise ValueError(f"Le moteur de base de données '{DB_BACKEND}' n'est pas géré (mysql ou sqlite).")
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_MINUTES = int(os.getenv("JWT_EXPIRATION_MINUTES", 30))
+
+# Durée en secondes pendant laquelle les rôles lus en base sont conservés en mémoire
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", 300))
+
+# Pool de connexions (le recyclage doit rester inférieur au wait_timeout de MySQL)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+DB_ISOLATION_LEVEL = os.getenv("DB_ISOLATION_LEVEL")
+
+# Hachage des mots de passe : profil argon2 (standard, light ou fast) et surcharges éventuelles
+PASSWORD_HASH_PROFILE = os.getenv("PASSWORD_HASH_PROFILE", "standard")
+ARGON2_TIME_COST = os.getenv("ARGON2_TIME_COST")
+ARGON2_MEMORY_COST = os.getenv("ARGON2_MEMORY_COST")
+ARGON2_PARALLELISM = os.getenv("ARGON2_PARALLELISM")
@@ -0,0 +1,11 @@
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """Découpe un itérable en listes d'au plus size éléments, sans le charger entièrement en mémoire."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
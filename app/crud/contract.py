@@ -1,4 +1,15 @@
-from app.models.models import Contract, Employee
+from app.models.models import Contract
+from app.crud.pagination import paginate
+from app.crud.loading import apply_load_plan
+from app.crud.filters import FilterCompiler
+from app.crud.streaming import column_fields, stream_rows
+from app.crud.report import contract_sales_entry, update_sales_summary
+from app.auth.permissions import get_permission
+from sqlalchemy import select
+
+
+contract_filters = FilterCompiler(Contract)
+EXPORT_FIELDS = column_fields(Contract)
 
 
 def create_contract(session, data):
@@ -6,32 +17,22 @@ def create_contract(session, data):
     try:
         new_contract = Contract(**data)
         session.add(new_contract)
+        session.flush()
+        # La date de création, attribuée par la base, détermine le mois du résumé des ventes
+        session.refresh(new_contract)
+        update_sales_summary(session, after=contract_sales_entry(new_contract))
         session.commit()
         session.refresh(new_contract)
         return new_contract
     except Exception as e:
+        session.rollback()
         raise ValueError(f"Erreur lors de la création du contrat : {e}")
 
 
-def get_contracts(session, filters={}, sorts={}):
-    """Récupère la liste des contrats en fonction des critères du filtrage et du tri."""
+def query_contracts(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Construit la requête des contrats en fonction des critères du filtrage, du tri et de la pagination."""
     query = session.query(Contract)
-
-    for attr, value in filters.items():
-        if not hasattr(Contract, attr):
-            raise ValueError(f"L'attribut '{attr}' n'existe pas dans le modèle Contract.")
-
-        column = getattr(Contract, attr)
-
-        if value.lower() in ("none", "null"):
-            query = query.filter(column.is_(None))
-            continue
-
-        if value.lower() in ("true", "false"):
-            query = query.filter(column.is_(value.lower() == "true"))
-            continue
-
-        query = query.filter(column.contains(value))
+    query = contract_filters.apply(query, filters)
 
     if sorts:
         for attr, order in sorts.items():
@@ -45,24 +46,38 @@ def get_contracts(session, filters={}, sorts={}):
             elif order == "desc":
                 query = query.order_by(column.desc())
 
-    return query.all()
+    query = apply_load_plan(query, Contract, load)
+
+    return paginate(query, Contract, sorts, limit, after)
+
+
+def get_contracts(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Récupère la liste des contrats en fonction des critères du filtrage et du tri."""
+    return query_contracts(session, filters, sorts, limit, after, load).all()
+
+
+def stream_contracts(session, filters={}, sorts={}, batch_size=1000, limit=None, after=None):
+    """Parcourt les contrats par lots sous forme de dictionnaires, sans charger tous les résultats en mémoire."""
+    return stream_rows(query_contracts(session, filters, sorts, limit, after), Contract, EXPORT_FIELDS, batch_size)
 
 
 def update_contract(session, contract_id, updates, req_emp_num):
     """Met à jour un contrat."""
-    contract = session.query(Contract).filter(Contract.id == contract_id).first()
+    # Le contrat et le droit de le modifier sont lus en une seule requête
+    allowed = get_permission("contract", "update").clause(req_emp_num, Contract.sale_contact_id, session)
+    row = session.execute(select(Contract, allowed).where(Contract.id == contract_id)).first()
 
-    if not contract:
+    if not row:
         raise ValueError(f"Aucun contrat trouvé avec l'ID {contract_id}.")
 
-    employee = session.query(Employee).filter(Employee.employee_number == req_emp_num).first()
+    contract, allowed = row
 
-    if contract.sale_contact:
-        if contract.sale_contact.employee_number != req_emp_num and employee.role.name != "Management":
-            raise ValueError("Vous n'êtes pas autorisé à modifier ce contrat.")
-    else:
-        if employee.role.name != "Management":
+    if not allowed:
+        if contract.sale_contact_id is None:
             raise ValueError("Seul un manager peut modifier le contrat s'il n'a pas de commercial associé.")
+        raise ValueError("Vous n'êtes pas autorisé à modifier ce contrat.")
+
+    before = contract_sales_entry(contract)
 
     for attribute, value in updates.items():
         if not hasattr(Contract, attribute):
@@ -106,6 +121,7 @@ def update_contract(session, contract_id, updates, req_emp_num):
 
         setattr(contract, attribute, value)
 
+    update_sales_summary(session, before, contract_sales_entry(contract))
     session.commit()
     session.refresh(contract)
     return contract
@@ -113,5 +129,6 @@ def update_contract(session, contract_id, updates, req_emp_num):
 
 def delete_contract(session, contract):
     """Supprime un contrat."""
+    update_sales_summary(session, before=contract_sales_entry(contract))
     session.delete(contract)
     session.commit()
@@ -1,4 +1,27 @@
-from app.models.models import Customer, Employee
+from app.models.models import Contract, Customer, Employee
+from app.crud.pagination import paginate
+from app.crud.loading import apply_load_plan
+from app.crud.filters import FilterCompiler
+from app.crud.streaming import column_fields, stream_rows
+from app.crud.role import role_cache
+from app.crud.bulk import chunked
+from app.crud.report import refresh_sales_summary
+from app.auth.permissions import get_permission
+from sqlalchemy import func, insert, select, update
+
+
+customer_filters = FilterCompiler(Customer)
+EXPORT_FIELDS = column_fields(Customer)
+
+# Champs acceptés à l'import et longueur maximale de chacun
+IMPORT_FIELDS = {
+    "first_name": 100,
+    "last_name": 100,
+    "email": 100,
+    "phone": 15,
+    "company": 100,
+}
+IMPORT_REQUIRED_FIELDS = ("first_name", "last_name", "email")
 
 
 def create_customer(session, data):
@@ -13,25 +36,100 @@ def create_customer(session, data):
         raise ValueError(f"Erreur lors de la création du client : {e}")
 
 
-def get_customers(session, filters={}, sorts={}):
-    """Récupère la liste des clients en fonction des critères du filtrage et du tri."""
-    query = session.query(Customer)
+def validate_customer_row(row):
+    """Valide une ligne d'import et renvoie les données du client, ou lève une ValueError."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+
+    data = {}
+
+    for field, max_length in IMPORT_FIELDS.items():
+        value = row.get(field)
+        value = str(value).strip() if value is not None else ""
+
+        if not value:
+            if field in IMPORT_REQUIRED_FIELDS:
+                raise ValueError(f"Le champ '{field}' est obligatoire.")
+            value = None
+        elif len(value) > max_length:
+            raise ValueError(f"Le champ '{field}' dépasse {max_length} caractères.")
+
+        data[field] = value
+
+    if "@" not in data["email"]:
+        raise ValueError(f"L'email '{data['email']}' est invalide.")
+
+    return data
 
-    for attr, value in filters.items():
-        if not hasattr(Customer, attr):
-            raise ValueError(f"L'attribut '{attr}' n'existe pas dans le modèle Customer.")
 
-        column = getattr(Customer, attr)
+def import_customers(session, rows, sale_contact_id, chunk_size=1000, on_reject=None):
+    """
+    Importe des clients par lots à partir de tuples (numéro de ligne, dictionnaire).
 
-        if value.lower() in ("none", "null"):
-            query = query.filter(column.is_(None))
+    Chaque lot est validé, confronté aux emails déjà en base en une seule requête, puis inséré
+    en un INSERT multi-lignes dans sa propre transaction. Les lignes rejetées sont transmises à
+    on_reject(numéro de ligne, ligne, raison). Renvoie le nombre de clients importés et rejetés.
+    """
+    imported = 0
+    rejected = 0
+
+    def reject(line_number, row, reason):
+        nonlocal rejected
+        rejected += 1
+        if on_reject:
+            on_reject(line_number, row, reason)
+
+    for chunk in chunked(rows, chunk_size):
+        candidates = {}
+
+        for line_number, row in chunk:
+            try:
+                data = validate_customer_row(row)
+            except ValueError as e:
+                reject(line_number, row, str(e))
+                continue
+
+            email = data["email"].lower()
+            if email in candidates:
+                reject(line_number, row, f"L'email {data['email']} est en double dans le fichier.")
+                continue
+
+            candidates[email] = (line_number, row, data)
+
+        if not candidates:
             continue
 
-        if value.lower() in ("true", "false"):
-            query = query.filter(column.is_(value.lower() == "true"))
+        # Comparaison insensible à la casse, comme le dédoublonnage du fichier (SQLite compare les octets)
+        statement = select(Customer.email).where(func.lower(Customer.email).in_(list(candidates)))
+        existing = {email.lower() for email in session.scalars(statement)}
+
+        values = []
+        for email, (line_number, row, data) in candidates.items():
+            if email in existing:
+                reject(line_number, row, f"Un client avec l'email {data['email']} existe déjà.")
+            else:
+                values.append({**data, "sale_contact_id": sale_contact_id})
+
+        if not values:
             continue
 
-        query = query.filter(column.contains(value))
+        try:
+            session.execute(insert(Customer).values(values))
+            session.commit()
+            imported += len(values)
+        except Exception as e:
+            session.rollback()
+            for email, (line_number, row, data) in candidates.items():
+                if email not in existing:
+                    reject(line_number, row, f"Erreur lors de l'insertion du lot : {e}")
+
+    return imported, rejected
+
+
+def query_customers(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Construit la requête des clients en fonction des critères du filtrage, du tri et de la pagination."""
+    query = session.query(Customer)
+    query = customer_filters.apply(query, filters)
 
     if sorts:
         for attr, order in sorts.items():
@@ -45,24 +143,36 @@ def get_customers(session, filters={}, sorts={}):
             elif order == "desc":
                 query = query.order_by(column.desc())
 
-    return query.all()
+    query = apply_load_plan(query, Customer, load)
+
+    return paginate(query, Customer, sorts, limit, after)
+
+
+def get_customers(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Récupère la liste des clients en fonction des critères du filtrage et du tri."""
+    return query_customers(session, filters, sorts, limit, after, load).all()
+
+
+def stream_customers(session, filters={}, sorts={}, batch_size=1000, limit=None, after=None):
+    """Parcourt les clients par lots sous forme de dictionnaires, sans charger tous les résultats en mémoire."""
+    return stream_rows(query_customers(session, filters, sorts, limit, after), Customer, EXPORT_FIELDS, batch_size)
 
 
 def update_customer(session, customer_id, updates, req_emp_num):
     """Met à jour un client."""
-    customer = session.query(Customer).filter(Customer.id == customer_id).first()
+    # Le client et le droit de le modifier sont lus en une seule requête
+    allowed = get_permission("customer", "update").clause(req_emp_num, Customer.sale_contact_id, session)
+    row = session.execute(select(Customer, allowed).where(Customer.id == customer_id)).first()
 
-    if not customer:
+    if not row:
         raise ValueError(f"Aucun client trouvé avec l'ID {customer_id}.")
 
-    employee = session.query(Employee).filter(Employee.employee_number == req_emp_num).first()
+    customer, allowed = row
 
-    if customer.sale_contact:
-        if customer.sale_contact.employee_number != req_emp_num and employee.role.name != "Management":
-            raise ValueError("Vous n'êtes pas autorisé à modifier ce client.")
-    else:
-        if employee.role.name != "Management":
+    if not allowed:
+        if customer.sale_contact_id is None:
             raise ValueError("Seul un manager peut modifier le client s'il n'a pas de commercial associé.")
+        raise ValueError("Vous n'êtes pas autorisé à modifier ce client.")
 
     for attribute, value in updates.items():
         if not hasattr(Customer, attribute):
@@ -91,7 +201,7 @@ def update_customer_sale_contact(session, customer_id, sale_contact):
     if not employee:
         raise ValueError(f"Aucun employé trouvé avec le numéro ou l'ID {sale_contact}.")
 
-    if employee.role.name != "Commercial":
+    if employee.role_id != role_cache.id_of("Commercial", session):
         raise ValueError(f"L'employé {employee.first_name} {employee.last_name} ({employee.employee_number}) "
                          "n'est pas un commercial.")
 
@@ -101,13 +211,15 @@ def update_customer_sale_contact(session, customer_id, sale_contact):
         raise ValueError(f"Aucun client trouvé avec l'ID {customer_id}.")
 
     customer.sale_contact_id = employee.id
+
+    # Les contrats du client suivent son commercial : une seule requête, validée avec le client
+    session.execute(
+        update(Contract).where(Contract.customer_id == customer.id).values(sale_contact_id=employee.id)
+    )
+    refresh_sales_summary(session, customer_ids=[customer.id])
     session.commit()
     session.refresh(customer)
 
-    for contrat in customer.contracts:
-        contrat.sale_contact_id = employee.id
-        session.commit()
-
     return customer
 
 
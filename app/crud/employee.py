@@ -1,8 +1,30 @@
-from app.models.models import Employee
-from app.auth.password import hash_password
+from app.models.models import Contract, Customer, Employee
+from app.crud.pagination import paginate
+from app.crud.loading import apply_load_plan
+from app.crud.filters import FilterCompiler
+from app.crud.streaming import column_fields, stream_rows
+from app.crud.role import role_cache
+from app.crud.bulk import chunked
+from app.crud.report import refresh_sales_summary
+from app.auth.password import hash_password, password_hasher
+from sqlalchemy import func, insert, select, update
 from uuid import uuid4
 
 
+employee_filters = FilterCompiler(Employee)
+# Le mot de passe haché n'est jamais exporté
+EXPORT_FIELDS = column_fields(Employee, exclude=("password",))
+
+# Champs acceptés à l'import et longueur maximale de chacun (le rôle est donné par son ID ou son nom)
+IMPORT_FIELDS = {
+    "first_name": 100,
+    "last_name": 100,
+    "email": 100,
+    "password": 255,
+    "role": 50,
+}
+
+
 def create_employee(session, data):
     """Crée un nouvel employé."""
     try:
@@ -23,25 +45,134 @@ def create_employee(session, data):
         raise ValueError(f"Erreur lors de la création de l'employé : {e}")
 
 
-def get_employees(session, filters={}, sorts={}):
-    """Récupère la liste des employés en fonction des critères du filtrage et du tri."""
-    query = session.query(Employee)
+def validate_employee_row(row, roles):
+    """
+    Valide une ligne d'import et renvoie les données de l'employé (mot de passe en clair), ou lève une ValueError.
+
+    roles associe l'ID (sous forme de texte) et le nom en minuscules de chaque rôle à son ID.
+    """
+    if "_error" in row:
+        raise ValueError(row["_error"])
+
+    data = {}
+
+    for field, max_length in IMPORT_FIELDS.items():
+        value = row.get(field)
+        if field == "role" and value in (None, ""):
+            value = row.get("role_id")
+        value = str(value).strip() if value is not None else ""
+
+        if not value:
+            raise ValueError(f"Le champ '{field}' est obligatoire.")
+        if len(value) > max_length:
+            raise ValueError(f"Le champ '{field}' dépasse {max_length} caractères.")
+
+        data[field] = value
+
+    if "@" not in data["email"]:
+        raise ValueError(f"L'email '{data['email']}' est invalide.")
+
+    role = data.pop("role")
+    if role.lower() not in roles:
+        raise ValueError(f"Le rôle '{role}' n'existe pas.")
+    data["role_id"] = roles[role.lower()]
+
+    return data
+
+
+def allocate_employee_ids(session, count):
+    """
+    Réserve count identifiants consécutifs pour des employés à insérer dans la transaction en cours.
+
+    La ligne du plus grand identifiant est verrouillée (SELECT ... FOR UPDATE) jusqu'à la fin de la
+    transaction : les numéros EMPxxxx sont connus avant l'insertion, sans numéro temporaire à renommer.
+    """
+    statement = select(Employee.id).order_by(Employee.id.desc()).limit(1).with_for_update()
+    last_id = session.scalar(statement) or 0
+    return range(last_id + 1, last_id + 1 + count)
+
+
+def create_employees(session, rows, chunk_size=500, workers=None, on_reject=None):
+    """
+    Crée des employés par lots à partir de tuples (numéro de ligne, dictionnaire).
+
+    Les mots de passe d'un lot sont hachés en parallèle sur un pool de processus (un par cœur par défaut),
+    les identifiants et numéros d'employés sont réservés en une fois, puis le lot est inséré en un
+    INSERT multi-lignes dans sa propre transaction. Les lignes rejetées sont transmises à
+    on_reject(numéro de ligne, ligne, raison). Renvoie le nombre d'employés créés et rejetés.
+    """
+    created = 0
+    rejected = 0
+
+    roles = {}
+    for role in role_cache.roles(session):
+        roles[str(role.id)] = role.id
+        roles[role.name.lower()] = role.id
+
+    def reject(line_number, row, reason):
+        nonlocal rejected
+        rejected += 1
+        if on_reject:
+            on_reject(line_number, row, reason)
+
+    with password_hasher(workers) as hash_many:
+        for chunk in chunked(rows, chunk_size):
+            candidates = {}
+
+            for line_number, row in chunk:
+                try:
+                    data = validate_employee_row(row, roles)
+                except ValueError as e:
+                    reject(line_number, row, str(e))
+                    continue
+
+                email = data["email"].lower()
+                if email in candidates:
+                    reject(line_number, row, f"L'email {data['email']} est en double dans le fichier.")
+                    continue
+
+                candidates[email] = (line_number, row, data)
+
+            if not candidates:
+                continue
+
+            # Comparaison insensible à la casse, comme le dédoublonnage du fichier (SQLite compare les octets)
+            statement = select(Employee.email).where(func.lower(Employee.email).in_(list(candidates)))
+            existing = {email.lower() for email in session.scalars(statement)}
+
+            accepted = []
+            for email, (line_number, row, data) in candidates.items():
+                if email in existing:
+                    reject(line_number, row, f"Un employé avec l'email {data['email']} existe déjà.")
+                else:
+                    accepted.append((line_number, row, data))
 
-    for attr, value in filters.items():
-        if not hasattr(Employee, attr):
-            raise ValueError(f"L'attribut '{attr}' n'existe pas dans le modèle Employee.")
+            if not accepted:
+                continue
 
-        column = getattr(Employee, attr)
+            hashes = hash_many([data["password"] for _, _, data in accepted])
 
-        if value.lower() in ("none", "null"):
-            query = query.filter(column.is_(None))
-            continue
+            try:
+                ids = allocate_employee_ids(session, len(accepted))
+                values = [
+                    {**data, "id": employee_id, "employee_number": f"EMP{employee_id:04d}", "password": password}
+                    for (_, _, data), employee_id, password in zip(accepted, ids, hashes)
+                ]
+                session.execute(insert(Employee).values(values))
+                session.commit()
+                created += len(values)
+            except Exception as e:
+                session.rollback()
+                for line_number, row, _ in accepted:
+                    reject(line_number, row, f"Erreur lors de l'insertion du lot : {e}")
 
-        if value.lower() in ("true", "false"):
-            query = query.filter(column.is_(value.lower() == "true"))
-            continue
+    return created, rejected
 
-        query = query.filter(column.contains(value))
+
+def query_employees(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Construit la requête des employés en fonction des critères du filtrage, du tri et de la pagination."""
+    query = session.query(Employee)
+    query = employee_filters.apply(query, filters)
 
     if sorts:
         for attr, order in sorts.items():
@@ -55,7 +186,19 @@ def get_employees(session, filters={}, sorts={}):
             elif order == "desc":
                 query = query.order_by(column.desc())
 
-    return query.all()
+    query = apply_load_plan(query, Employee, load)
+
+    return paginate(query, Employee, sorts, limit, after)
+
+
+def get_employees(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Récupère la liste des employés en fonction des critères du filtrage et du tri."""
+    return query_employees(session, filters, sorts, limit, after, load).all()
+
+
+def stream_employees(session, filters={}, sorts={}, batch_size=1000, limit=None, after=None):
+    """Parcourt les employés par lots sous forme de dictionnaires, sans charger tous les résultats en mémoire."""
+    return stream_rows(query_employees(session, filters, sorts, limit, after), Employee, EXPORT_FIELDS, batch_size)
 
 
 def update_employee(session, employee_number_or_id, updates):
@@ -77,8 +220,9 @@ def update_employee(session, employee_number_or_id, updates):
         if attribute not in ['first_name', 'last_name', 'email', 'role_id']:
             raise ValueError(f"L'attribut '{attribute}' n'est pas modifiable.")
 
-        if attribute == "role_id" and value not in ["1", "2", "3"]:
-            raise ValueError("L'ID de rôle doit être 1 (Commercial), 2 (Support) ou 3 (Gestion).")
+        if attribute == "role_id" and role_cache.name_of(value, session) is None:
+            choices = ", ".join(f"{role.id} ({role.name})" for role in role_cache.roles(session))
+            raise ValueError(f"L'ID de rôle doit être l'un des suivants : {choices}.")
 
         setattr(employee, attribute, value)
 
@@ -87,6 +231,54 @@ def update_employee(session, employee_number_or_id, updates):
     return employee
 
 
+def handover_sale_contact(session, from_employee, to_employee, dry_run=False):
+    """
+    Transfère tous les clients et contrats d'un commercial à un autre, dans une seule transaction.
+
+    Renvoie le nombre de clients et de contrats transférés (ou à transférer avec dry_run, sans rien modifier).
+    """
+    employees = {}
+
+    for reference in (from_employee, to_employee):
+        employee = session.query(Employee).filter(
+            (Employee.employee_number == reference) | (Employee.id == reference)
+        ).first()
+
+        if not employee:
+            raise ValueError(f"Aucun employé trouvé avec le numéro ou id {reference}.")
+
+        employees[reference] = employee
+
+    source, target = employees[from_employee], employees[to_employee]
+
+    if source.id == target.id:
+        raise ValueError("Les deux employés doivent être différents.")
+
+    if target.role_id != role_cache.id_of("Commercial", session):
+        raise ValueError(f"L'employé {target.first_name} {target.last_name} ({target.employee_number}) "
+                         "n'est pas un commercial.")
+
+    if dry_run:
+        customers = session.scalar(select(func.count()).where(Customer.sale_contact_id == source.id))
+        contracts = session.scalar(select(func.count()).where(Contract.sale_contact_id == source.id))
+        return customers, contracts
+
+    try:
+        customers = session.execute(
+            update(Customer).where(Customer.sale_contact_id == source.id).values(sale_contact_id=target.id)
+        ).rowcount
+        contracts = session.execute(
+            update(Contract).where(Contract.sale_contact_id == source.id).values(sale_contact_id=target.id)
+        ).rowcount
+        refresh_sales_summary(session, sale_contact_ids=[source.id, target.id])
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise ValueError(f"Erreur lors du transfert des clients et contrats : {e}")
+
+    return customers, contracts
+
+
 def update_password(session, employee, new_password):
     """Met à jour le mot de passe d'un employé."""
     employee.password = hash_password(new_password)
@@ -94,6 +286,13 @@ def update_password(session, employee, new_password):
     return True
 
 
+def update_password_hash(session, employee, password_hash):
+    """Remplace le hachage du mot de passe d'un employé (recalcul avec les paramètres argon2 courants)."""
+    employee.password = password_hash
+    session.commit()
+    return True
+
+
 def delete_employee(session, employee):
     """Supprime un employé."""
     session.delete(employee)
@@ -1,11 +1,38 @@
 from app.models.models import Event, Employee
+from app.models.types import unindexed
+from app.crud.pagination import paginate
+from app.crud.loading import apply_load_plan
+from app.crud.filters import FilterCompiler
+from app.crud.streaming import column_fields, stream_rows
+from app.crud.role import role_cache
+from app.crud.bulk import chunked
+from app.auth.permissions import get_permission
+from sqlalchemy import case, func, select, update
 from datetime import datetime
 
+import bisect
+import heapq
+
+
+event_filters = FilterCompiler(Event)
+EXPORT_FIELDS = column_fields(Event)
+
+# Ressources qui ne peuvent pas accueillir deux événements en même temps, et leur libellé
+CONFLICT_RESOURCES = {
+    "support_contact_id": "contact support",
+    "location": "lieu",
+}
+
 
 def create_event(session, data):
     """Crée un nouvel événement."""
     try:
+        # SQLite accepte n'importe quelle valeur dans une colonne entière : le nombre d'invités est vérifié ici
+        if data.get("attendees") is not None:
+            data = {**data, "attendees": int(data["attendees"])}
+
         event = Event(**data)
+        check_event_conflicts(session, event)
         session.add(event)
         session.commit()
         session.refresh(event)
@@ -14,25 +41,226 @@ def create_event(session, data):
         raise ValueError(f"Erreur lors de la création de l'événement : {e}")
 
 
-def get_events(session, filters={}, sorts={}):
-    """Récupère la liste des événements en fonction des critères du filtrage et du tri."""
-    query = session.query(Event)
+def query_overlapping_events(session, resource, value, start_date, end_date, exclude_id=None):
+    """
+    Construit la requête des événements de la ressource (support ou lieu) dont la période chevauche
+    [start_date, end_date[. Deux événements qui se suivent sans se chevaucher ne sont pas en conflit.
 
-    for attr, value in filters.items():
-        if not hasattr(Event, attr):
-            raise ValueError(f"L'attribut '{attr}' n'existe pas dans le modèle Event.")
+    Les index (ressource, end_date) limitent le parcours aux événements de la ressource qui se terminent après
+    start_date : le coût ne dépend pas de l'historique des événements passés. La borne sur start_date ne doit
+    pas guider le choix de l'index (support, start_date), qui parcourrait tout l'historique.
+    """
+    column = getattr(Event, resource)
+    query = session.query(Event).filter(column == value, Event.end_date > start_date,
+                                        unindexed(Event.start_date) < end_date)
 
-        column = getattr(Event, attr)
+    if exclude_id is not None:
+        query = query.filter(Event.id != exclude_id)
+
+    return query.order_by(Event.start_date, Event.id)
 
-        if value.lower() in ("none", "null"):
-            query = query.filter(column.is_(None))
-            continue
 
-        if value.lower() in ("true", "false"):
-            query = query.filter(column.is_(value.lower() == "true"))
+def check_event_conflicts(session, event, resources=CONFLICT_RESOURCES):
+    """Vérifie que ni le support ni le lieu de l'événement ne sont déjà occupés sur sa période."""
+    if event.start_date is None or event.end_date is None:
+        return
+
+    for resource in resources:
+        value = getattr(event, resource)
+        if value is None:
             continue
 
-        query = query.filter(column.contains(value))
+        other = query_overlapping_events(session, resource, value, event.start_date, event.end_date,
+                                         event.id).first()
+        if other:
+            raise ValueError(f"Conflit de {CONFLICT_RESOURCES[resource]} avec l'événement {other.id} "
+                             f"'{other.name}' ({other.start_date:%Y-%m-%d %H:%M} - {other.end_date:%Y-%m-%d %H:%M}).")
+
+
+def find_event_conflicts(session, since=None, resources=CONFLICT_RESOURCES):
+    """
+    Renvoie les paires d'événements qui se chevauchent pour un même support ou un même lieu, sous la forme
+    (ressource, premier événement, second événement), parmi les événements qui se terminent après since
+    (par défaut : maintenant).
+
+    Les événements de chaque ressource sont lus triés par date de début puis balayés une seule fois : un tas
+    conserve les événements en cours, triés par date de fin. Le coût est en O(n log n + nombre de conflits).
+
+    Les ressources sont regroupées par DENSE_RANK() dans la collation de la base : les valeurs qu'elle juge
+    égales (ex : "Paris" et "paris" sous MySQL) forment un seul groupe, comme pour check_event_conflicts.
+    """
+    since = since or datetime.now()
+    conflicts = []
+
+    for resource in resources:
+        column = getattr(Event, resource)
+        group = func.dense_rank().over(order_by=column).label("resource_group")
+        query = session.query(Event, group) \
+            .filter(column.isnot(None), Event.start_date.isnot(None), Event.end_date > since) \
+            .order_by(group, Event.start_date, Event.id)
+        if resource == "support_contact_id":
+            query = apply_load_plan(query, Event, {"support_contact": "joined"})
+
+        current = None
+        active = []
+
+        for event, event_group in query:
+            if event_group != current:
+                current = event_group
+                active = []
+
+            while active and active[0][0] <= event.start_date:
+                heapq.heappop(active)
+
+            conflicts.extend((resource, other, event) for _, _, other in sorted(active, key=lambda item: item[1]))
+            heapq.heappush(active, (event.end_date, event.id, event))
+
+    return conflicts
+
+
+class SupportSchedule:
+    """
+    Planning d'un support pendant l'affectation automatique.
+
+    Les événements déjà affectés sont triés par date de début, avec le maximum cumulé de leurs dates de fin :
+    un chevauchement se vérifie par une recherche dichotomique. Les nouvelles affectations arrivent par date de
+    début croissante et ne se chevauchent pas : seule la dernière peut chevaucher l'événement suivant.
+    """
+
+    def __init__(self, employee, busy):
+        self.employee = employee
+        self.starts = [start for start, _ in busy]
+        self.max_ends = []
+        for _, end in busy:
+            self.max_ends.append(max(end, self.max_ends[-1]) if self.max_ends else end)
+        self.last_end = None
+        self.load = len(busy)
+
+    def is_free(self, start, end):
+        position = bisect.bisect_left(self.starts, end)
+        if position and self.max_ends[position - 1] > start:
+            return False
+        return self.last_end is None or self.last_end <= start
+
+    def assign(self, end):
+        self.last_end = end
+        self.load += 1
+
+
+def plan_support_assignment(session, since=None):
+    """
+    Calcule l'affectation des événements à venir sans support (début après since, par défaut maintenant) et
+    renvoie (affectations [(id de l'événement, employé)], ids des événements sans support disponible).
+
+    Les événements sont parcourus par date de début ; chacun est confié au support disponible le moins chargé
+    (nombre d'événements à venir, puis id), à l'aide d'un tas. Les événements sans dates ne sont pas affectés.
+    """
+    since = since or datetime.now()
+
+    supports = session.scalars(
+        select(Employee).where(Employee.role_id == role_cache.id_of("Support", session)).order_by(Employee.id)
+    ).all()
+
+    busy = {employee.id: [] for employee in supports}
+    rows = session.execute(
+        select(Event.support_contact_id, Event.start_date, Event.end_date)
+        .where(Event.support_contact_id.isnot(None), Event.start_date.isnot(None), Event.end_date > since)
+        .order_by(Event.support_contact_id, Event.start_date)
+    )
+    for support_id, start, end in rows:
+        if support_id in busy:
+            busy[support_id].append((start, end))
+
+    schedules = [SupportSchedule(employee, busy[employee.id]) for employee in supports]
+    heap = [(schedule.load, schedule.employee.id, schedule) for schedule in schedules]
+    heapq.heapify(heap)
+
+    pending = session.execute(
+        select(Event.id, Event.start_date, Event.end_date)
+        .where(Event.support_contact_id.is_(None), Event.start_date >= since, Event.end_date.isnot(None))
+        .order_by(Event.start_date, Event.id)
+    )
+
+    assignments = []
+    unassigned = []
+
+    for event_id, start, end in pending:
+        # Supports retirés du tas car occupés sur ce créneau, remis ensuite avec leur charge inchangée
+        skipped = []
+        chosen = None
+
+        while heap:
+            item = heapq.heappop(heap)
+            if item[2].is_free(start, end):
+                chosen = item[2]
+                break
+            skipped.append(item)
+
+        if chosen:
+            chosen.assign(end)
+            assignments.append((event_id, chosen.employee))
+            heapq.heappush(heap, (chosen.load, chosen.employee.id, chosen))
+        else:
+            unassigned.append(event_id)
+
+        for item in skipped:
+            heapq.heappush(heap, item)
+
+    return assignments, unassigned
+
+
+def auto_assign_events(session, since=None, dry_run=False):
+    """
+    Affecte un support aux événements à venir qui n'en ont pas (voir plan_support_assignment) et renvoie
+    (affectations écrites, événements sans support disponible, ids des événements affectés entre-temps).
+    Avec dry_run, l'affectation est calculée sans rien modifier.
+
+    Les affectations sont écrites par lots de 1000 événements, chacun en une seule instruction
+    UPDATE ... SET support_contact_id = CASE id ... END WHERE id IN (...) ; un événement affecté entre-temps par
+    un autre utilisateur n'est pas modifié. Seuls les lots dont le nombre de lignes modifiées est incomplet sont
+    relus, pour ne renvoyer que les affectations réellement écrites.
+    """
+    assignments, unassigned = plan_support_assignment(session, since)
+
+    if dry_run or not assignments:
+        return assignments, unassigned, []
+
+    table = Event.__table__
+    planned = {event_id: employee.id for event_id, employee in assignments}
+    supports = {}
+
+    try:
+        for chunk in chunked(planned, 1000):
+            targets = {event_id: planned[event_id] for event_id in chunk}
+            result = session.execute(
+                update(table)
+                .where(table.c.id.in_(targets), table.c.support_contact_id.is_(None))
+                .values(support_contact_id=case(targets, value=table.c.id))
+            )
+
+            if result.rowcount == len(targets):
+                supports.update(targets)
+            else:
+                supports.update(session.execute(
+                    select(Event.id, Event.support_contact_id).where(Event.id.in_(targets))
+                ).all())
+
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise ValueError(f"Erreur lors de l'affectation des événements : {e}")
+
+    # Ids des supports relevés avant la validation, qui expire les employés
+    written = [(event_id, employee) for event_id, employee in assignments
+               if supports.get(event_id) == planned[event_id]]
+    skipped = [event_id for event_id, _ in assignments if supports.get(event_id) != planned[event_id]]
+    return written, unassigned, skipped
+
+
+def query_events(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Construit la requête des événements en fonction des critères du filtrage, du tri et de la pagination."""
+    query = session.query(Event)
+    query = event_filters.apply(query, filters)
 
     if sorts:
         for attr, order in sorts.items():
@@ -46,24 +274,36 @@ def get_events(session, filters={}, sorts={}):
             elif order == "desc":
                 query = query.order_by(column.desc())
 
-    return query.all()
+    query = apply_load_plan(query, Event, load)
+
+    return paginate(query, Event, sorts, limit, after)
+
+
+def get_events(session, filters={}, sorts={}, limit=None, after=None, load=None):
+    """Récupère la liste des événements en fonction des critères du filtrage et du tri."""
+    return query_events(session, filters, sorts, limit, after, load).all()
+
+
+def stream_events(session, filters={}, sorts={}, batch_size=1000, limit=None, after=None):
+    """Parcourt les événements par lots sous forme de dictionnaires, sans charger tous les résultats en mémoire."""
+    return stream_rows(query_events(session, filters, sorts, limit, after), Event, EXPORT_FIELDS, batch_size)
 
 
 def update_event(session, event_id, updates, req_emp_num):
     """Met à jour un événement."""
-    event = session.query(Event).filter(Event.id == event_id).first()
+    # L'événement et le droit de le modifier sont lus en une seule requête
+    allowed = get_permission("event", "update").clause(req_emp_num, Event.support_contact_id, session)
+    row = session.execute(select(Event, allowed).where(Event.id == event_id)).first()
 
-    if not event:
+    if not row:
         raise ValueError(f"Aucun événement trouvé avec l'ID {event_id}.")
 
-    employee = session.query(Employee).filter(Employee.employee_number == req_emp_num).first()
+    event, allowed = row
 
-    if event.support_contact:
-        if event.support_contact.employee_number != req_emp_num and employee.role.name != "Management":
-            raise ValueError("Vous n'êtes pas autorisé à modifier cet événement.")
-    else:
-        if employee.role.name != "Management":
+    if not allowed:
+        if event.support_contact_id is None:
             raise ValueError("Seul un manager peut modifier l'événement s'il n'a pas de contact support associé.")
+        raise ValueError("Vous n'êtes pas autorisé à modifier cet événement.")
 
     for attribute, value in updates.items():
         if not hasattr(Event, attribute):
@@ -96,6 +336,13 @@ def update_event(session, event_id, updates, req_emp_num):
 
         setattr(event, attribute, value)
 
+    if {"start_date", "end_date", "location"} & set(updates):
+        try:
+            check_event_conflicts(session, event)
+        except ValueError:
+            session.rollback()
+            raise
+
     session.commit()
     session.refresh(event)
     return event
@@ -110,7 +357,7 @@ def update_event_support_contact(session, event_id, support_contact):
     if not employee:
         raise ValueError(f"Aucun employé trouvé avec le numéro ou l'ID {support_contact}.")
 
-    if employee.role.name != "Support":
+    if employee.role_id != role_cache.id_of("Support", session):
         raise ValueError(f"L'employé {employee.first_name} {employee.last_name} ({employee.employee_number}) "
                          f"n'est pas un support.")
 
@@ -119,6 +366,14 @@ def update_event_support_contact(session, event_id, support_contact):
     if not event:
         raise ValueError(f"Aucun événement trouvé avec l'ID {event_id}.")
 
+    if event.start_date is not None and event.end_date is not None:
+        other = query_overlapping_events(session, "support_contact_id", employee.id, event.start_date,
+                                         event.end_date, event.id).first()
+        if other:
+            raise ValueError(f"L'employé {employee.first_name} {employee.last_name} ({employee.employee_number}) "
+                             f"est déjà affecté à l'événement {other.id} '{other.name}' "
+                             f"({other.start_date:%Y-%m-%d %H:%M} - {other.end_date:%Y-%m-%d %H:%M}).")
+
     event.support_contact_id = employee.id
     session.commit()
     session.refresh(event)
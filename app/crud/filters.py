@@ -0,0 +1,176 @@
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, String, and_
+from sqlalchemy.types import TypeDecorator
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+import operator
+
+
+NULL_VALUES = ("none", "null")
+TRUE_VALUES = ("true", "oui", "o", "yes", "y", "1")
+FALSE_VALUES = ("false", "non", "n", "no", "0")
+
+RANGE_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+
+def escape_like(value, escape="/"):
+    """Échappe les caractères spéciaux de LIKE (%, _ et le caractère d'échappement) d'une valeur."""
+    for char in (escape, "%", "_"):
+        value = value.replace(char, escape + char)
+    return value
+
+
+def split_operator(value):
+    """Sépare l'opérateur éventuel (>=, <=, >, <, ..) de la valeur d'un filtre."""
+    for symbol in RANGE_OPERATORS:
+        if value.startswith(symbol):
+            return symbol, value[len(symbol):].strip()
+
+    if ".." in value:
+        low, high = value.split("..", 1)
+        return "between", (low.strip(), high.strip())
+
+    return "=", value
+
+
+class FilterCompiler:
+    """
+    Compile les filtres attribut=valeur d'un modèle en conditions SQL adaptées au type de chaque colonne.
+
+    - entiers, clés étrangères et booléens : égalité (plages autorisées pour les entiers hors clés)
+    - DECIMAL et TIMESTAMP : égalité, >=, <=, >, < et plage début..fin
+    - texte : égalité pour les colonnes uniques ou préfixées par '=', préfixe avec 'valeur*', sinon contient
+    - none / null : IS NULL pour tous les types
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.builders = {}
+        self.unique = set()
+
+        for attribute in model.__mapper__.column_attrs:
+            column = attribute.columns[0]
+            self.builders[attribute.key] = self._builder_for(column)
+            if column.unique:
+                self.unique.add(attribute.key)
+
+    def _builder_for(self, column):
+        # Les types personnalisés (Money, Timestamp) sont filtrés comme le type SQL qu'ils décorent
+        column_type = column.type.impl_instance if isinstance(column.type, TypeDecorator) else column.type
+
+        if isinstance(column_type, Boolean):
+            return self._boolean
+        if isinstance(column_type, Integer):
+            if column.primary_key or column.foreign_keys:
+                return self._key
+            return self._number
+        if isinstance(column_type, Numeric):
+            return self._number
+        if isinstance(column_type, DateTime):
+            return self._datetime
+        if isinstance(column_type, String):
+            return self._text
+        raise TypeError(f"Type de colonne non géré pour le filtrage : {column.type}")
+
+    def apply(self, query, filters):
+        """Ajoute à la requête une condition par filtre."""
+        for attr, value in (filters or {}).items():
+            query = query.filter(self.condition(attr, value))
+        return query
+
+    def condition(self, attr, value):
+        """Renvoie la condition SQL correspondant à un filtre attribut=valeur."""
+        if attr not in self.builders:
+            raise ValueError(f"L'attribut '{attr}' n'existe pas dans le modèle {self.model.__name__}.")
+
+        column = getattr(self.model, attr)
+        value = str(value).strip()
+
+        if value.lower() in NULL_VALUES:
+            return column.is_(None)
+
+        return self.builders[attr](attr, column, value)
+
+    def _key(self, attr, column, value):
+        return column == self._parse_int(attr, value)
+
+    def _boolean(self, attr, column, value):
+        if value.lower() in TRUE_VALUES:
+            return column == True  # noqa: E712
+        if value.lower() in FALSE_VALUES:
+            return column == False  # noqa: E712
+        raise ValueError(f"La valeur de l'attribut '{attr}' doit être 'True' ou 'False'.")
+
+    def _number(self, attr, column, value):
+        parse = self._parse_int if isinstance(column.type, Integer) else self._parse_decimal
+        symbol, operand = split_operator(value)
+
+        if symbol == "between":
+            return column.between(parse(attr, operand[0]), parse(attr, operand[1]))
+        if symbol in RANGE_OPERATORS:
+            return RANGE_OPERATORS[symbol](column, parse(attr, operand))
+        return column == parse(attr, operand)
+
+    def _datetime(self, attr, column, value):
+        symbol, operand = split_operator(value)
+
+        if symbol == "between":
+            low, _ = self._parse_datetime(attr, operand[0])
+            high, date_only = self._parse_datetime(attr, operand[1])
+            if date_only:
+                return and_(column >= low, column < high + timedelta(days=1))
+            return column.between(low, high)
+
+        moment, date_only = self._parse_datetime(attr, operand)
+
+        if date_only:
+            # Une date sans heure désigne la journée entière
+            next_day = moment + timedelta(days=1)
+            match symbol:
+                case "=":
+                    return and_(column >= moment, column < next_day)
+                case "<=":
+                    return column < next_day
+                case ">":
+                    return column >= next_day
+
+        if symbol in RANGE_OPERATORS:
+            return RANGE_OPERATORS[symbol](column, moment)
+        return column == moment
+
+    def _text(self, attr, column, value):
+        if value.startswith("="):
+            return column == value[1:]
+        if value.endswith("*"):
+            # Motif complet passé en paramètre : SQLite n'utilise un index pour LIKE que sur un motif constant
+            return column.like(escape_like(value[:-1]) + "%", escape="/")
+        if attr in self.unique:
+            return column == value
+        return column.contains(value, autoescape=True)
+
+    @staticmethod
+    def _parse_int(attr, value):
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"La valeur '{value}' de l'attribut '{attr}' doit être un nombre entier.")
+
+    @staticmethod
+    def _parse_decimal(attr, value):
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            raise ValueError(f"La valeur '{value}' de l'attribut '{attr}' doit être un nombre.")
+
+    @staticmethod
+    def _parse_datetime(attr, value):
+        try:
+            return datetime.fromisoformat(value), len(value) == 10
+        except ValueError:
+            raise ValueError(f"La date '{value}' de l'attribut '{attr}' est invalide. Utilisez le format "
+                             f"YYYY-MM-DD ou YYYY-MM-DD HH:MM:SS.")
@@ -0,0 +1,41 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+
+LOAD_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+
+
+def apply_load_plan(query, model, load_plan):
+    """
+    Applique un plan de chargement à une requête.
+
+    Le plan associe un chemin de relation (ex : "contract.customer") à une stratégie ("joined" ou "selectin").
+    """
+    if not load_plan:
+        return query
+
+    for path, strategy in load_plan.items():
+        if strategy not in LOAD_STRATEGIES:
+            raise ValueError(f"La stratégie de chargement '{strategy}' n'existe pas.")
+
+        option = None
+        current = model
+
+        for name in path.split("."):
+            relationship = current.__mapper__.relationships.get(name)
+            if relationship is None:
+                raise ValueError(f"La relation '{name}' n'existe pas dans le modèle {current.__name__}.")
+
+            attribute = getattr(current, name)
+            if option is None:
+                option = LOAD_STRATEGIES[strategy](attribute)
+            else:
+                option = getattr(option, f"{strategy}load")(attribute)
+
+            current = relationship.mapper.class_
+
+        query = query.options(option)
+
+    return query
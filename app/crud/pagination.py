@@ -0,0 +1,130 @@
+from sqlalchemy import and_, or_, false
+from datetime import datetime
+from decimal import Decimal
+
+import base64
+import json
+
+
+def sort_keys(sorts):
+    """Renvoie les critères de tri complétés par l'id pour garantir un ordre total."""
+    keys = list((sorts or {}).items())
+    if "id" not in (sorts or {}):
+        keys.append(("id", "asc"))
+    return keys
+
+
+def encode_cursor(keys, values):
+    """Encode un curseur opaque à partir des critères de tri et des valeurs de la dernière ligne."""
+    encoded_values = []
+    for value in values:
+        if isinstance(value, datetime):
+            value = value.isoformat(sep=" ")
+        elif isinstance(value, Decimal):
+            value = str(value)
+        encoded_values.append(value)
+
+    payload = json.dumps({"k": [list(key) for key in keys], "v": encoded_values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor_values(keys, after):
+    """Décode un curseur opaque et renvoie ses valeurs telles qu'encodées (dates et montants en texte)."""
+    try:
+        padding = "=" * (-len(after) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(after + padding))
+        cursor_keys = [tuple(key) for key in payload["k"]]
+        raw_values = payload["v"]
+    except Exception:
+        raise ValueError(f"Le curseur '{after}' est invalide.")
+
+    if cursor_keys != keys or len(raw_values) != len(keys):
+        raise ValueError("Le curseur ne correspond pas aux critères de tri actuels.")
+
+    return raw_values
+
+
+def decode_cursor(model, keys, after):
+    """Décode un curseur (ou un simple id) et renvoie les valeurs typées correspondant aux critères de tri."""
+    if after.isdigit():
+        if keys != [("id", "asc")]:
+            raise ValueError("Un id ne peut être utilisé comme curseur que sans critère de tri.")
+        return [int(after)]
+
+    raw_values = decode_cursor_values(keys, after)
+
+    values = []
+    for (attr, _), value in zip(keys, raw_values):
+        python_type = getattr(model, attr).type.python_type
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None and python_type is Decimal:
+            value = Decimal(value)
+        values.append(value)
+
+    return values
+
+
+def _is_after(column, order, value):
+    """Condition « strictement après value » pour une colonne (les NULL sont classés en premier)."""
+    if order == "asc":
+        if value is None:
+            return column.is_not(None)
+        return column > value
+
+    if value is None:
+        return false()
+    return or_(column < value, column.is_(None))
+
+
+def _is_equal(column, value):
+    if value is None:
+        return column.is_(None)
+    return column == value
+
+
+def keyset_condition(columns, keys, values):
+    """Condition « la ligne suit la ligne de valeurs values » pour les colonnes triées selon keys."""
+    conditions = []
+    for i, (_, order) in enumerate(keys):
+        previous = [_is_equal(columns[j], values[j]) for j in range(i)]
+        conditions.append(and_(*previous, _is_after(columns[i], order, values[i])))
+
+    return or_(*conditions)
+
+
+def paginate(query, model, sorts, limit=None, after=None):
+    """Applique la pagination par curseur (keyset) à une requête déjà filtrée et triée."""
+    if limit is None and after is None:
+        return query
+
+    keys = sort_keys(sorts)
+
+    if "id" not in (sorts or {}):
+        query = query.order_by(model.id.asc())
+
+    if after:
+        values = decode_cursor(model, keys, after)
+        columns = [getattr(model, attr) for attr, _ in keys]
+        query = query.filter(keyset_condition(columns, keys, values))
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
+
+
+def next_cursor(rows, sorts, limit):
+    """Renvoie le curseur de la page suivante, ou None s'il n'y a plus de résultats."""
+    if not limit or not rows or len(rows) < limit:
+        return None
+
+    return cursor_after(rows[-1], sorts)
+
+
+def cursor_after(row, sorts):
+    """Renvoie le curseur désignant les résultats qui suivent une ligne (objet du modèle ou dictionnaire)."""
+    keys = sort_keys(sorts)
+    if isinstance(row, dict):
+        return encode_cursor(keys, [row[attr] for attr, _ in keys])
+    return encode_cursor(keys, [getattr(row, attr) for attr, _ in keys])
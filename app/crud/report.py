@@ -0,0 +1,162 @@
+from app.models.models import Contract, Customer, Employee, SalesSummary
+from app.crud.bulk import chunked
+from app.models.types import month_of
+from sqlalchemy import delete, func, insert, or_, select, update
+from decimal import Decimal
+
+
+# Axes de regroupement du rapport des ventes : colonne du résumé et expression équivalente sur les contrats
+SALES_DIMENSIONS = {
+    "sale_contact": (SalesSummary.sale_contact_id, Contract.sale_contact_id),
+    "customer": (SalesSummary.customer_id, Contract.customer_id),
+    "month": (SalesSummary.month, month_of(Contract.created_at)),
+    "signed": (SalesSummary.signed, Contract.signed),
+}
+
+SUMMARY_KEY = ("sale_contact_id", "customer_id", "month", "signed")
+
+
+def contract_sales_entry(contract):
+    """Renvoie la clé du résumé des ventes d'un contrat et ses montants : (clé, total, restant dû)."""
+    key = (contract.sale_contact_id, contract.customer_id, f"{contract.created_at:%Y-%m}", bool(contract.signed))
+    return key, Decimal(str(contract.total_amount)), Decimal(str(contract.remaining_amount))
+
+
+def update_sales_summary(session, before=None, after=None):
+    """
+    Reporte dans le résumé des ventes le passage d'un contrat de l'état before à l'état after, obtenus par
+    contract_sales_entry (None : contrat absent). La session n'est pas validée.
+    """
+    deltas = {}
+
+    for entry, sign in ((before, -1), (after, 1)):
+        if entry is None:
+            continue
+        key, total, remaining = entry
+        contracts, total_delta, remaining_delta = deltas.get(key, (0, Decimal(0), Decimal(0)))
+        deltas[key] = (contracts + sign, total_delta + sign * total, remaining_delta + sign * remaining)
+
+    for key, (contracts, total, remaining) in deltas.items():
+        if contracts or total or remaining:
+            _apply_sales_delta(session, dict(zip(SUMMARY_KEY, key)), contracts, total, remaining)
+
+
+def _apply_sales_delta(session, key, contracts, total, remaining):
+    """
+    Ajoute un écart à une ligne du résumé portant la clé, ou crée cette ligne.
+
+    Plusieurs lignes peuvent porter la même clé (insertions concurrentes) : l'écart est reporté sur l'une
+    d'elles, qui peut alors avoir un nombre de contrats nul ou négatif sans que les sommes soient fausses.
+    Une ligne n'est donc supprimée que lorsque son nombre de contrats et ses deux montants sont nuls.
+    """
+    conditions = [getattr(SalesSummary, name).is_not_distinct_from(value) for name, value in key.items()]
+    summary_id = session.scalar(select(SalesSummary.id).where(*conditions).limit(1))
+
+    if summary_id is None:
+        session.execute(insert(SalesSummary).values(**key, contracts=contracts, total_amount=total,
+                                                    remaining_amount=remaining))
+        return
+
+    session.execute(
+        update(SalesSummary).where(SalesSummary.id == summary_id).values(
+            contracts=SalesSummary.contracts + contracts,
+            total_amount=SalesSummary.total_amount + total,
+            remaining_amount=SalesSummary.remaining_amount + remaining,
+        )
+    )
+    if contracts < 0:
+        session.execute(delete(SalesSummary).where(SalesSummary.id == summary_id, SalesSummary.contracts == 0,
+                                                   SalesSummary.total_amount == 0,
+                                                   SalesSummary.remaining_amount == 0))
+
+
+def _matching(column, values):
+    """Condition column IN values, None désignant une valeur absente."""
+    values = list(values)
+    known = [value for value in values if value is not None]
+    conditions = [column.in_(known)] if known else []
+    if len(known) < len(values):
+        conditions.append(column.is_(None))
+    return or_(*conditions)
+
+
+def refresh_sales_summary(session, sale_contact_ids=None, customer_ids=None):
+    """
+    Recalcule par GROUP BY sur les contrats les lignes du résumé des ventes des commerciaux ou clients donnés
+    (tout le résumé sans critère). Sert après les modifications de contrats en masse, qui ne passent pas par
+    update_sales_summary. Accepte une session ou une connexion, qui n'est pas validée.
+    """
+    summary_conditions = []
+    contract_conditions = []
+
+    if sale_contact_ids is not None:
+        summary_conditions.append(_matching(SalesSummary.sale_contact_id, sale_contact_ids))
+        contract_conditions.append(_matching(Contract.sale_contact_id, sale_contact_ids))
+    if customer_ids is not None:
+        summary_conditions.append(_matching(SalesSummary.customer_id, customer_ids))
+        contract_conditions.append(_matching(Contract.customer_id, customer_ids))
+
+    month = month_of(Contract.created_at)
+    totals = select(Contract.sale_contact_id, Contract.customer_id, month, Contract.signed, func.count(),
+                    func.sum(Contract.total_amount), func.sum(Contract.remaining_amount)) \
+        .where(*contract_conditions) \
+        .group_by(Contract.sale_contact_id, Contract.customer_id, month, Contract.signed)
+
+    session.execute(delete(SalesSummary).where(*summary_conditions))
+    session.execute(insert(SalesSummary).from_select(
+        [*SUMMARY_KEY, "contracts", "total_amount", "remaining_amount"], totals
+    ))
+
+
+def sales_report(session, by=("sale_contact",), live=False, top=None):
+    """
+    Renvoie les totaux des contrats regroupés selon les axes by (sale_contact, customer, month, signed) :
+    une liste de dictionnaires contenant la valeur de chaque axe, contracts, total_amount et remaining_amount.
+
+    Les totaux sont lus dans le résumé des ventes, ou calculés sur la table des contrats avec live. Avec top,
+    seuls les top groupes de plus gros montant total sont renvoyés. Les commerciaux et clients sont renvoyés
+    sous forme d'objets, chargés par lots de 1000.
+    """
+    for dimension in by:
+        if dimension not in SALES_DIMENSIONS:
+            raise ValueError(f"L'axe '{dimension}' n'existe pas. Axes possibles : {', '.join(SALES_DIMENSIONS)}.")
+
+    model = Contract if live else SalesSummary
+    columns = [SALES_DIMENSIONS[dimension][1 if live else 0] for dimension in by]
+
+    if live:
+        contracts = func.count()
+    else:
+        contracts = func.sum(SalesSummary.contracts)
+    total = func.sum(model.total_amount)
+
+    query = select(*columns, contracts, total, func.sum(model.remaining_amount)).select_from(model) \
+        .group_by(*columns)
+
+    if not live:
+        # Lignes de même clé dont les écarts se compensent : le groupe n'a plus de contrat
+        query = query.having(contracts != 0)
+
+    if top:
+        query = query.order_by(total.desc()).limit(top)
+    else:
+        query = query.order_by(*columns)
+
+    rows = []
+    for row in session.execute(query):
+        values = dict(zip(by, row[:len(by)]))
+        contracts, total_amount, remaining_amount = row[len(by):]
+        rows.append({**values, "contracts": int(contracts), "total_amount": total_amount,
+                     "remaining_amount": remaining_amount})
+
+    for dimension, related in (("sale_contact", Employee), ("customer", Customer)):
+        if dimension in by:
+            ids = {row[dimension] for row in rows if row[dimension] is not None}
+            objects = {}
+            for chunk in chunked(ids, 1000):
+                objects.update({item.id: item
+                                for item in session.scalars(select(related).where(related.id.in_(chunk)))})
+            for row in rows:
+                row[dimension] = objects.get(row[dimension])
+
+    return rows
@@ -1,6 +1,85 @@
+from app.config import ROLE_CACHE_TTL
 from app.models.models import Role
+from sqlalchemy import select
+
+import time
+
+
+class RoleCache:
+    """
+    Rôles et correspondances nom <-> id, lus une seule fois par processus puis conservés ttl secondes.
+
+    Les rôles ne changent presque jamais : les contrôles de rôle et les décorateurs d'autorisation les lisent
+    ici plutôt que de charger la relation Employee.role ou de comparer des identifiants écrits en dur.
+    invalidate() force une nouvelle lecture (rôles insérés ou modifiés dans le même processus).
+    """
+
+    def __init__(self, ttl=ROLE_CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.loads = 0
+        self._roles = None
+        self._ids = {}
+        self._names = {}
+        self._loaded_at = None
+
+    def is_fresh(self):
+        return self._roles is not None and (self.ttl is None or self.clock() - self._loaded_at < self.ttl)
+
+    def load(self, session=None):
+        """
+        Lit les rôles avec la session (par défaut une session de l'application ouverte pour l'occasion) et
+        remplace le contenu du cache.
+        """
+        if session is None:
+            from app.db.database import Session
+
+            with Session() as own_session:
+                return self.load(own_session)
+
+        roles = session.execute(select(Role.id, Role.name, Role.description).order_by(Role.id)).all()
+
+        self._ids = {role.name: role.id for role in roles}
+        self._names = {role.id: role.name for role in roles}
+        self._roles = roles
+        self._loaded_at = self.clock()
+        self.loads += 1
+        return roles
+
+    def invalidate(self):
+        """Oublie les rôles en cache : ils seront relus à la prochaine utilisation."""
+        self._roles = None
+        self._ids = {}
+        self._names = {}
+        self._loaded_at = None
+
+    def roles(self, session=None):
+        """Renvoie les rôles (id, name, description) triés par id."""
+        if not self.is_fresh():
+            self.load(session)
+        return self._roles
+
+    def id_of(self, name, session=None):
+        """Renvoie l'identifiant du rôle portant ce nom, ou lève une ValueError."""
+        self.roles(session)
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise ValueError(f"Le rôle '{name}' n'existe pas.")
+
+    def name_of(self, role_id, session=None):
+        """Renvoie le nom du rôle (None si l'identifiant est inconnu)."""
+        self.roles(session)
+        try:
+            return self._names.get(int(role_id))
+        except (TypeError, ValueError):
+            return None
+
+
+# Cache partagé par tout le processus
+role_cache = RoleCache()
 
 
 def get_roles(session):
-    """Récupère tous les rôles."""
-    return session.query(Role).all()
+    """Récupère tous les rôles (depuis le cache des rôles)."""
+    return role_cache.roles(session)
@@ -0,0 +1,132 @@
+from app.models.models import Customer, Employee, Event
+from app.models.fulltext import SEARCH_KINDS_FACTOR, SEARCH_SOURCES, SEARCH_TABLE
+from app.crud.pagination import decode_cursor_values, encode_cursor, keyset_condition
+from sqlalchemy import Integer, cast, column, func, literal, literal_column, select, table, union_all
+from sqlalchemy.dialects.mysql import match
+
+import re
+
+
+SEARCH_MODELS = {"customer": Customer, "event": Event, "employee": Employee}
+SEARCH_KINDS = tuple(SEARCH_SOURCES)
+
+search_index = table(SEARCH_TABLE, column("rowid"), column("content"))
+
+# Les scores de pertinence sont des flottants : ils sont classés et repris dans les curseurs sous forme d'entiers
+# (millionièmes), qui se comparent exactement d'une requête à l'autre
+SCORE_SCALE = 1_000_000
+
+# Ordre des résultats de chaque moteur, repris dans les curseurs de pagination
+MYSQL_SEARCH_KEYS = [("score", "desc"), ("kind", "asc"), ("id", "asc")]
+SQLITE_SEARCH_KEYS = [("rank", "asc"), ("rowid", "asc")]
+
+
+def search_terms(text):
+    """Découpe le texte recherché en mots ; les opérateurs des moteurs plein texte sont ignorés."""
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        raise ValueError("La recherche doit contenir au moins un mot.")
+    return terms
+
+
+def score_key(score):
+    """Score arrondi au millionième, exprimé en entier (clé de tri stable)."""
+    return cast(func.round(score * SCORE_SCALE), Integer)
+
+
+def decode_search_cursor(keys, after):
+    """Décode un curseur de recherche, dont la première valeur est le score entier du dernier résultat."""
+    values = decode_cursor_values(keys, after)
+    if not isinstance(values[0], int):
+        raise ValueError(f"Le curseur '{after}' est invalide.")
+    return values
+
+
+def _mysql_search(terms, kinds, after=None):
+    """
+    Recherche dans les index FULLTEXT (mode booléen) : chaque mot doit figurer dans la ligne, en début de mot.
+
+    Les mots plus courts que innodb_ft_min_token_size (3 par défaut) et les mots vides sont ignorés par MySQL.
+    """
+    against = " ".join(f"+{term}*" for term in terms)
+    selects = []
+
+    for kind in kinds:
+        model = SEARCH_MODELS[kind]
+        score = match(*(getattr(model, name) for name in SEARCH_SOURCES[kind][1]), against=against)
+        score = score.in_boolean_mode()
+        selects.append(
+            select(literal(kind).label("kind"), model.id.label("id"), score_key(score).label("score"))
+            .where(score > 0)
+        )
+
+    results = union_all(*selects).subquery()
+    query = select(results.c.kind, results.c.id, results.c.score) \
+        .order_by(results.c.score.desc(), results.c.kind, results.c.id)
+
+    if after is not None:
+        query = query.where(keyset_condition([results.c.score, results.c.kind, results.c.id], MYSQL_SEARCH_KEYS,
+                                             after))
+    return query
+
+
+def _sqlite_search(terms, kinds, after=None):
+    """Recherche dans l'index FTS5 : chaque mot doit figurer dans la ligne, en début de mot, classement BM25."""
+    expression = " AND ".join(f'"{term}"*' for term in terms)
+    rank = score_key(func.bm25(literal_column(SEARCH_TABLE)))
+    codes = [SEARCH_SOURCES[kind][0] for kind in kinds]
+
+    query = select(search_index.c.rowid, rank.label("rank")) \
+        .where(literal_column(SEARCH_TABLE).op("MATCH")(expression)) \
+        .order_by(rank, search_index.c.rowid)
+
+    if len(codes) < len(SEARCH_SOURCES):
+        query = query.where((search_index.c.rowid % SEARCH_KINDS_FACTOR).in_(codes))
+    if after is not None:
+        query = query.where(keyset_condition([rank, search_index.c.rowid], SQLITE_SEARCH_KEYS, after))
+    return query
+
+
+def search(session, text, kinds=None, limit=20, after=None):
+    """
+    Recherche un texte dans les clients, événements et employés et renvoie une page de résultats classés par
+    pertinence, sous la forme (résultats, curseur de la page suivante ou None).
+
+    Chaque résultat est un tuple (type, score, objet). Le classement est calculé par une seule requête sur
+    l'index plein texte du moteur : FULLTEXT sous MySQL, FTS5 sous SQLite. Le curseur encode la clé de tri du
+    dernier résultat de la page (score, type et id, ou rang BM25 et rowid sous SQLite, scores arrondis au
+    millionième) : la page suivante reprend après lui sans relire les résultats précédents.
+    """
+    terms = search_terms(text)
+    kinds = [kind for kind in SEARCH_KINDS if not kinds or kind in kinds]
+
+    if session.get_bind().dialect.name == "sqlite":
+        values = decode_search_cursor(SQLITE_SEARCH_KEYS, after) if after else None
+        rows = session.execute(_sqlite_search(terms, kinds, values).limit(limit + 1)).all()
+        cursor = None
+        if len(rows) > limit:
+            rowid, rank = rows[limit - 1]
+            cursor = encode_cursor(SQLITE_SEARCH_KEYS, [rank, rowid])
+
+        kinds_by_code = {code: kind for kind, (code, _) in SEARCH_SOURCES.items()}
+        hits = [(kinds_by_code[rowid % SEARCH_KINDS_FACTOR], rowid // SEARCH_KINDS_FACTOR, -rank / SCORE_SCALE)
+                for rowid, rank in rows[:limit]]
+    else:
+        values = decode_search_cursor(MYSQL_SEARCH_KEYS, after) if after else None
+        rows = session.execute(_mysql_search(terms, kinds, values).limit(limit + 1)).all()
+        cursor = None
+        if len(rows) > limit:
+            kind, item_id, score = rows[limit - 1]
+            cursor = encode_cursor(MYSQL_SEARCH_KEYS, [int(score), kind, item_id])
+
+        hits = [(kind, item_id, int(score) / SCORE_SCALE) for kind, item_id, score in rows[:limit]]
+
+    # Une requête par type de résultat pour charger les lignes de la page
+    objects = {}
+    for kind in {kind for kind, _, _ in hits}:
+        model = SEARCH_MODELS[kind]
+        ids = [item_id for hit_kind, item_id, _ in hits if hit_kind == kind]
+        objects.update({(kind, item.id): item for item in session.scalars(select(model).where(model.id.in_(ids)))})
+
+    results = [(kind, score, objects[(kind, item_id)]) for kind, item_id, score in hits if (kind, item_id) in objects]
+    return results, cursor
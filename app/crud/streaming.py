@@ -0,0 +1,16 @@
+def column_fields(model, exclude=()):
+    """Renvoie le nom des colonnes d'un modèle dans l'ordre de déclaration, hors colonnes exclues."""
+    return [attribute.key for attribute in model.__mapper__.column_attrs if attribute.key not in exclude]
+
+
+def stream_rows(query, model, fields, batch_size=1000):
+    """
+    Parcourt les résultats d'une requête sous forme de dictionnaires, par lots de batch_size lignes.
+
+    Seules les colonnes demandées sont sélectionnées et yield_per active un curseur côté serveur :
+    la mémoire consommée ne dépend pas du nombre total de lignes.
+    """
+    query = query.with_entities(*(getattr(model, field) for field in fields)).yield_per(batch_size)
+
+    for row in query:
+        yield row._asdict()
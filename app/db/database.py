@@ -1,8 +1,106 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.orm import sessionmaker, Session as BaseSession
+from sqlalchemy.pool import StaticPool
+from app.config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, \
+    DB_POOL_PRE_PING, DB_CONNECT_TIMEOUT, DB_ISOLATION_LEVEL
+from app.db.pool import InstrumentedQueuePool, POOL_STATS
 
 
-engine = create_engine(DATABASE_URL)
+_engine = None
 
-Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def is_memory_database(url):
+    """Indique si l'URL désigne une base SQLite en mémoire."""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url=None):
+    """Options du moteur (pool, timeouts, isolation) issues de la configuration, selon le moteur de l'URL."""
+    url = make_url(database_url or DATABASE_URL)
+
+    if is_memory_database(url):
+        # Chaque connexion SQLite en mémoire a sa propre base : une seule connexion, partagée entre threads
+        options = {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+    elif url.get_backend_name() == "sqlite":
+        # Pas de wait_timeout à contourner ; le délai de connexion devient l'attente d'un verrou d'écriture
+        options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "connect_args": {"timeout": DB_CONNECT_TIMEOUT},
+        }
+    else:
+        options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "connect_args": {"connect_timeout": DB_CONNECT_TIMEOUT},
+        }
+
+    if DB_ISOLATION_LEVEL:
+        options["isolation_level"] = DB_ISOLATION_LEVEL
+
+    return options
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    # SQLite n'applique les clés étrangères (ON DELETE CASCADE / SET NULL) que si elles sont activées
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+    # Le pilote sqlite3 ouvre les transactions à sa façon, ce qui casse les SAVEPOINT : SQLAlchemy s'en charge
+    dbapi_connection.isolation_level = None
+
+
+def _begin_sqlite_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+def create_database_engine(database_url=None, **overrides):
+    """Crée un moteur pour l'URL donnée (celle de la configuration par défaut) avec les options de son moteur."""
+    database_url = database_url or DATABASE_URL
+    engine = create_engine(database_url, **{**engine_options(database_url), **overrides})
+
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _configure_sqlite_connection)
+        event.listen(engine, "begin", _begin_sqlite_transaction)
+
+    return engine
+
+
+def get_engine():
+    """Crée le moteur SQLAlchemy à la première utilisation de la base de données."""
+    global _engine
+    if _engine is None:
+        _engine = create_database_engine()
+        POOL_STATS.attach(_engine)
+    return _engine
+
+
+def get_pool_stats():
+    """Renvoie les statistiques du pool de connexions du moteur de l'application."""
+    return POOL_STATS.snapshot()
+
+
+def __getattr__(name):
+    # Permet "from app.db.database import engine" sans créer le moteur à l'import du module
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession(BaseSession):
+    """Session qui ne se lie au moteur qu'au premier accès à la base de données."""
+
+    def get_bind(self, *args, **kwargs):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(*args, **kwargs)
+
+
+Session = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
@@ -0,0 +1,97 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.crud import customer as crud_customer
+from app.crud import contract as crud_contract
+from app.crud import employee as crud_employee
+from app.crud import event as crud_event
+from datetime import datetime
+
+
+# python -m app.db.explain
+
+# Formes de requêtes émises par les fonctions get_* sur les chemins d'accès les plus fréquents
+QUERY_SHAPES = [
+    ("Employé par numéro", crud_employee.query_employees, {"employee_number": "EMP0001"}, {}),
+    ("Clients par entreprise", crud_customer.query_customers, {"company": "Acme*"}, {}),
+    ("Clients par nom", crud_customer.query_customers, {"last_name": "=Dupont"}, {}),
+    ("Clients d'un commercial", crud_customer.query_customers, {"sale_contact_id": "1"}, {}),
+    ("Contrats non signés", crud_contract.query_contracts, {"signed": "False"}, {}),
+    ("Contrats non signés d'un commercial", crud_contract.query_contracts,
+     {"signed": "False", "sale_contact_id": "1"}, {}),
+    ("Contrats d'un client", crud_contract.query_contracts, {"customer_id": "1"}, {}),
+    ("Mes événements", crud_event.query_events,
+     {"support_contact_id": "1", "start_date": ">=2025-01-01"}, {"start_date": "asc"}),
+    ("Événements sans support", crud_event.query_events, {"support_contact_id": "None"}, {}),
+    ("Chevauchements d'un support",
+     lambda session, filters, sorts: crud_event.query_overlapping_events(
+         session, "support_contact_id", 1, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 12)), {}, {}),
+    ("Chevauchements d'un lieu",
+     lambda session, filters, sorts: crud_event.query_overlapping_events(
+         session, "location", "Paris", datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 12)), {}, {}),
+]
+
+
+class Explain(Executable, ClauseElement):
+    """Construction SQL « EXPLAIN <requête> »."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "sqlite")
+def _compile_explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+def explain(session, query):
+    """Renvoie le plan d'exécution d'une requête sous forme de liste de dictionnaires."""
+    result = session.execute(Explain(query.statement))
+    return [dict(row._mapping) for row in result]
+
+
+def full_scans(session, query):
+    """Renvoie la description des parcours complets de table présents dans le plan d'une requête."""
+    scans = []
+
+    for step in explain(session, query):
+        if session.get_bind().dialect.name == "sqlite":
+            if step["detail"].startswith("SCAN "):
+                scans.append(step["detail"])
+        elif step.get("type") == "ALL":
+            scans.append(f"SCAN {step['table']}")
+
+    return scans
+
+
+def check_query_shapes(session):
+    """Exécute EXPLAIN sur chaque forme de requête et renvoie (nom, parcours complets) pour chacune."""
+    return [
+        (name, full_scans(session, query_func(session, filters, sorts)))
+        for name, query_func, filters, sorts in QUERY_SHAPES
+    ]
+
+
+if __name__ == "__main__":
+    from app.db.database import Session
+
+    db = Session()
+    found = False
+
+    for name, scans in check_query_shapes(db):
+        if scans:
+            found = True
+            print(f"[PARCOURS COMPLET] {name} : {', '.join(scans)}")
+        else:
+            print(f"[OK] {name}")
+
+    db.close()
+
+    if found:
+        raise SystemExit(1)
@@ -1,20 +1,26 @@
 from app.models.models import Base, Employee, Customer, Contract, Event
 from app.db.database import Session, engine
-from app.auth.password import hash_password
+from app.crud.report import refresh_sales_summary
+from app.db.migrate import upgrade
+from app.auth.password import hash_password, use_profile
 
 
 # python -m app.db.fake_data
 
 db = Session()
 
-# Supprimer toutes les tables sauf Role
+# Profil rapide : les mots de passe sont recalculés avec le profil courant à la première connexion
+use_profile("fast")
+password = hash_password("password")
+
+print("Application des migrations...")
+upgrade(engine, log=print)
+
+# Vider toutes les tables sauf Role, sans toucher au schéma
 for table in reversed(Base.metadata.sorted_tables):  # reversed pour gérer les FK
     if table.name != "role":
-        print(f"Suppression de la table {table.name}...")
-        table.drop(bind=engine, checkfirst=True)
-
-print("Création de toutes les tables...")
-Base.metadata.create_all(bind=engine)
+        print(f"Suppression des données de la table {table.name}...")
+        db.execute(table.delete())
 
 db.commit()
 
@@ -24,7 +30,7 @@ employees = [
         first_name="Alice",
         last_name="Dupont",
         email="alice.dupont@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=1,  # Commercial
     ),
     Employee(
@@ -32,7 +38,7 @@ employees = [
         first_name="Marie",
         last_name="Curie",
         email="marie.curie@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=1,  # Commercial
     ),
     Employee(
@@ -40,7 +46,7 @@ employees = [
         first_name="Bob",
         last_name="Martin",
         email="bob.martin@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=2,  # Support
     ),
     Employee(
@@ -48,7 +54,7 @@ employees = [
         first_name="Zoe",
         last_name="Guerin",
         email="zoe.guerin@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=2,  # Support
     ),
     Employee(
@@ -56,7 +62,7 @@ employees = [
         first_name="Charlie",
         last_name="Durand",
         email="charlie.durand@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=3,  # Gestion
     ),
     Employee(
@@ -64,7 +70,7 @@ employees = [
         first_name="Nicolas",
         last_name="Hulot",
         email="nicolas.hulot@gmail.com",
-        password=hash_password("password"),
+        password=password,
         role_id=3,  # Gestion
     ),
 ]
@@ -170,6 +176,8 @@ db.add_all(employees)
 db.add_all(customers)
 db.add_all(contracts)
 db.add_all(events)
+db.flush()
+refresh_sales_summary(db)
 db.commit()
 
 print("Données de test insérées avec succès !")
@@ -0,0 +1,315 @@
+from app.models.models import Base, Role, Employee, Customer, Contract, Event
+from app.auth.password import hash_password
+from app.db.database import create_database_engine, get_engine
+from app.crud.report import refresh_sales_summary
+from app.crud.role import role_cache
+from app.db.migrate import upgrade
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from sqlalchemy import insert, select
+
+import click
+import random
+import time
+
+
+# python -m app.db.generate --employees 5k --customers 1M --contracts-per-customer 0-5 --event-ratio 0.6 --seed 42
+# python -m app.db.generate --database-url sqlite:///bench.db --customers 100k
+
+ROLES = [
+    {"id": 1, "name": "Commercial", "description": "Responsable des ventes et de la relation client"},
+    {"id": 2, "name": "Support", "description": "Assistance technique et support client"},
+    {"id": 3, "name": "Management", "description": "Gestion des opérations et des ressources humaines"},
+]
+
+# Répartition des employés par rôle
+ROLE_WEIGHTS = {1: 0.5, 2: 0.35, 3: 0.15}
+
+FIRST_NAMES = ["Alice", "Bob", "Camille", "David", "Emma", "François", "Gabriel", "Hugo", "Inès", "Jules", "Léa",
+               "Louis", "Manon", "Nathan", "Chloé", "Paul", "Sarah", "Thomas", "Zoé", "Lucas", "Jade", "Arthur"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+              "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier"]
+COMPANY_WORDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Cyberdyne", "Soylent", "Tyrell",
+                 "Vandelay", "Aperture", "Oscorp", "Wonka", "Gringotts", "Monarch", "Nakatomi", "Dunder"]
+COMPANY_SUFFIXES = ["SA", "SAS", "SARL", "Corp", "Inc", "Group", "Industries", "Conseil"]
+EVENT_NAMES = ["Séminaire", "Lancement produit", "Soirée de gala", "Conférence", "Atelier", "Salon",
+               "Assemblée générale", "Team building", "Mariage", "Anniversaire d'entreprise"]
+LOCATIONS = ["Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Toulouse", "Nice", "Strasbourg", "Rennes"]
+
+# Période couverte par les données générées
+HISTORY_DAYS = 3 * 365
+FUTURE_DAYS = 365
+
+
+def parse_count(value):
+    """Convertit un effectif du type 5000, 5k ou 1M en entier."""
+    value = str(value).strip().lower()
+    multipliers = {"k": 1_000, "m": 1_000_000}
+
+    try:
+        if value and value[-1] in multipliers:
+            return int(float(value[:-1]) * multipliers[value[-1]])
+        return int(value)
+    except ValueError:
+        raise click.BadParameter(f"'{value}' n'est pas un effectif valide (ex : 5000, 5k, 1M).")
+
+
+def parse_range(value):
+    """Convertit une plage du type 0-5 en tuple (minimum, maximum)."""
+    try:
+        low, high = (int(part) for part in str(value).split("-", 1)) if "-" in str(value) else (int(value),) * 2
+    except ValueError:
+        raise click.BadParameter(f"'{value}' n'est pas une plage valide (ex : 0-5).")
+
+    if low < 0 or high < low:
+        raise click.BadParameter(f"'{value}' n'est pas une plage valide (ex : 0-5).")
+    return low, high
+
+
+def zipf_weights(count, exponent=1.1):
+    """Poids cumulés d'une loi de Zipf : quelques éléments concentrent la majorité des tirages."""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+class DatasetGenerator:
+    """
+    Génère un jeu de données volumineux et reproductible (même graine, mêmes données).
+
+    Les distributions sont asymétriques comme en production : quelques commerciaux et entreprises
+    concentrent la plupart des clients, peu de clients ont beaucoup de contrats, l'activité récente
+    est plus dense que l'ancienne. Les identifiants sont attribués par le générateur afin de relier
+    les lignes sans relire la base.
+    """
+
+    def __init__(self, seed=None, now=None):
+        self.random = random.Random(seed)
+        self.now = (now or datetime.now()).replace(microsecond=0)
+
+    def recent_date(self):
+        """Date passée, plus probable à mesure qu'elle est récente."""
+        days = HISTORY_DAYS * self.random.random() ** 2
+        return self.now - timedelta(days=days, seconds=self.random.randrange(86400))
+
+    def employees(self, count, password):
+        roles = self.random.choices(list(ROLE_WEIGHTS), weights=list(ROLE_WEIGHTS.values()), k=count)
+        # Au moins un employé par rôle
+        for role_id in range(1, min(count, len(ROLE_WEIGHTS)) + 1):
+            roles[role_id - 1] = role_id
+
+        for employee_id, role_id in enumerate(roles, start=1):
+            first_name = self.random.choice(FIRST_NAMES)
+            last_name = self.random.choice(LAST_NAMES)
+            yield {
+                "id": employee_id,
+                "employee_number": f"EMP{employee_id:04d}",
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": f"{first_name}.{last_name}.{employee_id}@epicevents.test".lower(),
+                "password": password,
+                "role_id": role_id,
+                "created_at": self.recent_date(),
+            }
+
+    def customers(self, first_id, count, sale_contacts, sale_weights, companies, company_weights):
+        contacts = self.random.choices(sale_contacts, cum_weights=sale_weights, k=count)
+        company_names = self.random.choices(companies, cum_weights=company_weights, k=count)
+
+        for offset, (sale_contact_id, company) in enumerate(zip(contacts, company_names)):
+            customer_id = first_id + offset
+            first_name = self.random.choice(FIRST_NAMES)
+            last_name = self.random.choice(LAST_NAMES)
+            created_at = self.recent_date()
+            yield {
+                "id": customer_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": f"{first_name}.{last_name}.{customer_id}@client.test".lower(),
+                "phone": f"0{self.random.randint(1, 7)}{self.random.randrange(10 ** 8):08d}",
+                "company": company,
+                # 5 % de clients sans commercial (commercial parti)
+                "sale_contact_id": sale_contact_id if self.random.random() >= 0.05 else None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def contracts(self, first_id, customers, per_customer):
+        low, high = per_customer
+        contract_id = first_id
+
+        for customer in customers:
+            # Tirage biaisé vers le bas de la plage : peu de clients ont beaucoup de contrats
+            count = low + int((high - low + 1) * self.random.random() ** 2)
+
+            for _ in range(count):
+                total = Decimal(round(self.random.lognormvariate(8, 1), 2)).quantize(Decimal("0.01"))
+                paid = self.random.random()
+                remaining = Decimal(0) if paid < 0.4 else (total * Decimal(paid)).quantize(Decimal("0.01"))
+                yield {
+                    "id": contract_id,
+                    "customer_id": customer["id"],
+                    "sale_contact_id": customer["sale_contact_id"],
+                    "total_amount": total,
+                    "remaining_amount": min(remaining, total),
+                    "signed": self.random.random() < 0.8,
+                    "created_at": max(customer["created_at"], self.recent_date()),
+                }
+                contract_id += 1
+
+    def events(self, first_id, contracts, ratio, supports, support_weights):
+        event_id = first_id
+
+        for contract in contracts:
+            if not contract["signed"] or self.random.random() >= ratio:
+                continue
+
+            start = contract["created_at"] + timedelta(days=self.random.randint(7, FUTURE_DAYS))
+            start = start.replace(hour=self.random.randint(8, 20), minute=0, second=0)
+            yield {
+                "id": event_id,
+                "name": self.random.choice(EVENT_NAMES),
+                "contract_id": contract["id"],
+                # 20 % d'événements sans support assigné
+                "support_contact_id": (self.random.choices(supports, cum_weights=support_weights)[0]
+                                       if supports and self.random.random() >= 0.2 else None),
+                "start_date": start,
+                "end_date": start + timedelta(hours=self.random.randint(1, 8)),
+                "location": self.random.choice(LOCATIONS),
+                "attendees": int(self.random.lognormvariate(3.5, 1)),
+                "notes": None,
+                "created_at": contract["created_at"],
+            }
+            event_id += 1
+
+
+def reset_tables(engine):
+    """Met le schéma à jour par les migrations, vide toutes les tables puis insère les rôles."""
+    upgrade(engine)
+
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+        connection.execute(insert(Role), ROLES)
+    role_cache.invalidate()
+
+
+def insert_batch(connection, model, rows):
+    """Insère un lot de lignes (INSERT multi-lignes avec PyMySQL, executemany avec SQLite)."""
+    if rows:
+        connection.execute(insert(model), rows)
+    return len(rows)
+
+
+def generate(engine, employees=50, customers=1000, contracts_per_customer=(0, 5), event_ratio=0.6, seed=None,
+             batch_size=5000, password_hash=None, progress=None):
+    """
+    Génère le jeu de données dans des tables vides (hors rôles) et renvoie le nombre de lignes par table.
+
+    Les clients sont produits par lots de batch_size, suivis de leurs contrats et événements : la
+    mémoire utilisée ne dépend pas du volume demandé. Chaque lot est inséré dans sa propre transaction.
+    """
+    generator = DatasetGenerator(seed)
+    password_hash = password_hash or hash_password("password")
+    counts = {"employee": 0, "customer": 0, "contract": 0, "event": 0}
+
+    employee_rows = list(generator.employees(employees, password_hash))
+    with engine.begin() as connection:
+        for start in range(0, len(employee_rows), batch_size):
+            counts["employee"] += insert_batch(connection, Employee, employee_rows[start:start + batch_size])
+
+    sale_contacts = [row["id"] for row in employee_rows if row["role_id"] == 1]
+    supports = [row["id"] for row in employee_rows if row["role_id"] == 2]
+    generator.random.shuffle(sale_contacts)
+    generator.random.shuffle(supports)
+
+    companies = [f"{generator.random.choice(COMPANY_WORDS)} {generator.random.choice(COMPANY_SUFFIXES)} {i}"
+                 for i in range(max(1, customers // 20))]
+
+    sale_weights = zipf_weights(len(sale_contacts)) if sale_contacts else None
+    support_weights = zipf_weights(len(supports), exponent=0.8) if supports else None
+    company_weights = zipf_weights(len(companies))
+
+    for start in range(0, customers, batch_size):
+        count = min(batch_size, customers - start)
+
+        if sale_contacts:
+            customer_rows = list(generator.customers(start + 1, count, sale_contacts, sale_weights,
+                                                     companies, company_weights))
+        else:
+            customer_rows = list(generator.customers(start + 1, count, [None], [1], companies, company_weights))
+
+        contract_rows = list(generator.contracts(counts["contract"] + 1, customer_rows, contracts_per_customer))
+        event_rows = list(generator.events(counts["event"] + 1, contract_rows, event_ratio, supports,
+                                           support_weights))
+
+        with engine.begin() as connection:
+            counts["customer"] += insert_batch(connection, Customer, customer_rows)
+            for offset in range(0, len(contract_rows), batch_size):
+                counts["contract"] += insert_batch(connection, Contract, contract_rows[offset:offset + batch_size])
+            for offset in range(0, len(event_rows), batch_size):
+                counts["event"] += insert_batch(connection, Event, event_rows[offset:offset + batch_size])
+
+        if progress:
+            progress(counts)
+
+    with engine.begin() as connection:
+        refresh_sales_summary(connection)
+
+    return counts
+
+
+def create_generation_engine(database_url=None):
+    """Moteur de l'application, ou moteur dédié pour une autre base (ex : fichier SQLite local)."""
+    if not database_url:
+        return get_engine()
+    return create_database_engine(database_url)
+
+
+@click.command()
+@click.option("--employees", default="50", show_default=True, help="Nombre d'employés (ex : 5k).")
+@click.option("--customers", default="1000", show_default=True, help="Nombre de clients (ex : 1M).")
+@click.option("--contracts-per-customer", default="0-5", show_default=True,
+              help="Plage du nombre de contrats par client (ex : 0-5).")
+@click.option("--event-ratio", type=click.FloatRange(0, 1), default=0.6, show_default=True,
+              help="Proportion de contrats signés ayant un événement.")
+@click.option("--seed", type=int, help="Graine aléatoire, pour reproduire exactement un jeu de données.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=5000, show_default=True,
+              help="Nombre de clients générés et insérés par transaction.")
+@click.option("--database-url", help="Base cible (ex : sqlite:///bench.db). Par défaut : base de l'application.")
+@click.option("--yes", is_flag=True, help="Ne pas demander de confirmation avant de vider les tables.")
+def main(employees, customers, contracts_per_customer, event_ratio, seed, batch_size, database_url, yes):
+    """Génère un jeu de données volumineux pour les tests de performance."""
+    employees = parse_count(employees)
+    customers = parse_count(customers)
+    contracts_per_customer = parse_range(contracts_per_customer)
+
+    engine = create_generation_engine(database_url)
+
+    if not yes:
+        click.confirm(f"Toutes les tables de {engine.url.render_as_string(hide_password=True)} vont être "
+                      f"vidées. Continuer ?", abort=True)
+
+    print("Mise à jour du schéma et suppression des données...")
+    reset_tables(engine)
+
+    start = time.perf_counter()
+
+    def progress(counts):
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        print(f"\r{counts['customer']}/{customers} clients, {counts['contract']} contrats, {counts['event']} "
+              f"événements ({total / elapsed:.0f} lignes/s)", end="", flush=True)
+
+    counts = generate(engine, employees, customers, contracts_per_customer, event_ratio, seed, batch_size,
+                      progress=progress)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{sum(counts.values())} lignes insérées en {elapsed:.1f} s : {counts}")
+
+    with engine.connect() as connection:
+        first = connection.execute(select(Employee.employee_number).order_by(Employee.id).limit(1)).scalar()
+    print(f"Connexion possible avec {first} (ou tout autre numéro) et le mot de passe 'password'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,15 @@
 from app.db.database import engine
-from app.models.models import Base, Role
-from app.db.database import Session
+from app.db.migrate import upgrade
 from sqlalchemy_utils import database_exists, create_database
 
 
-# python -m app.db.create_db
+# python -m app.db.init_db
 
 if not database_exists(engine.url):
     print("La base de données n'existe pas, création en cours...")
     create_database(engine.url)
 
-print("Suppression de toutes les tables...")
-Base.metadata.drop_all(bind=engine)
-
-print("Création de toutes les tables...")
-Base.metadata.create_all(bind=engine)
-
-print("Peuplement des données...")
-db = Session()
-
-roles = [
-    Role(name="Commercial", description="Responsable des ventes et de la relation client"),
-    Role(name="Support", description="Assistance technique et support client"),
-    Role(name="Management", description="Gestion des opérations et des ressources humaines")
-]
-
-db.add_all(roles)
-
-db.commit()
-db.close()
+# Les tables existantes et leurs données sont conservées : seules les migrations en attente sont appliquées
+print("Application des migrations...")
+done = upgrade(engine, log=print)
+print(f"{len(done)} migration(s) appliquée(s)." if done else "Le schéma est à jour.")
@@ -0,0 +1,259 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, insert, select, update
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from app.models.types import Timestamp, local_now
+
+import click
+import importlib
+import pkgutil
+import time
+
+
+# python -m app.db.migrate status
+# python -m app.db.migrate upgrade [--target 2] [--batch-size 1000] [--pause 0.1]
+
+MIGRATIONS_PACKAGE = "app.db.migrations"
+
+schema_metadata = MetaData()
+
+# Versions appliquées, une ligne par migration
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", Timestamp, server_default=local_now(), nullable=False),
+)
+
+
+class Migration:
+    """Migration chargée depuis un module mNNN_nom.py du paquet app.db.migrations."""
+
+    def __init__(self, version, description, upgrade):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+    def __repr__(self):
+        return f"<Migration({self.version:03d}, '{self.description}')>"
+
+
+def load_migrations(package=MIGRATIONS_PACKAGE):
+    """Charge les migrations du paquet, triées par version (numéro du nom de module)."""
+    migrations = []
+    module_package = importlib.import_module(package)
+
+    for info in pkgutil.iter_modules(module_package.__path__):
+        if not info.name.startswith("m") or not info.name[1:4].isdigit():
+            continue
+
+        module = importlib.import_module(f"{package}.{info.name}")
+        description = (module.__doc__ or info.name).strip().splitlines()[0]
+        migrations.append(Migration(int(info.name[1:4]), description, module.upgrade))
+
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError("Deux migrations portent le même numéro de version.")
+
+    return migrations
+
+
+class Operations:
+    """
+    Opérations de schéma mises à disposition des migrations, adaptées au moteur de base de données.
+
+    Toutes les opérations sont idempotentes : une migration interrompue peut être relancée.
+    - create_index : index créé sans bloquer les écritures (ALGORITHM=INPLACE, LOCK=NONE sous MySQL), sauf
+      index FULLTEXT
+    - add_column : colonne ajoutée sans recopie de la table lorsque le moteur le permet
+    - backfill : mise à jour par lots de clés primaires, validés un par un, avec une pause entre deux lots
+    """
+
+    def __init__(self, connection, batch_size=1000, pause=0.0, log=None):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+        self.batch_size = batch_size
+        self.pause = pause
+        self.log = log or (lambda message: None)
+
+    def has_table(self, table_name):
+        return inspect(self.connection).has_table(table_name)
+
+    def has_index(self, table_name, index_name):
+        return any(index["name"] == index_name for index in inspect(self.connection).get_indexes(table_name))
+
+    def has_column(self, table_name, column_name):
+        return any(column["name"] == column_name for column in inspect(self.connection).get_columns(table_name))
+
+    def create_tables(self, tables):
+        """Crée les tables absentes, avec leurs index et contraintes."""
+        missing = [table for table in tables if not self.has_table(table.name)]
+        if missing:
+            missing[0].metadata.create_all(self.connection, tables=missing)
+            self.log(f"Tables créées : {', '.join(table.name for table in missing)}")
+        return missing
+
+    def create_index(self, index):
+        """Crée un index s'il n'existe pas encore, sans bloquer la table lorsque le moteur le permet."""
+        if self.has_index(index.table.name, index.name):
+            return False
+
+        ddl = str(CreateIndex(index).compile(dialect=self.connection.dialect))
+        if self.dialect == "mysql" and index.dialect_options["mysql"]["prefix"] == "FULLTEXT":
+            # InnoDB construit un index FULLTEXT sur place mais bloque les écritures pendant la construction
+            ddl += " ALGORITHM=INPLACE LOCK=SHARED"
+        elif self.dialect == "mysql":
+            ddl += " ALGORITHM=INPLACE LOCK=NONE"
+
+        start = time.perf_counter()
+        self.connection.exec_driver_sql(ddl)
+        self.connection.commit()
+        self.log(f"Index {index.name} créé en {time.perf_counter() - start:.1f} s")
+        return True
+
+    def add_column(self, table_name, column):
+        """Ajoute une colonne si elle n'existe pas encore."""
+        if self.has_column(table_name, column.name):
+            return False
+
+        # La colonne doit être rattachée à une table pour être compilée
+        Table(table_name, MetaData(), column)
+        ddl = f"ALTER TABLE {table_name} ADD COLUMN {CreateColumn(column).compile(dialect=self.connection.dialect)}"
+        if self.dialect == "mysql":
+            ddl += ", ALGORITHM=INPLACE, LOCK=NONE"
+
+        self.connection.exec_driver_sql(ddl)
+        self.connection.commit()
+        self.log(f"Colonne {table_name}.{column.name} ajoutée")
+        return True
+
+    def backfill(self, table, values, where=None, batch_size=None, pause=None):
+        """
+        Met à jour les lignes de la table par lots de clés primaires croissantes et renvoie le nombre de lignes
+        modifiées.
+
+        Chaque lot est validé séparément : les verrous sont courts et une reprise ne refait que les lots restants
+        si la condition where exclut les lignes déjà traitées.
+        """
+        batch_size = batch_size or self.batch_size
+        pause = self.pause if pause is None else pause
+        key = table.primary_key.columns.values()[0]
+
+        last_key = None
+        updated = 0
+
+        while True:
+            keys = select(key).order_by(key).limit(batch_size)
+            if last_key is not None:
+                keys = keys.where(key > last_key)
+            if where is not None:
+                keys = keys.where(where)
+
+            batch = self.connection.execute(keys).scalars().all()
+            if not batch:
+                break
+
+            statement = update(table).where(key >= batch[0], key <= batch[-1]).values(values)
+            if where is not None:
+                statement = statement.where(where)
+
+            updated += self.connection.execute(statement).rowcount
+            self.connection.commit()
+            last_key = batch[-1]
+
+            self.log(f"{table.name} : {updated} lignes mises à jour")
+            if pause:
+                time.sleep(pause)
+
+        return updated
+
+
+def applied_versions(connection):
+    """Renvoie les versions appliquées et leur date d'application, indexées par version."""
+    if not inspect(connection).has_table(schema_version.name):
+        return {}
+    rows = connection.execute(select(schema_version.c.version, schema_version.c.applied_at))
+    return {version: applied_at for version, applied_at in rows}
+
+
+def migration_status(engine, migrations=None):
+    """Renvoie (migration, date d'application ou None) pour chaque migration connue."""
+    migrations = load_migrations() if migrations is None else migrations
+
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+
+    return [(migration, applied.get(migration.version)) for migration in migrations]
+
+
+def upgrade(engine, target=None, migrations=None, batch_size=1000, pause=0.0, log=None):
+    """Applique dans l'ordre les migrations en attente (jusqu'à la version target) et renvoie leurs versions."""
+    migrations = load_migrations() if migrations is None else migrations
+    log = log or (lambda message: None)
+    done = []
+
+    with engine.connect() as connection:
+        schema_metadata.create_all(connection)
+        connection.commit()
+        applied = applied_versions(connection)
+
+        for migration in migrations:
+            if migration.version in applied or (target is not None and migration.version > target):
+                continue
+
+            log(f"Migration {migration.version:03d} : {migration.description}")
+            migration.upgrade(Operations(connection, batch_size, pause, log))
+
+            connection.execute(insert(schema_version).values(version=migration.version,
+                                                             description=migration.description))
+            connection.commit()
+            done.append(migration.version)
+
+    return done
+
+
+def find_index(metadata, name):
+    """Renvoie l'index du modèle portant ce nom."""
+    for table in metadata.tables.values():
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise ValueError(f"L'index '{name}' n'existe pas dans les modèles.")
+
+
+@click.group()
+def main():
+    """Migrations du schéma de la base de données."""
+
+
+@main.command("status")
+def status_command():
+    """Affiche la version du schéma et les migrations en attente."""
+    from app.db.database import get_engine
+
+    statuses = migration_status(get_engine())
+    applied = [migration.version for migration, applied_at in statuses if applied_at]
+    print(f"Version du schéma : {max(applied) if applied else 0}")
+
+    for migration, applied_at in statuses:
+        state = f"appliquée le {applied_at:%Y-%m-%d %H:%M:%S}" if applied_at else "en attente"
+        print(f"[{migration.version:03d}] {migration.description} ({state})")
+
+
+@main.command("upgrade")
+@click.option("--target", type=int, help="Version à atteindre. Par défaut : dernière version.")
+@click.option("--batch-size", type=click.IntRange(1), default=1000, show_default=True,
+              help="Nombre de lignes par lot pour les mises à jour de données.")
+@click.option("--pause", type=click.FloatRange(0), default=0.0, show_default=True,
+              help="Pause en secondes entre deux lots, pour limiter la charge sur une base en production.")
+def upgrade_command(target, batch_size, pause):
+    """Applique les migrations en attente."""
+    from app.db.database import get_engine
+
+    done = upgrade(get_engine(), target, batch_size=batch_size, pause=pause, log=print)
+    print(f"{len(done)} migration(s) appliquée(s)." if done else "Le schéma est à jour.")
+
+
+if __name__ == "__main__":
+    main()
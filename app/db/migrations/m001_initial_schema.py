@@ -0,0 +1,22 @@
+"""Schéma initial : tables des rôles, employés, clients, contrats et événements, et rôles de base."""
+from sqlalchemy import insert, select
+from app.models.models import Role, Employee, Customer, Contract, Event
+from app.crud.role import role_cache
+
+
+ROLES = [
+    {"id": 1, "name": "Commercial", "description": "Responsable des ventes et de la relation client"},
+    {"id": 2, "name": "Support", "description": "Assistance technique et support client"},
+    {"id": 3, "name": "Management", "description": "Gestion des opérations et des ressources humaines"},
+]
+
+
+def upgrade(op):
+    op.create_tables([Role.__table__, Employee.__table__, Customer.__table__, Contract.__table__, Event.__table__])
+
+    existing = set(op.connection.execute(select(Role.name)).scalars())
+    missing = [role for role in ROLES if role["name"] not in existing]
+    if missing:
+        op.connection.execute(insert(Role), missing)
+        op.connection.commit()
+        role_cache.invalidate()
@@ -0,0 +1,21 @@
+"""Index des filtres et tris fréquents des commandes list, pour les bases créées avant leur ajout."""
+from app.db.migrate import find_index
+from app.models.models import Base
+
+
+INDEXES = [
+    "ix_employee_role",
+    "ix_customer_company",
+    "ix_customer_last_name_first_name",
+    "ix_customer_sale_contact",
+    "ix_contract_signed_sale_contact",
+    "ix_contract_customer",
+    "ix_contract_sale_contact",
+    "ix_event_support_contact_start",
+    "ix_event_contract",
+]
+
+
+def upgrade(op):
+    for name in INDEXES:
+        op.create_index(find_index(Base.metadata, name))
@@ -0,0 +1,22 @@
+"""Index plein texte des clients, événements et employés (commande search)."""
+from app.db.migrate import find_index
+from app.models.fulltext import create_search_index
+from app.models.models import Base
+
+
+FULLTEXT_INDEXES = [
+    "ft_customer_search",
+    "ft_event_search",
+    "ft_employee_search",
+]
+
+
+def upgrade(op):
+    if op.dialect == "mysql":
+        for name in FULLTEXT_INDEXES:
+            op.create_index(find_index(Base.metadata, name))
+        return
+
+    if create_search_index(op.connection):
+        op.connection.commit()
+        op.log("Index plein texte SQLite créé")
@@ -0,0 +1,14 @@
+"""Index du contrôle des chevauchements d'événements (support et lieu)."""
+from app.db.migrate import find_index
+from app.models.models import Base
+
+
+INDEXES = [
+    "ix_event_support_contact_end",
+    "ix_event_location_end",
+]
+
+
+def upgrade(op):
+    for name in INDEXES:
+        op.create_index(find_index(Base.metadata, name))
@@ -0,0 +1,10 @@
+"""Résumé des ventes (table sales_summary), calculé à partir des contrats existants."""
+from app.crud.report import refresh_sales_summary
+from app.models.models import SalesSummary
+
+
+def upgrade(op):
+    if op.create_tables([SalesSummary.__table__]):
+        refresh_sales_summary(op.connection)
+        op.connection.commit()
+        op.log("Résumé des ventes calculé")
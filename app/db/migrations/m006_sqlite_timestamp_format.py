@@ -0,0 +1,22 @@
+"""Dates SQLite ramenées à la seconde (YYYY-MM-DD HH:MM:SS), seul format comparable à celui des valeurs par défaut."""
+from app.models.models import Base
+from app.models.types import Timestamp
+
+
+def upgrade(op):
+    # MySQL stocke déjà les TIMESTAMP à la seconde
+    if op.dialect != "sqlite":
+        return
+
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, Timestamp):
+                continue
+            # Requête brute : l'onupdate de la colonne updated_at ne doit pas s'appliquer
+            updated = op.connection.exec_driver_sql(
+                f"UPDATE {table.name} SET {column.name} = substr({column.name}, 1, 19) "
+                f"WHERE length({column.name}) > 19"
+            ).rowcount
+            op.connection.commit()
+            if updated:
+                op.log(f"{table.name}.{column.name} : {updated} dates ramenées à la seconde")
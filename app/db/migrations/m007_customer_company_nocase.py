@@ -0,0 +1,9 @@
+"""Index NOCASE de l'entreprise des clients sous SQLite (recherche par préfixe, insensible à la casse)."""
+from app.db.migrate import find_index
+from app.models.models import Base
+
+
+def upgrade(op):
+    # MySQL utilise ix_customer_company, dont la collation est déjà insensible à la casse
+    if op.dialect == "sqlite":
+        op.create_index(find_index(Base.metadata, "ix_customer_company_nocase"))
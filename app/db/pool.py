@@ -0,0 +1,125 @@
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+import threading
+import time
+
+
+class PoolStats:
+    """Statistiques du pool de connexions, alimentées par les événements du pool SQLAlchemy."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.engine = None
+        self.reset()
+
+    def reset(self):
+        """Remet tous les compteurs à zéro."""
+        with self.lock:
+            self.connections = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+            self.wait_count = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def attach(self, engine):
+        """Abonne les statistiques aux événements du pool d'un moteur."""
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def overflow(self):
+        """Nombre de connexions ouvertes au-delà de la taille du pool."""
+        pool = self.engine.pool if self.engine is not None else None
+        if isinstance(pool, QueuePool):
+            return max(0, pool.overflow())
+        return 0
+
+    def record_wait(self, seconds):
+        """Enregistre le temps d'attente d'une demande de connexion au pool."""
+        with self.lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.connections += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        overflow = self.overflow()
+        with self.lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.checkins += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self.lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        """Renvoie un instantané des statistiques du pool."""
+        overflow = self.overflow()
+        with self.lock:
+            return {
+                "connections": self.connections,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "overflow": overflow,
+                "peak_overflow": self.peak_overflow,
+                "wait_avg_ms": round(1000 * self.wait_total / self.wait_count, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+            }
+
+
+POOL_STATS = PoolStats()
+
+
+# Demande de connexion en cours dans le thread : _do_get s'appelle lui-même lorsqu'il doit réessayer
+_checkout = threading.local()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool qui mesure le temps d'attente de chaque demande de connexion dans la file du pool.
+
+    Seul _do_get() est chronométré, sans l'ouverture d'une nouvelle connexion (débordement) : ni la connexion
+    au serveur, ni pre_ping, ni les écouteurs de checkout ne sont comptés dans l'attente.
+    """
+
+    def _do_get(self):
+        if getattr(_checkout, "active", False):
+            return super()._do_get()
+
+        _checkout.active = True
+        _checkout.connect_time = 0.0
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _checkout.active = False
+            POOL_STATS.record_wait(max(0.0, time.perf_counter() - start - _checkout.connect_time))
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            if getattr(_checkout, "active", False):
+                _checkout.connect_time += time.perf_counter() - start
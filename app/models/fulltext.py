@@ -0,0 +1,75 @@
+from sqlalchemy import inspect
+
+
+# Colonnes indexées pour la commande search, par table. Le code de chaque table permet de retrouver la ligne
+# d'origine à partir du rowid de l'index SQLite : rowid = id * SEARCH_KINDS_FACTOR + code.
+SEARCH_SOURCES = {
+    "customer": (1, ("first_name", "last_name", "email", "company")),
+    "event": (2, ("name", "location", "notes")),
+    "employee": (3, ("first_name", "last_name")),
+}
+SEARCH_KINDS_FACTOR = 4
+
+SEARCH_TABLE = "search_index"
+
+
+def _content(row, columns):
+    return " || ' ' || ".join(f"coalesce({row}.{column}, '')" for column in columns)
+
+
+def sqlite_search_ddl():
+    """
+    Instructions créant l'index plein texte SQLite : une table FTS5, alimentée à partir des tables existantes
+    puis tenue à jour par des déclencheurs sur chaque table indexée.
+    """
+    statements = [
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(content, tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+
+    for table_name, (code, columns) in SEARCH_SOURCES.items():
+        old_rowid = f"old.id * {SEARCH_KINDS_FACTOR} + {code}"
+        new_rowid = f"new.id * {SEARCH_KINDS_FACTOR} + {code}"
+        insert_new = f"INSERT INTO {SEARCH_TABLE} (rowid, content) VALUES ({new_rowid}, {_content('new', columns)});"
+        delete_old = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_rowid};"
+
+        statements += [
+            f"INSERT INTO {SEARCH_TABLE} (rowid, content) "
+            f"SELECT id * {SEARCH_KINDS_FACTOR} + {code}, {_content(table_name, columns)} FROM {table_name}",
+            f"CREATE TRIGGER {SEARCH_TABLE}_{table_name}_insert AFTER INSERT ON {table_name} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER {SEARCH_TABLE}_{table_name}_update AFTER UPDATE OF {', '.join(columns)} "
+            f"ON {table_name} BEGIN {delete_old} {insert_new} END",
+            f"CREATE TRIGGER {SEARCH_TABLE}_{table_name}_delete AFTER DELETE ON {table_name} "
+            f"BEGIN {delete_old} END",
+        ]
+
+    return statements
+
+
+def create_search_index(connection):
+    """
+    Crée l'index plein texte SQLite s'il n'existe pas encore et que les tables indexées existent.
+
+    Sous MySQL, l'index repose sur les index FULLTEXT déclarés dans les modèles : rien n'est fait ici.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    inspector = inspect(connection)
+    if inspector.has_table(SEARCH_TABLE) or not all(inspector.has_table(name) for name in SEARCH_SOURCES):
+        return False
+
+    for statement in sqlite_search_ddl():
+        connection.exec_driver_sql(statement)
+    return True
+
+
+def drop_search_index(connection):
+    """Supprime l'index plein texte SQLite et ses déclencheurs."""
+    if connection.dialect.name != "sqlite":
+        return
+
+    for table_name in SEARCH_SOURCES:
+        for operation in ("insert", "update", "delete"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{table_name}_{operation}")
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
@@ -1,5 +1,7 @@
-from sqlalchemy import Integer, String, Text, ForeignKey, DECIMAL, TIMESTAMP, DateTime, Boolean, func
+from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Boolean, Index, event, text
 from sqlalchemy.orm import relationship, declarative_base, Mapped, mapped_column
+from app.models.fulltext import create_search_index, drop_search_index
+from app.models.types import Money, Timestamp, local_now
 
 
 Base = declarative_base()
@@ -20,6 +22,11 @@ class Role(Base):
 
 class Employee(Base):
     __tablename__ = "employee"
+    __table_args__ = (
+        Index("ix_employee_role", "role_id"),
+        # Recherche plein texte (commande search), index SQLite créé par create_search_index
+        Index("ft_employee_search", "first_name", "last_name", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_number: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -28,7 +35,7 @@ class Employee(Base):
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     role_id: Mapped[int] = mapped_column(ForeignKey("role.id"))
-    created_at: Mapped[DateTime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(Timestamp, server_default=local_now(), nullable=False)
 
     role = relationship("Role", back_populates="employees")
     customers: Mapped[list["Customer"]] = relationship("Customer", back_populates="sale_contact", passive_deletes=True)
@@ -42,6 +49,15 @@ class Employee(Base):
 
 class Customer(Base):
     __tablename__ = "customer"
+    __table_args__ = (
+        Index("ix_customer_company", "company"),
+        # LIKE 'préfixe%' n'est insensible à la casse sous SQLite qu'avec un index NOCASE
+        Index("ix_customer_company_nocase", text("company COLLATE NOCASE")).ddl_if(dialect="sqlite"),
+        Index("ix_customer_last_name_first_name", "last_name", "first_name"),
+        Index("ix_customer_sale_contact", "sale_contact_id"),
+        Index("ft_customer_search", "first_name", "last_name", "email", "company",
+              mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -50,8 +66,8 @@ class Customer(Base):
     phone: Mapped[str] = mapped_column(String(15), nullable=True)
     company: Mapped[str] = mapped_column(String(100), nullable=True)
     sale_contact_id: Mapped[int] = mapped_column(ForeignKey("employee.id", ondelete="SET NULL"), nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
-    updated_at: Mapped[DateTime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now(),
+    created_at: Mapped[DateTime] = mapped_column(Timestamp, server_default=local_now(), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(Timestamp, server_default=local_now(), onupdate=local_now(),
                                                  nullable=False)
 
     sale_contact = relationship("Employee", back_populates="customers")
@@ -65,14 +81,20 @@ class Customer(Base):
 
 class Contract(Base):
     __tablename__ = "contract"
+    __table_args__ = (
+        # Contrats non signés, éventuellement d'un commercial donné
+        Index("ix_contract_signed_sale_contact", "signed", "sale_contact_id"),
+        Index("ix_contract_customer", "customer_id"),
+        Index("ix_contract_sale_contact", "sale_contact_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     customer_id: Mapped[int] = mapped_column(ForeignKey("customer.id", ondelete="CASCADE"), nullable=False)
     sale_contact_id: Mapped[int] = mapped_column(ForeignKey("employee.id", ondelete="SET NULL"), nullable=True)
-    total_amount: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
-    remaining_amount: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
+    total_amount: Mapped[float] = mapped_column(Money(10, 2), nullable=False)
+    remaining_amount: Mapped[float] = mapped_column(Money(10, 2), nullable=False)
     signed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    created_at: Mapped[DateTime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(Timestamp, server_default=local_now(), nullable=False)
 
     customer = relationship("Customer", back_populates="contracts")
     sale_contact = relationship("Employee", back_populates="contracts")
@@ -85,17 +107,26 @@ class Contract(Base):
 
 class Event(Base):
     __tablename__ = "event"
+    __table_args__ = (
+        # Événements d'un support triés par date, et événements sans support (support_contact_id IS NULL)
+        Index("ix_event_support_contact_start", "support_contact_id", "start_date"),
+        Index("ix_event_contract", "contract_id"),
+        # Contrôle des chevauchements : événements d'un support ou d'un lieu qui se terminent après une date
+        Index("ix_event_support_contact_end", "support_contact_id", "end_date"),
+        Index("ix_event_location_end", "location", "end_date"),
+        Index("ft_event_search", "name", "location", "notes", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     contract_id: Mapped[int] = mapped_column(ForeignKey("contract.id", ondelete="CASCADE"), nullable=False)
     support_contact_id: Mapped[int] = mapped_column(ForeignKey("employee.id", ondelete="SET NULL"), nullable=True)
-    start_date: Mapped[DateTime] = mapped_column(TIMESTAMP, nullable=True)
-    end_date: Mapped[DateTime] = mapped_column(TIMESTAMP, nullable=True)
+    start_date: Mapped[DateTime] = mapped_column(Timestamp, nullable=True)
+    end_date: Mapped[DateTime] = mapped_column(Timestamp, nullable=True)
     location: Mapped[str] = mapped_column(String(255), nullable=True)
     attendees: Mapped[int] = mapped_column(Integer, nullable=True)
     notes: Mapped[str] = mapped_column(Text(255), nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(Timestamp, server_default=local_now(), nullable=False)
 
     contract = relationship("Contract", back_populates="event")
     support_contact = relationship("Employee", back_populates="events")
@@ -105,3 +136,42 @@ class Event(Base):
                f"support_contact_id={self.support_contact_id}, start_date='{self.start_date}', " \
                f"end_date='{self.end_date}', location='{self.location}', attendees={self.attendees}, " \
                f"notes='{self.notes}')>"
+
+
+class SalesSummary(Base):
+    """
+    Totaux des contrats par commercial, client, mois de création et statut de signature, tenus à jour à chaque
+    écriture de contrat (voir app.crud.report). Plusieurs lignes peuvent porter la même clé : seules leurs
+    sommes ont un sens.
+    """
+    __tablename__ = "sales_summary"
+    __table_args__ = (
+        Index("ix_sales_summary_key", "sale_contact_id", "customer_id", "month", "signed"),
+        Index("ix_sales_summary_customer", "customer_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    sale_contact_id: Mapped[int] = mapped_column(ForeignKey("employee.id", ondelete="SET NULL"), nullable=True)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customer.id", ondelete="CASCADE"), nullable=False)
+    month: Mapped[str] = mapped_column(String(7), nullable=False)
+    signed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    contracts: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_amount: Mapped[float] = mapped_column(Money(14, 2), nullable=False)
+    remaining_amount: Mapped[float] = mapped_column(Money(14, 2), nullable=False)
+
+    def __repr__(self):
+        return f"<SalesSummary(sale_contact_id={self.sale_contact_id}, customer_id={self.customer_id}, " \
+               f"month='{self.month}', signed={self.signed}, contracts={self.contracts}, " \
+               f"total_amount={self.total_amount}, remaining_amount={self.remaining_amount})>"
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    """Crée l'index plein texte SQLite avec les tables."""
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    """Supprime l'index plein texte SQLite avant les tables."""
+    drop_search_index(connection)
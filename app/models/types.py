@@ -0,0 +1,127 @@
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import DECIMAL, TIMESTAMP, BigInteger, String, func, literal_column
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+
+class Timestamp(TypeDecorator):
+    """
+    TIMESTAMP qui accepte aussi une date au format texte ISO (YYYY-MM-DD HH:MM:SS), refusée par SQLite.
+
+    SQLite compare les dates comme du texte : elles y sont écrites à la seconde, au même format que
+    datetime('now', 'localtime') des valeurs par défaut, comme le TIMESTAMP de MySQL.
+    """
+
+    impl = TIMESTAMP
+    cache_ok = True
+
+    SQLITE_STORAGE_FORMAT = "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+
+    @property
+    def python_type(self):
+        return datetime
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(sqlite.DATETIME(storage_format=self.SQLITE_STORAGE_FORMAT))
+        return self.impl_instance
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
+
+
+class Money(TypeDecorator):
+    """
+    DECIMAL exact, renvoyé sous forme de Decimal.
+
+    SQLite ne connaît que les nombres flottants : les montants y sont stockés en centimes dans un entier.
+    """
+
+    impl = DECIMAL
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return Decimal
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(BigInteger())
+        return self.impl_instance
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_UP))
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return Decimal(int(value)).scaleb(-2)
+
+
+class local_now(FunctionElement):
+    """Date et heure courantes du serveur, à l'heure locale (CURRENT_TIMESTAMP de SQLite est en UTC)."""
+
+    type = TIMESTAMP()
+    name = "local_now"
+    inherit_cache = True
+
+
+@compiles(local_now)
+def _compile_local_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(local_now, "sqlite")
+def _compile_local_now_sqlite(element, compiler, **kw):
+    return "(datetime('now', 'localtime'))"
+
+
+class unindexed(FunctionElement):
+    """
+    Colonne que SQLite ne doit pas utiliser pour choisir un index (opérateur unaire +), inchangée ailleurs.
+
+    Sans statistiques sur les plages de valeurs, SQLite départage au hasard deux index couvrant chacun une
+    inégalité ; MySQL estime le nombre de lignes de chaque plage et n'en a pas besoin.
+    """
+
+    name = "unindexed"
+    inherit_cache = True
+
+    def __init__(self, column):
+        super().__init__(column)
+        self.type = column.type
+
+
+@compiles(unindexed)
+def _compile_unindexed(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(unindexed, "sqlite")
+def _compile_unindexed_sqlite(element, compiler, **kw):
+    return "+" + compiler.process(element.clauses, **kw)
+
+
+class month_of(FunctionElement):
+    """Mois d'une date au format YYYY-MM."""
+
+    type = String(7)
+    name = "month_of"
+    inherit_cache = True
+
+
+@compiles(month_of)
+def _compile_month_of(element, compiler, **kw):
+    return compiler.process(func.date_format(*element.clauses, literal_column("'%Y-%m'")), **kw)
+
+
+@compiles(month_of, "sqlite")
+def _compile_month_of_sqlite(element, compiler, **kw):
+    return compiler.process(func.strftime(literal_column("'%Y-%m'"), *element.clauses), **kw)
@@ -0,0 +1,114 @@
+import csv
+import functools
+import json
+
+
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+def detect_format(path):
+    """Détermine le format d'un fichier (csv ou ndjson) à partir de son extension."""
+    for extension, file_format in FILE_FORMATS.items():
+        if str(path).lower().endswith(extension):
+            return file_format
+    raise ValueError(f"Format de fichier non reconnu pour '{path}'. Extensions acceptées : "
+                     f"{', '.join(FILE_FORMATS)}.")
+
+
+def read_rows(path, file_format=None):
+    """Lit un fichier CSV ou NDJSON ligne par ligne et renvoie des tuples (numéro de ligne, dictionnaire)."""
+    file_format = file_format or detect_format(path)
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = {"_error": f"JSON invalide : {e}"}
+                yield line_number, row if isinstance(row, dict) else {"_error": "La ligne n'est pas un objet JSON."}
+
+
+class CsvRowWriter:
+    """Écrit des dictionnaires au format CSV, au fil de l'eau."""
+
+    def __init__(self, stream, fields, delimiter=","):
+        self.writer = csv.DictWriter(stream, fieldnames=fields, delimiter=delimiter, extrasaction="ignore",
+                                     lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class NdjsonRowWriter:
+    """Écrit des dictionnaires au format NDJSON (un objet JSON par ligne), au fil de l'eau."""
+
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self.fields = fields
+
+    def write(self, row):
+        self.stream.write(json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False,
+                                     default=str))
+        self.stream.write("\n")
+
+    def close(self):
+        pass
+
+
+class JsonRowWriter(NdjsonRowWriter):
+    """Écrit des dictionnaires sous forme de tableau JSON, au fil de l'eau."""
+
+    def __init__(self, stream, fields):
+        super().__init__(stream, fields)
+        self.first = True
+        self.stream.write("[")
+
+    def write(self, row):
+        self.stream.write("\n" if self.first else ",\n")
+        self.first = False
+        self.stream.write(json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False,
+                                     default=str))
+
+    def close(self):
+        self.stream.write("]\n" if self.first else "\n]\n")
+
+
+ROW_WRITERS = {
+    "csv": CsvRowWriter,
+    "tsv": functools.partial(CsvRowWriter, delimiter="\t"),
+    "ndjson": NdjsonRowWriter,
+    "json": JsonRowWriter,
+}
+
+
+def row_writer(stream, file_format, fields):
+    """Renvoie un écrivain de lignes pour le format demandé."""
+    return ROW_WRITERS[file_format](stream, fields)
+
+
+def write_rows(stream, file_format, fields, rows):
+    """Écrit les lignes au fur et à mesure de leur lecture et renvoie leur nombre."""
+    writer = row_writer(stream, file_format, fields)
+    count = 0
+
+    for row in rows:
+        writer.write(row)
+        count += 1
+
+    writer.close()
+    return count
@@ -3,6 +3,14 @@ from rich.table import Table
 from rich.text import Text
 
 
+# Plans de chargement des relations affichées par chaque vue, utilisés par les commandes list
+# pour éviter un SELECT supplémentaire par ligne.
+EMPLOYEE_LOAD_PLAN = {"role": "joined"}
+CUSTOMER_LOAD_PLAN = {"sale_contact": "joined"}
+CONTRACT_LOAD_PLAN = {"customer": "joined", "sale_contact": "joined"}
+EVENT_LOAD_PLAN = {"contract.customer": "joined", "support_contact": "joined"}
+
+
 def display_roles(roles):
     """Affiche la liste des rôles."""
     table = Table(title="\n:lock: Liste des rôles :")
@@ -242,3 +250,180 @@ def display_events(events, context):
 
     console.print(table)
     console.print("\n")
+
+
+def display_event_conflicts(conflicts):
+    """Affiche les paires d'événements qui se chevauchent."""
+    console = Console()
+
+    if not conflicts:
+        console.print(Text("Aucun conflit trouvé.", style="bold green"))
+        return
+
+    table = Table(title="\n:warning: Conflits de planning :")
+    table.title_style = "bold"
+
+    table.add_column("ressource", justify="left", style="magenta1")
+    table.add_column("valeur", justify="left", style="cyan")
+    table.add_column("événement", justify="left", style="yellow")
+    table.add_column("en conflit avec", justify="left", style="yellow")
+
+    def describe(event):
+        return f"{event.id} {event.name} ({event.start_date:%Y-%m-%d %H:%M} - {event.end_date:%Y-%m-%d %H:%M})"
+
+    for resource, first, second in conflicts:
+        if resource == "support_contact_id":
+            sc = first.support_contact
+            value = f"{first.support_contact_id} ({sc.first_name} {sc.last_name} - {sc.employee_number})"
+        else:
+            value = first.location
+
+        table.add_row(resource, value, describe(first), describe(second))
+
+    table.caption = f"{len(conflicts)} conflit(s)"
+    table.caption_style = "italic white"
+    table.caption_justify = "right"
+
+    console.print(table)
+    console.print("\n")
+
+
+def display_support_assignment(assignments, unassigned, skipped=(), dry_run=False):
+    """
+    Affiche le nombre d'événements affectés à chaque support par l'affectation automatique, puis les événements
+    sans support disponible et ceux affectés entre-temps par un autre utilisateur.
+    """
+    console = Console()
+
+    if assignments:
+        counts = {}
+        for _, employee in assignments:
+            counts[employee] = counts.get(employee, 0) + 1
+
+        title = "Affectation proposée" if dry_run else "Événements affectés"
+        table = Table(title=f"\n:busts_in_silhouette: {title} :")
+        table.title_style = "bold"
+
+        table.add_column("support", justify="left", style="magenta1")
+        table.add_column("événements", justify="right", style="cyan1")
+
+        for employee, count in sorted(counts.items(), key=lambda item: item[0].id):
+            table.add_row(f"{employee.id} ({employee.first_name} {employee.last_name} - {employee.employee_number})",
+                          str(count))
+
+        console.print(table)
+
+    verb = "seraient affectés" if dry_run else "affectés"
+    console.print(Text(f"{len(assignments)} événement(s) {verb}, {len(unassigned)} sans support disponible.",
+                       style="bold green" if not unassigned else "bold yellow"))
+    if unassigned:
+        ids = ", ".join(map(str, unassigned[:20])) + (", ..." if len(unassigned) > 20 else "")
+        console.print(Text(f"Événements sans support disponible : {ids}", style="yellow"))
+    if skipped:
+        ids = ", ".join(map(str, skipped[:20])) + (", ..." if len(skipped) > 20 else "")
+        console.print(Text(f"{len(skipped)} événement(s) déjà affecté(s) entre-temps, non modifié(s) : {ids}",
+                           style="yellow"))
+    console.print("\n")
+
+
+def display_sales_report(rows, by):
+    """Affiche les totaux des contrats regroupés par commercial, client, mois ou statut de signature."""
+    console = Console()
+
+    if not rows:
+        console.print(Text("Aucun contrat trouvé.", style="bold red"))
+        return
+
+    table = Table(title="\n:bar_chart: Rapport des ventes :")
+    table.title_style = "bold"
+
+    for dimension in by:
+        table.add_column(dimension, justify="left", style="cyan")
+    table.add_column("contracts", justify="right", style="cyan1")
+    table.add_column("total_amount", justify="right", style="green")
+    table.add_column("remaining_amount", justify="right", style="yellow")
+
+    def describe(dimension, value):
+        if value is None:
+            return "None"
+        if dimension == "sale_contact":
+            return f"{value.id} ({value.first_name} {value.last_name} - {value.employee_number})"
+        if dimension == "customer":
+            return f"{value.id} ({value.first_name} {value.last_name})"
+        return str(value)
+
+    for row in rows:
+        table.add_row(*(describe(dimension, row[dimension]) for dimension in by), str(row["contracts"]),
+                      f"{row['total_amount']:.2f}", f"{row['remaining_amount']:.2f}")
+
+    table.caption = f"{len(rows)} ligne(s)"
+    table.caption_style = "italic white"
+    table.caption_justify = "right"
+
+    console.print(table)
+    console.print("\n")
+
+
+SEARCH_KIND_LABELS = {"customer": "client", "event": "événement", "employee": "employé"}
+
+
+def search_summary(kind, item):
+    """Résumé d'un résultat de recherche sur une ligne."""
+    if kind == "customer":
+        return f"{item.first_name} {item.last_name} - {item.email}" + (f" ({item.company})" if item.company else "")
+    if kind == "event":
+        details = [detail for detail in (item.location, item.start_date and item.start_date.strftime("%Y-%m-%d"))
+                   if detail]
+        return item.name + (f" ({', '.join(details)})" if details else "")
+    return f"{item.first_name} {item.last_name} - {item.employee_number}"
+
+
+def display_search_results(results, text):
+    """Affiche les résultats d'une recherche plein texte, du plus au moins pertinent."""
+    console = Console()
+
+    if not results:
+        console.print(Text(f"Aucun résultat pour « {text} ».", style="bold red"))
+        return
+
+    table = Table(title=f"\n:mag: Résultats de la recherche « {text} » :")
+    table.title_style = "bold"
+
+    table.add_column("type", justify="left", style="magenta1")
+    table.add_column("id", justify="center", style="red")
+    table.add_column("résultat", justify="left", style="cyan")
+    table.add_column("score", justify="right", style="")
+
+    for kind, score, item in results:
+        table.add_row(SEARCH_KIND_LABELS[kind], str(item.id), search_summary(kind, item), f"{score:.2f}")
+
+    table.caption = f"{len(results)} résultat(s)"
+    table.caption_style = "italic white"
+    table.caption_justify = "right"
+
+    console.print(table)
+    console.print("\n")
+
+
+def display_next_page(cursor):
+    """Affiche le curseur permettant de récupérer la page suivante."""
+    if cursor is None:
+        return
+
+    console = Console()
+    # Sans retour à la ligne inséré par Rich : le curseur doit pouvoir être copié d'un bloc
+    console.print(Text(f"Page suivante : --after {cursor}", style="italic white"), soft_wrap=True)
+    console.print("\n")
+
+
+def display_import_report(label, imported, rejected, elapsed, rejects_path=None):
+    """Affiche le bilan d'un import : lignes importées, rejetées et débit."""
+    console = Console()
+    throughput = (imported + rejected) / elapsed if elapsed > 0 else 0
+
+    console.print(Text(f"{imported} {label} importés, {rejected} lignes rejetées en {elapsed:.2f} s "
+                       f"({throughput:.0f} lignes/s).", style="bold green"))
+
+    if rejects_path:
+        console.print(Text(f"Lignes rejetées écrites dans {rejects_path}", style="yellow"))
+    console.print("\n")
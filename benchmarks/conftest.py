@@ -0,0 +1,227 @@
+from app.auth.password import hash_password, use_profile
+from app.crud.role import role_cache
+from app.db.generate import create_generation_engine, generate, parse_count, reset_tables
+from app.models.models import Employee
+from pathlib import Path
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from tests.conftest import is_query
+
+import json
+import platform
+import pytest
+import sqlalchemy
+import time
+import tracemalloc
+
+
+# pytest benchmarks                         : compare les mesures à benchmarks/baseline.json
+# pytest benchmarks --update-baseline       : enregistre les mesures comme nouvelle référence
+# pytest benchmarks --bench-sizes 1k,100k   : tailles de jeu de données mesurées
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = "1k,10k"
+DEFAULT_THRESHOLD = 1.0
+DEFAULT_ROUNDS = 5
+SEED = 12
+
+# En dessous de ces écarts absolus, une variation relative est considérée comme du bruit de mesure
+MIN_TIME_DELTA = 0.002
+MIN_MEMORY_DELTA = 64 * 1024
+
+use_profile("fast")
+PASSWORD_HASH = hash_password("password")
+
+_results = {}
+baseline_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--update-baseline", action="store_true",
+                    help="Enregistre les mesures dans benchmarks/baseline.json au lieu de les comparer.")
+    group.addoption("--bench-sizes", default=DEFAULT_SIZES,
+                    help=f"Nombres de clients des jeux de données mesurés (défaut : {DEFAULT_SIZES}).")
+    group.addoption("--bench-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Hausse relative tolérée du meilleur temps et du pic mémoire (défaut : 1.0, soit +100 %%).")
+    group.addoption("--bench-rounds", type=int, default=DEFAULT_ROUNDS,
+                    help=f"Nombre d'exécutions chronométrées par mesure (défaut : {DEFAULT_ROUNDS}).")
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        labels = [label.strip() for label in metafunc.config.getoption("bench_sizes").split(",") if label.strip()]
+        metafunc.parametrize("size", [parse_count(label) for label in labels], ids=labels, scope="session")
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))["benchmarks"]
+    return {}
+
+
+def compare(measure, reference, threshold):
+    """Renvoie la description des régressions d'une mesure par rapport à sa référence."""
+    regressions = []
+
+    if measure["queries"] > reference["queries"]:
+        regressions.append(f"requêtes SQL : {reference['queries']} -> {measure['queries']}")
+
+    if (measure["seconds"] > reference["seconds"] * (1 + threshold)
+            and measure["seconds"] - reference["seconds"] > MIN_TIME_DELTA):
+        regressions.append(f"meilleur temps : {reference['seconds'] * 1000:.2f} ms -> "
+                           f"{measure['seconds'] * 1000:.2f} ms")
+
+    if (measure["peak_memory"] > reference["peak_memory"] * (1 + threshold)
+            and measure["peak_memory"] - reference["peak_memory"] > MIN_MEMORY_DELTA):
+        regressions.append(f"pic mémoire : {reference['peak_memory'] // 1024} Kio -> "
+                           f"{measure['peak_memory'] // 1024} Kio")
+
+    return regressions
+
+
+class Benchmark:
+    """
+    Mesure une fonction : meilleur temps sur plusieurs exécutions, requêtes SQL et pic mémoire d'une exécution.
+
+    Une première exécution non mesurée chauffe les caches (compilation SQL, mappers). La mémoire est mesurée
+    lors d'une exécution séparée, tracemalloc ralentissant fortement le code suivi.
+    """
+
+    def __init__(self, name, engine, config):
+        self.name = name
+        self.engine = engine
+        self.config = config
+        self.rounds = config.getoption("bench_rounds")
+        self.queries = 0
+        self.measure = None
+
+    def _on_execute(self, connection, cursor, statement, *args):
+        if is_query(statement):
+            self.queries += 1
+
+    def __call__(self, func, setup=None, rounds=None):
+        """Mesure func() ; setup() est appelée hors chronométrage avant chaque exécution."""
+        rounds = rounds or self.rounds
+
+        if setup:
+            setup()
+        result = func()
+
+        if setup:
+            setup()
+        self.queries = 0
+        if self.engine is not None:
+            event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        tracemalloc.start()
+        try:
+            func()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            if self.engine is not None:
+                event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+        durations = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            durations.append(time.perf_counter() - start)
+
+        self.measure = {
+            "seconds": min(durations),
+            "queries": self.queries,
+            "peak_memory": peak_memory,
+        }
+        self.check()
+        return result
+
+    def check(self):
+        """Enregistre la mesure puis échoue si elle régresse par rapport à la référence."""
+        _results[self.name] = self.measure
+
+        if self.config.getoption("update_baseline"):
+            return
+
+        reference = self.config.stash[baseline_key].get(self.name)
+        if reference is None:
+            return
+
+        regressions = compare(self.measure, reference, self.config.getoption("bench_threshold"))
+        if regressions:
+            pytest.fail(f"Régression de performance pour {self.name} : {', '.join(regressions)}", pytrace=False)
+
+
+@pytest.fixture(scope="session")
+def engine(size, tmp_path_factory):
+    """Base SQLite générée pour une taille donnée, partagée par tous les benchmarks de cette taille."""
+    path = tmp_path_factory.mktemp("benchmarks") / f"bench_{size}.db"
+    engine = create_generation_engine(f"sqlite:///{path}")
+
+    reset_tables(engine)
+    generate(engine, employees=max(10, size // 100), customers=size, contracts_per_customer=(0, 3), seed=SEED,
+             password_hash=PASSWORD_HASH)
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = Session(bind=engine)
+    role_cache.load(session)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def employees(session):
+    """Premier employé de chaque rôle du jeu de données, indexé par identifiant de rôle."""
+    rows = session.execute(select(Employee.role_id, Employee.id, Employee.employee_number).order_by(Employee.id))
+    found = {}
+    for role_id, employee_id, employee_number in rows:
+        found.setdefault(role_id, (employee_id, employee_number))
+    return found
+
+
+@pytest.fixture
+def bench(request):
+    """Mesure une fonction puis la compare à la référence enregistrée (ou met à jour la référence)."""
+    engine = request.getfixturevalue("engine") if "engine" in request.fixturenames else None
+    return Benchmark(request.node.name, engine, request.config)
+
+
+def pytest_configure(config):
+    config.stash[baseline_key] = load_baseline()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not session.config.getoption("update_baseline") or not _results:
+        return
+
+    # Les mesures absentes de cette exécution (autres tailles, sélection -k) sont conservées
+    benchmarks = load_baseline()
+    benchmarks.update(_results)
+
+    BASELINE_PATH.write_text(json.dumps({
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+
+    baseline = config.stash.get(baseline_key, {})
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'mesure':<55} {'temps':>11} {'requêtes':>9} {'pic mémoire':>12} {'vs réf.':>8}")
+
+    for name, measure in sorted(_results.items()):
+        reference = baseline.get(name)
+        ratio = f"x{measure['seconds'] / reference['seconds']:.2f}" if reference and reference["seconds"] else "-"
+        terminalreporter.write_line(f"{name:<55} {measure['seconds'] * 1000:>8.2f} ms {measure['queries']:>9} "
+                                    f"{measure['peak_memory'] // 1024:>8} Kio {ratio:>8}")
@@ -0,0 +1,29 @@
+from app.auth import context
+from app.auth import token as auth_token
+from app.auth.permissions import get_permission
+from app.models.models import Customer
+
+
+def test_decode_access_token(bench):
+    token = auth_token.create_access_token({"emp_number": "EMP0001", "role_id": 3})
+
+    # Vérification complète de la signature
+    bench(lambda: auth_token.decode_access_token(token), rounds=50)
+
+
+def test_get_auth_context_cached(bench, monkeypatch):
+    token = auth_token.create_access_token({"emp_number": "EMP0001", "role_id": 3})
+    monkeypatch.setattr(context, "load_token", lambda: token)
+    context.clear_auth_contexts()
+    context.get_auth_context()
+
+    # Contexte déjà vérifié, retrouvé par l'empreinte du token
+    bench(context.get_auth_context, rounds=50)
+    context.clear_auth_contexts()
+
+
+def test_permission_clause(bench, session):
+    permission = get_permission("customer", "update")
+
+    # Identifiants des rôles lus dans le cache, rempli par la fixture session
+    bench(lambda: permission.clause("EMP0001", Customer.sale_contact_id, session), rounds=50)
@@ -0,0 +1,156 @@
+from app.crud import contract as crud_contract
+from app.crud import customer as crud_customer
+from app.crud import employee as crud_employee
+from app.crud import event as crud_event
+from app.crud import report as crud_report
+from app.crud import search as crud_search
+from app.crud.pagination import next_cursor
+from app.ui import views
+from datetime import datetime
+
+import itertools
+import pytest
+
+
+COMMERCIAL, SUPPORT, MANAGEMENT = 1, 2, 3
+
+_unique = itertools.count()
+
+
+@pytest.mark.parametrize("filters, sorts", [
+    ({}, {"id": "asc"}),
+    ({"company": "Acme*"}, {}),
+    ({"sale_contact_id": "1"}, {"last_name": "asc"}),
+    ({"email": "martin"}, {"created_at": "desc"}),
+], ids=["page", "company-prefix", "sale-contact", "email-contains"])
+def test_get_customers(bench, session, filters, sorts):
+    bench(lambda: crud_customer.get_customers(session, filters, sorts, 100, None, views.CUSTOMER_LOAD_PLAN),
+          setup=session.expunge_all)
+
+
+def test_get_customers_next_page(bench, session):
+    sorts = {"last_name": "asc"}
+    first_page = crud_customer.get_customers(session, {}, sorts, 100)
+    after = next_cursor(first_page, sorts, 100)
+
+    bench(lambda: crud_customer.get_customers(session, {}, sorts, 100, after, views.CUSTOMER_LOAD_PLAN),
+          setup=session.expunge_all)
+
+
+@pytest.mark.parametrize("filters", [
+    {"signed": "False"},
+    {"signed": "False", "sale_contact_id": "1"},
+    {"total_amount": ">=5000"},
+], ids=["unsigned", "unsigned-sale-contact", "amount-range"])
+def test_get_contracts(bench, session, filters):
+    bench(lambda: crud_contract.get_contracts(session, filters, {}, 100, None, views.CONTRACT_LOAD_PLAN),
+          setup=session.expunge_all)
+
+
+@pytest.mark.parametrize("filters, sorts", [
+    ({"support_contact_id": "None"}, {}),
+    ({"support_contact_id": "1", "start_date": ">=2025-01-01"}, {"start_date": "asc"}),
+    ({"location": "Paris"}, {"start_date": "desc"}),
+], ids=["without-support", "support-upcoming", "location"])
+def test_get_events(bench, session, filters, sorts):
+    bench(lambda: crud_event.get_events(session, filters, sorts, 100, None, views.EVENT_LOAD_PLAN),
+          setup=session.expunge_all)
+
+
+def test_stream_customers(bench, session):
+    bench(lambda: sum(1 for _ in crud_customer.stream_customers(session)))
+
+
+def test_update_customer(bench, session, employees):
+    manager_number = employees[MANAGEMENT][1]
+    phone = itertools.cycle(["0600000000", "0611111111"])
+
+    bench(lambda: crud_customer.update_customer(session, 1, {"phone": next(phone)}, manager_number))
+
+
+def test_update_contract(bench, session, employees):
+    manager_number = employees[MANAGEMENT][1]
+    amount = itertools.cycle(["10000", "12000"])
+
+    bench(lambda: crud_contract.update_contract(session, 1, {"total_amount": next(amount)}, manager_number))
+
+
+def test_update_event(bench, session, employees):
+    manager_number = employees[MANAGEMENT][1]
+    event_id = crud_event.get_events(session, {}, {}, 1)[0].id
+    attendees = itertools.cycle(["50", "80"])
+
+    bench(lambda: crud_event.update_event(session, event_id, {"attendees": next(attendees)}, manager_number))
+
+
+def test_create_customer(bench, session, employees):
+    def create():
+        number = next(_unique)
+        return crud_customer.create_customer(session, {
+            "first_name": "Bench", "last_name": f"Client{number}", "email": f"bench.client{number}@example.com",
+            "sale_contact_id": employees[COMMERCIAL][0],
+        })
+
+    bench(create)
+
+
+def test_create_contract(bench, session, employees):
+    bench(lambda: crud_contract.create_contract(session, {
+        "customer_id": 1, "sale_contact_id": employees[COMMERCIAL][0], "total_amount": 1000,
+        "remaining_amount": 1000, "signed": False,
+    }))
+
+
+def test_import_customers(bench, session, employees):
+    def rows():
+        number = next(_unique)
+        return [(line, {"first_name": "Import", "last_name": f"Client{line}",
+                        "email": f"bench.import{number}.{line}@example.com"})
+                for line in range(2, 502)]
+
+    bench(lambda: crud_customer.import_customers(session, rows(), employees[COMMERCIAL][0], chunk_size=250))
+
+
+def test_create_employees(bench, session):
+    def rows():
+        number = next(_unique)
+        return [(line, {"first_name": "Bench", "last_name": f"Employé{line}",
+                        "email": f"bench.employee{number}.{line}@example.com", "password": "password",
+                        "role": "Support"})
+                for line in range(2, 52)]
+
+    bench(lambda: crud_employee.create_employees(session, rows(), workers=1))
+
+
+@pytest.mark.parametrize("text", ["martin", "par conf"], ids=["one-term", "two-prefixes"])
+def test_search(bench, session, text):
+    bench(lambda: crud_search.search(session, text, limit=20), setup=session.expunge_all)
+
+
+def test_check_event_conflicts(bench, session, employees):
+    support_id = str(employees[SUPPORT][0])
+    event = crud_event.get_events(session, {"support_contact_id": support_id}, {"start_date": "desc"}, 1)[0]
+
+    bench(lambda: crud_event.query_overlapping_events(session, "support_contact_id", event.support_contact_id,
+                                                      event.start_date, event.end_date, event.id).first())
+
+
+def test_find_event_conflicts(bench, session):
+    bench(lambda: crud_event.find_event_conflicts(session), setup=session.expunge_all)
+
+
+def test_plan_support_assignment(bench, session):
+    # Tous les événements sans support du jeu de données, passés compris
+    assignments, unassigned = bench(lambda: crud_event.plan_support_assignment(session, since=datetime(2000, 1, 1)),
+                                    setup=session.expunge_all)
+    assert assignments or unassigned
+
+
+@pytest.mark.parametrize("by, live", [
+    (("sale_contact",), False),
+    (("sale_contact",), True),
+    (("month", "signed"), False),
+    (("month", "signed"), True),
+], ids=["sale-contact-summary", "sale-contact-live", "month-signed-summary", "month-signed-live"])
+def test_sales_report(bench, session, by, live):
+    bench(lambda: crud_report.sales_report(session, by, live), setup=session.expunge_all)
@@ -0,0 +1,33 @@
+from app.crud import customer as crud_customer
+from app.crud import event as crud_event
+from app.ui import formats, views
+from contextlib import redirect_stdout
+
+import io
+
+
+def render(display, rows):
+    """Affiche une liste dans un tampon plutôt que dans le terminal."""
+    with redirect_stdout(io.StringIO()) as output:
+        display(rows, "list")
+    return output
+
+
+def test_display_customers(bench, session, size):
+    customers = crud_customer.get_customers(session, {}, {}, size // 10, None, views.CUSTOMER_LOAD_PLAN)
+
+    bench(lambda: render(views.display_customers, customers), rounds=3)
+
+
+def test_display_events(bench, session, size):
+    events = crud_event.get_events(session, {}, {}, size // 10, None, views.EVENT_LOAD_PLAN)
+
+    bench(lambda: render(views.display_events, events), rounds=3)
+
+
+def test_write_customers_ndjson(bench, session):
+    def write():
+        rows = crud_customer.stream_customers(session)
+        return formats.write_rows(io.StringIO(), "ndjson", crud_customer.EXPORT_FIELDS, rows)
+
+    bench(write, rounds=3)
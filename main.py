@@ -1,17 +1,25 @@
-from app.cli import core
-from app.cli.core import prepare_sentry_scope
-from app.config import SENTRY_DSN
-import sentry_sdk
+from app.cli.group import cli
 
 
-sentry_sdk.init(
-    dsn=SENTRY_DSN,
-)
+def init_sentry():
+    """Initialise Sentry au lancement d'une commande (import différé pour ne pas ralentir --help)."""
+    import sentry_sdk
+    from app.config import SENTRY_DSN
+
+    sentry_sdk.init(
+        dsn=SENTRY_DSN,
+    )
+
 
 if __name__ == "__main__":
     try:
-        core.cli()
+        cli(obj={"on_invoke": init_sentry})
     except Exception as e:
+        import sentry_sdk
+        from app.cli.core import prepare_sentry_scope
+
         print(f"[ERREUR FATALE] : {e}")
+        if not sentry_sdk.is_initialized():
+            init_sentry()
         prepare_sentry_scope()
         sentry_sdk.capture_exception(e)
@@ -1,4 +1,6 @@
 from app.cli.core import cli
+from app.auth.password import build_context
+from app.models.models import Employee
 
 
 def test_command_login(runner, mocker):
@@ -9,6 +11,21 @@ def test_command_login(runner, mocker):
     assert "Connexion réussie pour l'employé" in result.output
 
 
+def test_command_login_rehash(runner, mocker, session):
+    """Test de la commande login : un hachage produit avec d'anciens paramètres est recalculé."""
+    employee = session.query(Employee).filter(Employee.employee_number == "EMP0001").first()
+    employee.password = build_context(2, 16, 1).hash("password")
+    session.commit()
+
+    mocker.patch("app.cli.auth.getpass", side_effect=["password"])
+    result = runner.invoke(cli, ["login"], input="EMP0001\n")
+    assert result.exit_code == 0
+    assert "Connexion réussie pour l'employé" in result.output
+
+    session.refresh(employee)
+    assert employee.password.startswith("$argon2id$v=19$m=8,t=1,p=1$")
+
+
 def test_command_login_invalid_employee(runner, mocker):
     """Test de la commande login avec un employé invalide"""
     mocker.patch("app.cli.auth.getpass", side_effect=["password"])
@@ -34,6 +34,19 @@ def test_command_contract_list(runner):
     assert "5 résultat(s)" in result.output
 
 
+def test_command_contract_export(runner, tmp_path):
+    """Test de la commande contract export vers un fichier NDJSON."""
+    output = tmp_path / "contrats.ndjson"
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
+    result = runner.invoke(contract, ["export", "-o", str(output)])
+    assert result.exit_code == 0
+    assert f"5 lignes exportées vers {output}" in result.output
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5
+    assert '"total_amount": ' in lines[0]
+
+
 def test_command_contract_list_unauthenticated(runner):
     """Test de la commande contract list sans authentification."""
     result = runner.invoke(contract, ["list"])
@@ -28,6 +28,46 @@ def test_command_customer_create_unauthorized(runner):
     assert "Accès refusé" in result.output
 
 
+def test_command_customer_import(runner, tmp_path):
+    """Test de la commande customer import avec un fichier CSV contenant une ligne invalide."""
+    file = tmp_path / "clients.csv"
+    file.write_text("first_name,last_name,email,phone,company\n"
+                    "Pierre,Gaston,pierre.gaston@gmail.com,0601020304,Pierre's shop\n"
+                    "Paul,Gaston,david.lefebvre@gmail.com,,\n", encoding="utf-8")
+
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé commercial
+    result = runner.invoke(customer, ["import", str(file)])
+    assert result.exit_code == 0
+    assert "1 clients importés, 1 lignes rejetées" in result.output
+
+    rejects = (tmp_path / "clients.rejects.csv").read_text(encoding="utf-8")
+    assert "david.lefebvre@gmail.com,,,3,Un client avec l'email" in rejects
+
+
+def test_command_customer_import_ndjson(runner, tmp_path):
+    """Test de la commande customer import avec un fichier NDJSON sans rejet."""
+    file = tmp_path / "clients.ndjson"
+    file.write_text('{"first_name": "Pierre", "last_name": "Gaston", "email": "pierre.gaston@gmail.com"}\n',
+                    encoding="utf-8")
+
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé commercial
+    result = runner.invoke(customer, ["import", str(file)])
+    assert result.exit_code == 0
+    assert "1 clients importés, 0 lignes rejetées" in result.output
+    assert not (tmp_path / "clients.rejects.ndjson").exists()
+
+
+def test_command_customer_import_unauthorized(runner, tmp_path):
+    """Test de la commande customer import sans autorisation."""
+    file = tmp_path / "clients.csv"
+    file.write_text("first_name,last_name,email\n", encoding="utf-8")
+
+    runner.invoke(cli, ["login"], input="EMP0003\n")  # Employé support (non autorisé)
+    result = runner.invoke(customer, ["import", str(file)])
+    assert result.exit_code == 0
+    assert "Accès refusé" in result.output
+
+
 def test_command_customer_list(runner):
     """Test de la commande customer list."""
     runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
@@ -54,6 +94,38 @@ def test_command_customer_list_filters_and_sorts(runner):
     assert david_index < eva_index, "L'ordre attendu est David avant Eva"
 
 
+def test_command_customer_list_pagination(runner):
+    """Test de la commande customer list avec pagination."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
+    result = runner.invoke(customer, ["list", "--limit", "2"])
+    assert result.exit_code == 0
+    assert "2 résultat(s)" in result.output
+    assert "Page suivante : --after" in result.output
+
+    cursor = result.output.split("--after ")[1].split()[0]
+    result = runner.invoke(customer, ["list", "--limit", "2", "--after", cursor])
+    assert result.exit_code == 0
+    assert "1 résultat(s)" in result.output
+    assert "Frank" in result.output
+
+
+def test_command_customer_list_csv_pagination(runner):
+    """Test de la commande customer list au format csv : le curseur est écrit sur la sortie d'erreur."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
+    result = runner.invoke(customer, ["list", "-F", "csv", "-s", "last_name=asc", "-l", "2"])
+    assert result.exit_code == 0
+
+    lines = result.stdout.splitlines()
+    assert lines[0].startswith("id,first_name,last_name,")
+    assert len(lines) == 3
+    assert "Page suivante : --after" in result.stderr
+
+    after = result.stderr.split("--after ")[1].split()[0]
+    result = runner.invoke(customer, ["list", "-F", "csv", "-s", "last_name=asc", "-l", "2", "-a", after])
+    assert len(result.stdout.splitlines()) == 2
+    assert "Page suivante" not in result.stderr
+
+
 def test_command_customer_update(runner):
     """Test de la commande customer update"""
     runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
@@ -10,6 +10,34 @@ def test_command_employee_create(runner):
     assert "Nouvel employé créé" in result.output
 
 
+def test_command_employee_import(runner, tmp_path):
+    """Test de la commande employee import : les lignes rejetées ne contiennent pas le mot de passe."""
+    file = tmp_path / "employes.csv"
+    file.write_text("first_name,last_name,email,password,role\n"
+                    "Pierre,Gaston,pierre.gaston@gmail.com,secret1,Commercial\n"
+                    "Paul,Gaston,paul.gaston@gmail.com,secret2,Inconnu\n", encoding="utf-8")
+
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
+    result = runner.invoke(employee, ["import", str(file), "--workers", "1"])
+    assert result.exit_code == 0
+    assert "1 employés importés, 1 lignes rejetées" in result.output
+
+    rejects = (tmp_path / "employes.rejects.csv").read_text(encoding="utf-8")
+    assert rejects.splitlines() == ["first_name,last_name,email,role,line,reason",
+                                    "Paul,Gaston,paul.gaston@gmail.com,Inconnu,3,Le rôle 'Inconnu' n'existe pas."]
+
+
+def test_command_employee_import_unauthorized(runner, tmp_path):
+    """Test de la commande employee import sans autorisation."""
+    file = tmp_path / "employes.csv"
+    file.write_text("first_name,last_name,email,password,role\n", encoding="utf-8")
+
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial (non autorisé)
+    result = runner.invoke(employee, ["import", str(file)])
+    assert result.exit_code == 0
+    assert "Accès refusé" in result.output
+
+
 def test_command_employee_create_unauthenticated(runner):
     """Test de la commande employee create sans authentification."""
     result = runner.invoke(employee, ["create"], input="Pierre\nGaston\npierre.gaston@gmail.com\n1\n")
@@ -33,6 +61,22 @@ def test_command_employee_list(runner):
     assert all(employee in result.output for employee in ["Alice", "Marie", "Bob", "Zoe", "Charlie", "Nicolas"])
 
 
+def test_command_employee_export(runner):
+    """Test de la commande employee export : le mot de passe n'est jamais exporté."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial
+    result = runner.invoke(employee, ["export", "-F", "ndjson", "-f", "employee_number=EMP0001"])
+    assert result.exit_code == 0
+    assert '"employee_number": "EMP0001"' in result.output
+    assert "password" not in result.output
+
+
+def test_command_employee_export_unauthenticated(runner):
+    """Test de la commande employee export sans authentification."""
+    result = runner.invoke(employee, ["export"])
+    assert result.exit_code == 0
+    assert "Aucun token trouvé." in result.output
+
+
 def test_command_employee_list_unauthenticated(runner):
     """Test de la commande employee list sans authentification."""
     result = runner.invoke(employee, ["list"])
@@ -74,6 +118,29 @@ def test_command_employee_update_unauthorized(runner):
     assert "Accès refusé" in result.output
 
 
+def test_command_employee_handover(runner):
+    """Test de la commande employee handover, en simulation puis réellement"""
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
+    result = runner.invoke(employee, ["handover", "EMP0001", "EMP0002", "--dry-run"])
+    assert result.exit_code == 0
+    assert "2 client(s) et 3 contrat(s) seraient transférés de EMP0001 à EMP0002." in result.output
+
+    result = runner.invoke(employee, ["handover", "EMP0001", "EMP0002"])
+    assert result.exit_code == 0
+    assert "2 client(s) et 3 contrat(s) transférés de EMP0001 à EMP0002." in result.output
+
+    result = runner.invoke(employee, ["handover", "EMP0001", "EMP0002", "--dry-run"])
+    assert "0 client(s) et 0 contrat(s) seraient transférés" in result.output
+
+
+def test_command_employee_handover_unauthorized(runner):
+    """Test de la commande employee handover sans autorisation."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial (non autorisé)
+    result = runner.invoke(employee, ["handover", "EMP0001", "EMP0002"])
+    assert result.exit_code == 0
+    assert "Accès refusé" in result.output
+
+
 def test_command_employee_update_password(runner):
     """Test de la commande employee update-password"""
     runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
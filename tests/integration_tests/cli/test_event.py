@@ -1,5 +1,8 @@
+import json
 from app.cli.core import cli
 from app.cli.event import event
+from app.models.models import Event
+from datetime import datetime
 
 
 def test_command_event_create(runner):
@@ -37,6 +40,28 @@ def test_command_event_list(runner):
     assert "3 résultat(s)" in result.output
 
 
+def test_command_event_list_ndjson(runner):
+    """Test de la commande event list au format ndjson."""
+    runner.invoke(cli, ["login"], input="EMP0002\n")  # Employé commercial
+    result = runner.invoke(event, ["list", "--format", "ndjson"])
+    assert result.exit_code == 0
+
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(rows) == 3
+    assert "Liste des événements" not in result.output
+
+
+def test_command_event_export(runner):
+    """Test de la commande event export sur la sortie standard."""
+    runner.invoke(cli, ["login"], input="EMP0002\n")  # Employé commercial
+    result = runner.invoke(event, ["export", "-s", "id=asc"])
+    assert result.exit_code == 0
+
+    lines = result.stdout.splitlines()  # Les messages d'autorisation sont sur la sortie d'erreur
+    assert lines[0].startswith("id,name,")
+    assert len(lines) == 4
+
+
 def test_command_event_list_unauthenticated(runner):
     """Test de la commande event list sans authentification."""
     result = runner.invoke(event, ["list"])
@@ -126,3 +151,62 @@ def test_command_event_delete_unauthorized(runner):
     result = runner.invoke(event, ["delete", "1"], input="oui\n")
     assert result.exit_code == 0
     assert "Accès refusé" in result.output
+
+
+def test_command_event_update_contact_conflict(runner, session):
+    """Test de la commande event update-contact avec un support déjà occupé."""
+    session.add(Event(name="Concert", contract_id=5, support_contact_id=3, start_date=datetime(2023, 6, 22, 11),
+                      end_date=datetime(2023, 6, 22, 14)))
+    session.commit()
+
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
+    result = runner.invoke(event, ["update-contact", "2", "EMP0003"])
+    assert result.exit_code == 0
+    assert "est déjà affecté à l'événement 4 'Concert'" in result.output
+
+
+def test_command_event_conflicts(runner, session):
+    """Test de la commande event conflicts"""
+    session.add(Event(name="Concert", contract_id=5, location="Parc des Princes",
+                      start_date=datetime(2023, 6, 21, 22), end_date=datetime(2023, 6, 22, 1)))
+    session.commit()
+
+    runner.invoke(cli, ["login"], input="EMP0003\n")  # Employé support
+    result = runner.invoke(event, ["conflicts", "--since", "2023-01-01"])
+    assert result.exit_code == 0
+    assert "Conflits de planning" in result.output
+    assert "1 conflit(s)" in result.output
+
+    result = runner.invoke(event, ["conflicts"])
+    assert result.exit_code == 0
+    assert "Aucun conflit trouvé." in result.output
+
+
+def test_command_event_conflicts_unauthenticated(runner):
+    """Test de la commande event conflicts sans authentification."""
+    result = runner.invoke(event, ["conflicts"])
+    assert result.exit_code == 0
+    assert "Aucun token trouvé." in result.output
+
+
+def test_command_event_auto_assign(runner, session):
+    """Test de la commande event auto-assign"""
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
+    result = runner.invoke(event, ["auto-assign", "--since", "2023-06-22", "--dry-run"])
+    assert result.exit_code == 0
+    assert "Affectation proposée" in result.output
+    assert "2 événement(s) seraient affectés, 0 sans support disponible." in result.output
+    assert session.get(Event, 2).support_contact_id is None
+
+    result = runner.invoke(event, ["auto-assign", "--since", "2023-06-22"])
+    assert result.exit_code == 0
+    assert "2 événement(s) affectés" in result.output
+    assert session.get(Event, 2).support_contact_id == 3
+
+
+def test_command_event_auto_assign_unauthorized(runner):
+    """Test de la commande event auto-assign sans autorisation."""
+    runner.invoke(cli, ["login"], input="EMP0003\n")  # Employé support (non autorisé)
+    result = runner.invoke(event, ["auto-assign"])
+    assert result.exit_code == 0
+    assert "Accès refusé" in result.output
@@ -0,0 +1,28 @@
+from app.cli.core import cli
+
+
+def test_command_report_sales(runner):
+    """Test de la commande report sales"""
+    runner.invoke(cli, ["login"], input="EMP0005\n")  # Employé manager
+    result = runner.invoke(cli, ["report", "sales", "-b", "sale_contact", "-b", "signed"])
+    assert result.exit_code == 0
+    assert "Rapport des ventes" in result.output
+    assert "EMP0001" in result.output
+    assert "3 ligne(s)" in result.output
+
+
+def test_command_report_sales_live_top(runner):
+    """Test de la commande report sales calculée sur les contrats."""
+    runner.invoke(cli, ["login"], input="EMP0005\n")
+    result = runner.invoke(cli, ["report", "sales", "--by", "customer", "--top", "1", "--live"])
+    assert result.exit_code == 0
+    assert "Frank" in result.output
+    assert "1 ligne(s)" in result.output
+
+
+def test_command_report_sales_unauthorized(runner):
+    """Test de la commande report sales sans autorisation."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")  # Employé commercial (non autorisé)
+    result = runner.invoke(cli, ["report", "sales"])
+    assert result.exit_code == 0
+    assert "Accès refusé" in result.output
@@ -0,0 +1,44 @@
+from app.cli.core import cli
+from tests.conftest import fulltext_sees_test_data
+
+
+@fulltext_sees_test_data
+def test_command_search(runner):
+    """Test de la commande search."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")
+    result = runner.invoke(cli, ["search", "gmail", "--limit", "2"])
+    assert result.exit_code == 0
+    assert "Résultats de la recherche « gmail »" in result.output
+    assert "2 résultat(s)" in result.output
+    assert "Page suivante : --after " in result.output
+
+    cursor = result.output.split("Page suivante : --after ")[1].split()[0]
+    result = runner.invoke(cli, ["search", "gmail", "--limit", "2", "--after", cursor])
+    assert result.exit_code == 0
+    assert "1 résultat(s)" in result.output
+    assert "Page suivante" not in result.output
+
+
+@fulltext_sees_test_data
+def test_command_search_type(runner):
+    """Test de la commande search limitée aux employés."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")
+    result = runner.invoke(cli, ["search", "alice", "dupont", "-t", "employee"])
+    assert result.exit_code == 0
+    assert "EMP0001" in result.output
+    assert "1 résultat(s)" in result.output
+
+
+def test_command_search_no_result(runner):
+    """Test de la commande search sans résultat."""
+    runner.invoke(cli, ["login"], input="EMP0001\n")
+    result = runner.invoke(cli, ["search", "introuvable"])
+    assert result.exit_code == 0
+    assert "Aucun résultat pour « introuvable »" in result.output
+
+
+def test_command_search_unauthenticated(runner):
+    """Test de la commande search sans authentification."""
+    result = runner.invoke(cli, ["search", "gmail"])
+    assert result.exit_code == 0
+    assert "Aucun token trouvé" in result.output
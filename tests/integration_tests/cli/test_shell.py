@@ -0,0 +1,26 @@
+from app.cli.core import cli
+
+
+def test_command_shell(runner):
+    """Test du shell interactif : connexion puis commandes successives."""
+    result = runner.invoke(cli, ["shell"], input="login\nEMP0001\ncustomer list\nrole list\nexit\n")
+    assert result.exit_code == 0
+    assert "Connexion réussie pour l'employé" in result.output
+    assert all(customer in result.output for customer in ["David", "Eva", "Frank"])
+    assert "Liste des rôles" in result.output
+
+
+def test_command_shell_keeps_running_after_error(runner):
+    """Test du shell interactif avec une commande inconnue puis une commande valide."""
+    result = runner.invoke(cli, ["shell"], input="login\nEMP0001\nunknown\ncustomer list -s name\nhelp\n")
+    assert result.exit_code == 0
+    assert "No such command 'unknown'" in result.output
+    assert "Le critère de tri doit être au format attribut=asc|desc." in result.output
+    assert "Usage:" in result.output
+
+
+def test_command_shell_nested(runner):
+    """Test du shell interactif lancé depuis le shell."""
+    result = runner.invoke(cli, ["shell"], input="shell\nquit\n")
+    assert result.exit_code == 0
+    assert "Le shell est déjà ouvert." in result.output
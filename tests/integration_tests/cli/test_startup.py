@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+from app.cli.group import cli, LAZY_COMMANDS
+
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+
+# Budget d'import (en microsecondes) des modules chargés par "main.py --help"
+IMPORT_TIME_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("sqlalchemy", "rich", "passlib", "argon2", "sentry_sdk", "jwt", "pymysql", "app.crud", "app.db")
+
+
+def import_times(*args):
+    """Lance main.py avec -X importtime et renvoie la liste (module, temps cumulé en µs, niveau)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports.append((name.strip(), int(cumulative), len(name) - len(name.lstrip())))
+    return imports
+
+
+def test_help_does_not_import_heavy_modules():
+    """Vérifie que main.py --help n'importe ni la base de données, ni Rich, ni la pile d'authentification."""
+    modules = [name for name, _, _ in import_times("--help")]
+    assert [name for name in modules if name.startswith(HEAVY_MODULES)] == []
+
+
+def test_help_import_time_budget():
+    """Vérifie que le temps d'import de main.py --help reste sous le budget fixé."""
+    imports = import_times("--help")
+    names = [name for name, _, _ in imports]
+
+    # Seuls les imports de premier niveau déclenchés après le démarrage de l'interpréteur (site) sont comptés
+    program_imports = imports[names.index("site") + 1:]
+    total = sum(cumulative for _, cumulative, level in program_imports if level == 1)
+
+    assert total < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_commands_help_matches_commands():
+    """Vérifie que l'aide déclarée pour chaque commande paresseuse correspond à sa docstring."""
+    for name, (_, short_help) in LAZY_COMMANDS.items():
+        command = cli.get_command(None, name)
+        assert command is not None
+        assert command.help.strip().splitlines()[0] == short_help
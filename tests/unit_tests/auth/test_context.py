@@ -0,0 +1,80 @@
+import click
+import pytest
+from datetime import datetime, timezone
+from app.auth import context
+
+
+def payload(exp_offset=3600, emp_number="EMP0001", role_id=1):
+    return {"emp_number": emp_number, "role_id": role_id,
+            "exp": datetime.now(tz=timezone.utc).timestamp() + exp_offset}
+
+
+@pytest.fixture(autouse=True)
+def clear_contexts():
+    context.clear_auth_contexts()
+    yield
+    context.clear_auth_contexts()
+
+
+def test_get_auth_context_without_token(mocker):
+    """Vérifie qu'aucun contexte n'est renvoyé sans token."""
+    mocker.patch.object(context, "load_token", return_value=None)
+    assert context.get_auth_context() is None
+
+
+def test_get_auth_context_is_cached_by_token(mocker):
+    """Vérifie que le token n'est vérifié qu'une fois tant qu'il n'a pas expiré."""
+    mocker.patch.object(context, "load_token", return_value="token")
+    decode = mocker.patch.object(context, "decode_access_token", return_value=payload())
+
+    first = context.get_auth_context()
+    second = context.get_auth_context()
+
+    assert first is second
+    assert first.employee_number == "EMP0001"
+    assert first.role_id == 1
+    decode.assert_called_once_with("token")
+
+
+def test_get_auth_context_expired(mocker):
+    """Vérifie qu'un contexte expiré est recalculé."""
+    mocker.patch.object(context, "load_token", return_value="token")
+    decode = mocker.patch.object(context, "decode_access_token", side_effect=[payload(-1), payload(role_id=3)])
+
+    context.get_auth_context()
+    assert context.get_auth_context().role_id == 3
+    assert decode.call_count == 2
+
+
+def test_get_auth_context_reads_token_once_per_command(mocker):
+    """Vérifie que le fichier de token n'est lu qu'une fois par commande."""
+    load = mocker.patch.object(context, "load_token", return_value="token")
+    mocker.patch.object(context, "decode_access_token", return_value=payload())
+
+    with click.Context(click.Command("test")):
+        context.get_auth_context()
+        context.get_auth_context()
+
+    load.assert_called_once()
+
+
+def test_get_employee(session, mocker):
+    """Vérifie que l'employé connecté est chargé une seule fois, avec le nom de son rôle."""
+    mocker.patch.object(context, "load_token", return_value="token")
+    mocker.patch.object(context, "decode_access_token", return_value=payload(emp_number="EMP0003"))
+
+    auth = context.get_auth_context()
+    employee = auth.get_employee(session)
+
+    assert employee.employee_number == "EMP0003"
+    assert employee.role_name == "Support"
+    assert auth.get_employee(None) is employee
+
+
+def test_get_employee_not_found(session, mocker):
+    """Vérifie qu'un employé supprimé lève une erreur."""
+    mocker.patch.object(context, "load_token", return_value="token")
+    mocker.patch.object(context, "decode_access_token", return_value=payload(emp_number="EMP9999"))
+
+    with pytest.raises(ValueError):
+        context.get_auth_context().get_employee(session)
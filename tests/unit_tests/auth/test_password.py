@@ -0,0 +1,39 @@
+import pytest
+from app.auth import password
+from app.auth.calibrate import calibrate
+
+
+def test_hash_parameters_overrides():
+    """Vérifie qu'un profil peut être surchargé paramètre par paramètre."""
+    assert password.hash_parameters("light", None, None, None) == password.HASH_PROFILES["light"]
+    assert password.hash_parameters("light", "4", None, "2") == {"time_cost": 4, "memory_cost": 19456, "parallelism": 2}
+
+
+def test_hash_parameters_unknown_profile():
+    """Vérifie qu'un profil inconnu est refusé."""
+    with pytest.raises(ValueError):
+        password.hash_parameters("turbo")
+
+
+def test_hash_uses_current_profile():
+    """Vérifie que le hachage utilise les paramètres du profil courant (fast pendant les tests)."""
+    assert password.hash_password("secret").startswith("$argon2id$v=19$m=8,t=1,p=1$")
+
+
+def test_verify_and_update():
+    """Vérifie qu'un hachage produit avec d'autres paramètres est recalculé."""
+    old_hash = password.build_context(2, 16, 1).hash("secret")
+
+    assert password.verify_and_update("wrong", old_hash) == (False, None)
+
+    valid, new_hash = password.verify_and_update("secret", old_hash)
+    assert valid
+    assert new_hash.startswith("$argon2id$v=19$m=8,t=1,p=1$")
+    assert password.verify_and_update("secret", new_hash) == (True, None)
+
+
+def test_calibrate():
+    """Vérifie que la calibration réduit la mémoire jusqu'au minimum si la cible est inatteignable."""
+    parameters, duration = calibrate(1e-9, 64, 1, samples=1, min_memory_cost=8)
+    assert parameters == {"time_cost": 1, "memory_cost": 8, "parallelism": 1}
+    assert duration > 0
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import select
+from app.auth import permissions
+from app.crud import customer as crud_customer
+from app.crud import event as crud_event
+from app.models.models import Customer
+from tests.conftest import QueryCounter
+
+
+def test_compile_policy(session):
+    """Vérifie la compilation de la table de politique et la traduction des identifiants de rôle."""
+    permission = permissions.get_permission("customer", "update")
+    assert permission.rules == {"Commercial": permissions.OWN, "Management": permissions.ANY}
+    assert permission.allows_role(1)
+    assert not permission.allows_role(2)
+    assert not permission.allows_role(99)
+
+
+def test_compile_policy_invalid_rule():
+    """Vérifie qu'une règle de propriété inconnue est refusée."""
+    with pytest.raises(ValueError):
+        permissions.compile_policy([("customer", "update", "Commercial", "everything")])
+
+
+def test_compile_policy_unknown_role():
+    """Vérifie qu'un rôle inconnu est refusé."""
+    with pytest.raises(ValueError, match="n'existe pas"):
+        permissions.compile_policy([("customer", "update", "Stagiaire", permissions.ANY)])
+
+
+def test_get_permission_unknown_action():
+    """Vérifie qu'une action sans règle lève une erreur."""
+    with pytest.raises(ValueError):
+        permissions.get_permission("customer", "archive")
+
+
+def test_permission_allows(session):
+    """Vérifie les règles de propriété appliquées en Python."""
+    permission = permissions.get_permission("event", "create")
+    assert permission.allows(1, employee_id=1, owner_id=1)
+    assert not permission.allows(1, employee_id=1, owner_id=2)
+    assert not permission.allows(1, employee_id=1, owner_id=None)
+    assert permission.allows(3, employee_id=5, owner_id=None)
+    assert not permission.allows(2, employee_id=3, owner_id=3)
+
+
+def test_denied_message():
+    """Vérifie le message de refus selon les départements autorisés."""
+    assert permissions.get_permission("customer", "delete").denied_message() == \
+        "Accès refusé : cette action est réservée au département gestion."
+    assert permissions.get_permission("event", "update").denied_message() == \
+        "Accès refusé : cette action est réservée aux départements support et gestion."
+
+
+@pytest.mark.parametrize("employee_number, expected", [
+    ("EMP0001", {1, 2}),  # Commercial : ses clients uniquement
+    ("EMP0002", {3}),
+    ("EMP0003", set()),  # Support : aucun client
+    ("EMP0005", {1, 2, 3}),  # Gestion : tous les clients
+])
+def test_permission_clause(session, employee_number, expected):
+    """Vérifie que l'expression SQL applique la politique ligne par ligne."""
+    clause = permissions.get_permission("customer", "update").clause(employee_number, Customer.sale_contact_id)
+    allowed = set(session.scalars(select(Customer.id).where(clause)))
+    assert allowed == expected
+
+
+def test_denied_update_uses_one_query(session):
+    """Vérifie qu'une modification refusée ne coûte qu'une requête."""
+    with QueryCounter(session.get_bind()) as counter:
+        with pytest.raises(ValueError, match="pas autorisé"):
+            crud_customer.update_customer(session, 3, {"phone": "0102030405"}, "EMP0001")
+
+    assert counter.count == 1
+
+
+def test_update_event_without_support_requires_manager(session):
+    """Vérifie le message lorsqu'un événement sans contact support est modifié par un support."""
+    with pytest.raises(ValueError, match="Seul un manager"):
+        crud_event.update_event(session, 2, {"location": "Salle B"}, "EMP0003")
@@ -6,8 +6,8 @@ import click
 
 def test_prepare_sentry_scope_without_user_without_extra_context(mocker):
     """Test sans utilisateur et sans contexte supplémentaire."""
-    # Mock de la fonction get_employees pour ne pas renvoyer d'utilisateur
-    mocker.patch.object(core.crud_employee, "get_employees", return_value=[])
+    # Mock du contexte d'authentification pour ne pas renvoyer d'utilisateur
+    mocker.patch.object(core, "get_auth_context", return_value=None)
 
     # mocker "with sentry_sdk.configure_scope() as scope" (contexte manager)
     mock_scope_ctx = mocker.patch("app.cli.core.sentry_sdk.configure_scope")
@@ -38,9 +38,8 @@ def test_prepare_sentry_scope_with_user_and_extra_context(mocker):
     fake_user.role_id = 1
 
     # Mock des fonctions utilisées dans prepare_sentry_scope
-    mocker.patch.object(core, "load_token", return_value="fake_token")
-    mocker.patch.object(core, "decode_access_token", return_value={"emp_number": "EMP0001"})
-    mocker.patch.object(core.crud_employee, "get_employees", return_value=[fake_user])
+    auth = mocker.patch.object(core, "get_auth_context").return_value
+    auth.get_employee.return_value = fake_user
 
     # mocker "with sentry_sdk.configure_scope() as scope" (contexte manager)
     mock_scope_ctx = mocker.patch("app.cli.core.sentry_sdk.configure_scope")
@@ -175,6 +174,31 @@ def test_attr_val_to_dict_fail(mocker):
         core.attr_val_to_dict(attr_val_pairs)
 
 
+def test_filter_to_dict_success():
+    """Test de la fonction filter_to_dict avec des opérateurs."""
+    filter = [
+        "first_name=Alice",
+        "total_amount>=1000",
+        "start_date<2025-01-01",
+        "notes=a=b"
+    ]
+
+    result = core.filter_to_dict(filter)
+
+    assert result == {
+        "first_name": "Alice",
+        "total_amount": ">=1000",
+        "start_date": "<2025-01-01",
+        "notes": "a=b"
+    }
+
+
+def test_filter_to_dict_fail():
+    """Test de la fonction filter_to_dict avec une entrée invalide."""
+    with pytest.raises(click.BadParameter):
+        core.filter_to_dict(["attr1 value1"])
+
+
 def test_sort_to_dict_success(mocker):
     """Test de la fonction sort_to_dict avec des données valides."""
     sort = [
@@ -46,6 +46,31 @@ def test_create_customer_fail(session):
         )
 
 
+def test_import_customers(session):
+    """Vérifie que l'import par lots insère les lignes valides et rejette les autres."""
+    rows = [
+        (2, {"first_name": "Jane", "last_name": "Doe", "email": "jane.doe@gmail.com", "phone": "", "company": ""}),
+        (3, {"first_name": "John", "last_name": "Doe", "email": "john.doe@gmail.com", "company": "Doe Inc"}),
+        (4, {"first_name": "", "last_name": "Doe", "email": "no.name@gmail.com"}),  # Prénom manquant
+        (5, {"first_name": "Jane", "last_name": "Bis", "email": "JANE.DOE@gmail.com"}),  # Doublon dans le fichier
+        (6, {"first_name": "David", "last_name": "L", "email": "david.lefebvre@gmail.com"}),  # Déjà en base
+        (7, {"first_name": "Bad", "last_name": "Mail", "email": "bad-mail"}),  # Email invalide
+        (8, {"first_name": "Eva", "last_name": "M", "email": "Eva.Moreau@Gmail.com"}),  # Déjà en base, autre casse
+    ]
+    rejected = []
+
+    result = crud_customer.import_customers(session, iter(rows), 1, chunk_size=4,
+                                            on_reject=lambda line, row, reason: rejected.append(line))
+
+    assert result == (2, 5)
+    assert sorted(rejected) == [4, 5, 6, 7, 8]
+
+    jane = crud_customer.get_customers(session, {"email": "jane.doe@gmail.com"})[0]
+    assert jane.phone is None
+    assert jane.sale_contact_id == 1
+    assert len(crud_customer.get_customers(session)) == 5
+
+
 def test_get_customers(session):
     """Vérifie que la récupération d'un client fonctionne."""
     customers = crud_customer.get_customers(session)
@@ -53,6 +78,15 @@ def test_get_customers(session):
     assert len(customers) == 3
 
 
+def test_stream_customers(session):
+    """Vérifie que le parcours par lots des clients applique les filtres et le tri."""
+    rows = list(crud_customer.stream_customers(session, {"sale_contact_id": "1"}, {"id": "desc"}, batch_size=1))
+    assert rows
+    assert all(row["sale_contact_id"] == 1 for row in rows)
+    assert [row["id"] for row in rows] == sorted((row["id"] for row in rows), reverse=True)
+    assert list(rows[0]) == crud_customer.EXPORT_FIELDS
+
+
 def test_get_customers_with_filters(session):
     """Vérifie que la récupération des clients avec des filtres fonctionne."""
     filters = {
@@ -153,3 +187,17 @@ def test_delete_customer(session):
 
     deleted_customer = session.query(Customer).filter(Customer.id == 1).first()
     assert deleted_customer is None
+
+
+def test_update_customer_sale_contact(session):
+    """Vérifie que le changement de commercial d'un client est reporté sur tous ses contrats."""
+    customer = crud_customer.update_customer_sale_contact(session, 1, "EMP0002")
+
+    assert customer.sale_contact_id == 2
+    assert [contract.sale_contact_id for contract in customer.contracts] == [2, 2]
+
+
+def test_update_customer_sale_contact_not_commercial(session):
+    """Vérifie que seul un commercial peut devenir le contact d'un client."""
+    with pytest.raises(ValueError, match="n'est pas un commercial"):
+        crud_customer.update_customer_sale_contact(session, 1, "EMP0003")
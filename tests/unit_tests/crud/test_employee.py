@@ -1,6 +1,7 @@
 import pytest
 from app.crud import employee as crud_employee
-from app.models.models import Employee
+from app.auth.password import verify_password
+from app.models.models import Contract, Customer, Employee
 
 
 def test_create_employee(session):
@@ -27,6 +28,33 @@ def test_create_employee(session):
     assert new_employee.role_id == data["role_id"]
 
 
+@pytest.mark.parametrize("workers", [1, 2])
+def test_create_employees(session, workers):
+    """Vérifie la création par lots : numéros consécutifs, mots de passe hachés et lignes rejetées."""
+    rows = [
+        (2, {"first_name": "John", "last_name": "Doe", "email": "john.doe@gmail.com", "password": "pw1", "role": "1"}),
+        (3, {"first_name": "Jane", "last_name": "Doe", "email": "jane.doe@gmail.com", "password": "pw2",
+             "role": "support"}),
+        (4, {"first_name": "Jim", "last_name": "Doe", "email": "jim.doe@gmail.com", "password": "pw3", "role": "9"}),
+        (5, {"first_name": "Bob", "last_name": "M", "email": "Bob.Martin@gmail.com", "password": "pw4", "role": "2"}),
+        (6, {"first_name": "Joe", "last_name": "Doe", "email": "joe.doe@gmail.com", "password": "pw5",
+             "role_id": "3"}),
+    ]
+    rejected = []
+
+    result = crud_employee.create_employees(session, iter(rows), chunk_size=3, workers=workers,
+                                            on_reject=lambda line, row, reason: rejected.append((line, reason)))
+
+    assert result == (3, 2)
+    assert rejected == [(4, "Le rôle '9' n'existe pas."),
+                        (5, "Un employé avec l'email Bob.Martin@gmail.com existe déjà.")]
+
+    employees = session.query(Employee).filter(Employee.id > 6).order_by(Employee.id).all()
+    assert [e.employee_number for e in employees] == ["EMP0007", "EMP0008", "EMP0009"]
+    assert [e.role_id for e in employees] == [1, 2, 3]
+    assert verify_password("pw2", employees[1].password)
+
+
 def test_create_employee_fail(session):
     """Vérifie que la création d'un employé échoue avec des données invalides."""
     data = {
@@ -51,6 +79,14 @@ def test_get_employees(session):
     assert len(employees) == 6
 
 
+def test_stream_employees(session):
+    """Vérifie que le parcours par lots des employés renvoie des dictionnaires sans mot de passe."""
+    rows = list(crud_employee.stream_employees(session, {}, {"employee_number": "asc"}, batch_size=2))
+    assert len(rows) == 6
+    assert rows[0]["employee_number"] == "EMP0001"
+    assert all("password" not in row for row in rows)
+
+
 def test_get_employees_with_filters(session):
     """Vérifie que la récupération d'employés avec des filtres fonctionne."""
     filters = {
@@ -147,3 +183,30 @@ def test_delete_employee(session):
 
     deleted_employee = session.query(Employee).filter(Employee.id == 1).first()
     assert deleted_employee is None
+
+
+def test_handover_sale_contact_dry_run(session):
+    """Vérifie que le mode simulation compte les clients et contrats sans les transférer."""
+    assert crud_employee.handover_sale_contact(session, "EMP0001", "EMP0002", dry_run=True) == (2, 3)
+    assert session.query(Customer).filter_by(sale_contact_id=1).count() == 2
+
+
+def test_handover_sale_contact(session):
+    """Vérifie le transfert de tous les clients et contrats d'un commercial."""
+    assert crud_employee.handover_sale_contact(session, "EMP0001", "2") == (2, 3)
+
+    assert session.query(Customer).filter_by(sale_contact_id=1).count() == 0
+    assert session.query(Contract).filter_by(sale_contact_id=1).count() == 0
+    assert session.query(Customer).filter_by(sale_contact_id=2).count() == 3
+    assert session.query(Contract).filter_by(sale_contact_id=2).count() == 5
+
+
+@pytest.mark.parametrize("from_employee, to_employee, message", [
+    ("EMP0001", "EMP0003", "n'est pas un commercial"),
+    ("EMP0001", "EMP0001", "doivent être différents"),
+    ("EMP9999", "EMP0002", "Aucun employé trouvé"),
+])
+def test_handover_sale_contact_fail(session, from_employee, to_employee, message):
+    """Vérifie les cas de refus du transfert."""
+    with pytest.raises(ValueError, match=message):
+        crud_employee.handover_sale_contact(session, from_employee, to_employee)
@@ -1,7 +1,9 @@
 import pytest
 from app.crud import event as crud_event
-from app.models.models import Event
+from app.models.models import Employee, Event
 from datetime import datetime
+from sqlalchemy import update
+from tests.conftest import QueryCounter
 
 
 def test_create_event(session):
@@ -158,3 +160,162 @@ def delete_event(session):
 
     deleted_event = session.query(Event).filter(Event.id == 1).first()
     assert deleted_event is None
+
+
+def add_event(session, name, start_date, end_date, location=None, support_contact_id=None):
+    """Ajoute un événement sans contrôle des conflits."""
+    event = Event(name=name, contract_id=5, start_date=start_date, end_date=end_date, location=location,
+                  support_contact_id=support_contact_id)
+    session.add(event)
+    session.commit()
+    return event
+
+
+def test_query_overlapping_events(session):
+    """Vérifie la recherche des événements qui chevauchent une période, bornes exclues."""
+    overlapping = crud_event.query_overlapping_events(
+        session, "support_contact_id", 3, datetime(2023, 6, 21, 22), datetime(2023, 6, 21, 23, 30)).all()
+    assert [event.id for event in overlapping] == [1]
+
+    following = crud_event.query_overlapping_events(
+        session, "support_contact_id", 3, datetime(2023, 6, 21, 23), datetime(2023, 6, 22, 1)).all()
+    assert following == []
+
+    excluded = crud_event.query_overlapping_events(
+        session, "location", "Parc des Princes", datetime(2023, 6, 21), datetime(2023, 6, 22), exclude_id=1).all()
+    assert excluded == []
+
+
+def test_create_event_location_conflict(session):
+    """Vérifie qu'un événement ne peut pas occuper un lieu déjà réservé."""
+    with pytest.raises(ValueError, match="Conflit de lieu avec l'événement 1"):
+        crud_event.create_event(session, {
+            "name": "Concert", "contract_id": 5, "location": "Parc des Princes",
+            "start_date": datetime(2023, 6, 21, 22), "end_date": datetime(2023, 6, 22, 1),
+        })
+
+
+def test_update_event_support_contact_conflict(session):
+    """Vérifie qu'un support ne peut pas être affecté à deux événements simultanés."""
+    add_event(session, "Concert", datetime(2023, 6, 22, 11), datetime(2023, 6, 22, 14), support_contact_id=3)
+
+    with pytest.raises(ValueError, match="est déjà affecté à l'événement 4"):
+        crud_event.update_event_support_contact(session, 2, "EMP0003")
+
+    event = crud_event.update_event_support_contact(session, 2, "EMP0004")
+    assert event.support_contact_id == 4
+
+
+def test_update_event_dates_conflict(session):
+    """Vérifie qu'un changement de dates créant un conflit de support est refusé et annulé."""
+    crud_event.update_event_support_contact(session, 2, "EMP0003")
+
+    with pytest.raises(ValueError, match="Conflit de contact support avec l'événement 1"):
+        crud_event.update_event(session, 2, {"start_date": "2023-06-21 22:00:00"}, "EMP0005")
+
+    assert session.get(Event, 2).start_date == datetime(2023, 6, 22, 10)
+
+
+def test_find_event_conflicts(session):
+    """Vérifie le rapport des événements qui se chevauchent par support et par lieu."""
+    add_event(session, "Concert", datetime(2023, 6, 21, 22), datetime(2023, 6, 22, 1), "Parc des Princes", 3)
+    add_event(session, "After", datetime(2023, 6, 22, 0), datetime(2023, 6, 22, 2), "Parc des Princes")
+    add_event(session, "Suite", datetime(2023, 6, 22, 2), datetime(2023, 6, 22, 3), "Parc des Princes")
+
+    conflicts = crud_event.find_event_conflicts(session, since=datetime(2023, 1, 1))
+    assert [(resource, first.id, second.id) for resource, first, second in conflicts] == [
+        ("support_contact_id", 1, 4),
+        ("location", 1, 4),
+        ("location", 4, 5),
+    ]
+
+    assert crud_event.find_event_conflicts(session) == []
+    assert len(crud_event.find_event_conflicts(session, datetime(2023, 1, 1), ["location"])) == 2
+
+
+def test_find_event_conflicts_matches_check(session):
+    """Vérifie que le rapport regroupe les lieux comme la base : mêmes conflits que check_event_conflicts."""
+    for name, location in (("A", "Paris"), ("B", "paris"), ("C", "Lyon"), ("D", "Paris"), ("E", "PARIS")):
+        add_event(session, name, datetime(2023, 6, 22, 10), datetime(2023, 6, 22, 12), location)
+
+    reported = {frozenset((first.id, second.id))
+                for _, first, second in crud_event.find_event_conflicts(session, datetime(2023, 1, 1), ["location"])}
+
+    expected = set()
+    for event in session.query(Event).filter(Event.location.isnot(None)):
+        for other in crud_event.query_overlapping_events(session, "location", event.location, event.start_date,
+                                                         event.end_date, event.id):
+            expected.add(frozenset((event.id, other.id)))
+
+    assert reported == expected
+    assert frozenset(event.id for event in session.query(Event).filter(Event.name.in_(["A", "D"]))) in reported
+
+
+def test_plan_support_assignment_balances_load(session):
+    """Vérifie que chaque événement est confié au support disponible le moins chargé."""
+    add_event(session, "Concert", datetime(2023, 6, 22, 11), datetime(2023, 6, 22, 14))
+    add_event(session, "Salon", datetime(2023, 6, 22, 11), datetime(2023, 6, 22, 12))
+
+    assignments, unassigned = crud_event.plan_support_assignment(session, since=datetime(2023, 6, 22))
+
+    # L'événement 1 de Bob (EMP0003) est terminé avant since : il ne compte pas dans sa charge
+    assert [(event_id, employee.employee_number) for event_id, employee in assignments] == [
+        (2, "EMP0003"), (4, "EMP0004"), (3, "EMP0003"),
+    ]
+    assert unassigned == [5]
+
+
+def test_plan_support_assignment_respects_existing_events(session):
+    """Vérifie qu'un support déjà occupé sur le créneau n'est pas retenu."""
+    add_event(session, "Concert", datetime(2023, 6, 22, 9), datetime(2023, 6, 22, 11), support_contact_id=4)
+
+    assignments, _ = crud_event.plan_support_assignment(session, since=datetime(2023, 6, 22))
+
+    assert [(event_id, employee.id) for event_id, employee in assignments] == [(2, 3), (3, 3)]
+
+
+def test_auto_assign_events(session):
+    """Vérifie que l'affectation est appliquée, sauf en simulation."""
+    assignments, _, _ = crud_event.auto_assign_events(session, since=datetime(2023, 6, 22), dry_run=True)
+    assert len(assignments) == 2
+    assert session.get(Event, 2).support_contact_id is None
+
+    crud_event.auto_assign_events(session, since=datetime(2023, 6, 22))
+    assert session.get(Event, 2).support_contact_id == 3
+    assert session.get(Event, 3).support_contact_id == 4
+
+    assert crud_event.auto_assign_events(session, since=datetime(2023, 6, 22)) == ([], [], [])
+
+
+def test_auto_assign_events_single_update(session, mocker):
+    """Vérifie que les affectations d'un lot sont écrites en une seule requête, sans relecture si toutes passent."""
+    plan = [(2, session.get(Employee, 3)), (3, session.get(Employee, 4))]
+    mocker.patch.object(crud_event, "plan_support_assignment", return_value=(plan, []))
+
+    with QueryCounter(session.get_bind()) as counter:
+        written, _, skipped = crud_event.auto_assign_events(session)
+
+    assert counter.count == 1
+    assert written == plan
+    assert skipped == []
+    assert session.get(Event, 2).support_contact_id == 3
+
+
+def test_auto_assign_events_assigned_meanwhile(session, mocker):
+    """Vérifie qu'un événement affecté entre le calcul et l'écriture n'est pas compté comme affecté."""
+    plan = crud_event.plan_support_assignment
+
+    def plan_then_assign(session, since):
+        result = plan(session, since)
+        # Un autre utilisateur affecte l'événement 2 à un autre support avant l'écriture
+        session.execute(update(Event).where(Event.id == 2).values(support_contact_id=4))
+        return result
+
+    mocker.patch.object(crud_event, "plan_support_assignment", side_effect=plan_then_assign)
+
+    assignments, unassigned, skipped = crud_event.auto_assign_events(session, since=datetime(2023, 6, 22))
+
+    assert [(event_id, employee.id) for event_id, employee in assignments] == [(3, 4)]
+    assert unassigned == []
+    assert skipped == [2]
+    assert session.get(Event, 2).support_contact_id == 4
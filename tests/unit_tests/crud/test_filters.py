@@ -0,0 +1,106 @@
+import pytest
+from app.crud import contract as crud_contract
+from app.crud import customer as crud_customer
+from app.crud import employee as crud_employee
+from app.crud import event as crud_event
+from app.crud.filters import split_operator
+from app.models.models import Customer
+
+
+def test_split_operator():
+    """Vérifie la séparation de l'opérateur et de la valeur d'un filtre."""
+    assert split_operator(">=1000") == (">=", "1000")
+    assert split_operator("<5") == ("<", "5")
+    assert split_operator("2023-01-01..2023-12-31") == ("between", ("2023-01-01", "2023-12-31"))
+    assert split_operator("Acme") == ("=", "Acme")
+
+
+def test_filter_integer_key_is_equality(session):
+    """Vérifie qu'un filtre sur un id est une égalité et non un LIKE."""
+    session.add_all([
+        Customer(first_name=f"Client{i}", last_name="Test", email=f"client{i}@test.com")
+        for i in range(10)
+    ])
+    session.commit()
+
+    customers = crud_customer.get_customers(session, {"id": "1"})
+    assert [customer.id for customer in customers] == [1]
+
+
+def test_filter_integer_invalid(session):
+    """Vérifie qu'une valeur non entière sur un id lève une erreur."""
+    with pytest.raises(ValueError):
+        crud_customer.get_customers(session, {"sale_contact_id": "abc"})
+
+
+def test_filter_decimal_range(session):
+    """Vérifie les opérateurs de plage sur un montant."""
+    contracts = crud_contract.get_contracts(session, {"total_amount": ">=2500"})
+    assert sorted(contract.id for contract in contracts) == [3, 4, 5]
+
+    contracts = crud_contract.get_contracts(session, {"remaining_amount": "1000..2500"})
+    assert sorted(contract.id for contract in contracts) == [2, 3]
+
+
+def test_filter_boolean(session):
+    """Vérifie le filtrage sur un booléen."""
+    contracts = crud_contract.get_contracts(session, {"signed": "False"})
+    assert [contract.id for contract in contracts] == [4]
+
+
+def test_filter_datetime_day(session):
+    """Vérifie qu'une date sans heure désigne la journée entière."""
+    events = crud_event.get_events(session, {"start_date": "2023-06-21"})
+    assert [event.id for event in events] == [1]
+
+    events = crud_event.get_events(session, {"start_date": "<=2023-06-22"})
+    assert sorted(event.id for event in events) == [1, 2]
+
+
+def test_filter_datetime_range(session):
+    """Vérifie le filtrage d'une plage de dates."""
+    events = crud_event.get_events(session, {"start_date": "2023-06-22..2025-12-31"})
+    assert sorted(event.id for event in events) == [2, 3]
+
+    events = crud_event.get_events(session, {"end_date": ">2023-06-21 22:00:00"})
+    assert sorted(event.id for event in events) == [1, 2, 3]
+
+
+def test_filter_datetime_invalid(session):
+    """Vérifie qu'une date invalide lève une erreur."""
+    with pytest.raises(ValueError):
+        crud_event.get_events(session, {"start_date": "21/06/2023"})
+
+
+def test_filter_text(session):
+    """Vérifie les filtres sur le texte : contient, préfixe et égalité."""
+    assert len(crud_customer.get_customers(session, {"company": "Inc"})) == 1
+    assert len(crud_customer.get_customers(session, {"company": "Glob*"})) == 1
+    assert len(crud_customer.get_customers(session, {"company": "Inc*"})) == 0
+    assert len(crud_customer.get_customers(session, {"company": "=Globex"})) == 0
+    assert len(crud_customer.get_customers(session, {"company": "=Globex Inc"})) == 1
+
+
+def test_filter_text_prefix_escapes_wildcards(session):
+    """Vérifie que le préfixe est insensible à la casse et que % et _ y sont pris littéralement."""
+    assert len(crud_customer.get_customers(session, {"company": "glob*"})) == 1
+    assert len(crud_customer.get_customers(session, {"company": "%*"})) == 0
+    assert len(crud_customer.get_customers(session, {"company": "Glob_x*"})) == 0
+
+
+def test_filter_unique_text_is_equality(session):
+    """Vérifie qu'un filtre sur une colonne unique est une égalité stricte."""
+    assert len(crud_employee.get_employees(session, {"employee_number": "EMP0001"})) == 1
+    assert len(crud_employee.get_employees(session, {"employee_number": "EMP000"})) == 0
+
+
+def test_filter_null(session):
+    """Vérifie le filtrage sur les valeurs nulles."""
+    events = crud_event.get_events(session, {"support_contact_id": "None"})
+    assert sorted(event.id for event in events) == [2, 3]
+
+
+def test_filter_unknown_attribute(session):
+    """Vérifie qu'un attribut inconnu lève une erreur."""
+    with pytest.raises(ValueError):
+        crud_customer.get_customers(session, {"unknown": "1"})
@@ -0,0 +1,70 @@
+import pytest
+from app.crud import customer as crud_customer
+from app.crud import contract as crud_contract
+from app.crud import employee as crud_employee
+from app.crud import event as crud_event
+from app.crud.loading import apply_load_plan
+from app.models.models import Customer
+from app.ui import views
+from tests.conftest import QueryCounter
+
+
+def add_customers(session, count):
+    """Ajoute des clients rattachés à des commerciaux différents."""
+    session.add_all([
+        Customer(first_name=f"Client{i}", last_name=f"Test{i}", email=f"client{i}@test.com", sale_contact_id=1 + i % 2)
+        for i in range(count)
+    ])
+    session.commit()
+
+
+@pytest.mark.parametrize("extra_rows", [0, 20])
+def test_list_customers_fixed_query_count(session, extra_rows, capsys):
+    """Vérifie que l'affichage de la liste des clients exécute une seule requête, quel que soit le nombre de lignes."""
+    add_customers(session, extra_rows)
+    session.expunge_all()
+
+    with QueryCounter(session.get_bind()) as counter:
+        customers = crud_customer.get_customers(session, {}, {}, load=views.CUSTOMER_LOAD_PLAN)
+        views.display_customers(customers, "list")
+
+    assert len(customers) == 3 + extra_rows
+    assert counter.count == 1
+
+
+@pytest.mark.parametrize("get_func, display_func, load_plan", [
+    (crud_employee.get_employees, views.display_employees, views.EMPLOYEE_LOAD_PLAN),
+    (crud_contract.get_contracts, views.display_contracts, views.CONTRACT_LOAD_PLAN),
+    (crud_event.get_events, views.display_events, views.EVENT_LOAD_PLAN),
+])
+def test_list_views_fixed_query_count(session, get_func, display_func, load_plan, capsys):
+    """Vérifie que chaque vue de liste n'exécute qu'une requête grâce à son plan de chargement."""
+    session.expunge_all()
+
+    with QueryCounter(session.get_bind()) as counter:
+        display_func(get_func(session, {}, {}, load=load_plan), "list")
+
+    assert counter.count == 1
+
+
+def test_load_plan_selectin(session):
+    """Vérifie qu'un plan en selectin charge la relation en une requête supplémentaire."""
+    session.expunge_all()
+
+    with QueryCounter(session.get_bind()) as counter:
+        customers = crud_customer.get_customers(session, {}, {}, load={"contracts": "selectin"})
+        assert sum(len(customer.contracts) for customer in customers) == 5
+
+    assert counter.count == 2
+
+
+def test_load_plan_unknown_relationship(session):
+    """Vérifie qu'une relation inconnue lève une erreur."""
+    with pytest.raises(ValueError):
+        apply_load_plan(session.query(Customer), Customer, {"unknown": "joined"})
+
+
+def test_load_plan_unknown_strategy(session):
+    """Vérifie qu'une stratégie inconnue lève une erreur."""
+    with pytest.raises(ValueError):
+        apply_load_plan(session.query(Customer), Customer, {"sale_contact": "lazy"})
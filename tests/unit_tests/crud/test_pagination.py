@@ -0,0 +1,78 @@
+import pytest
+from app.crud import contract as crud_contract
+from app.crud import customer as crud_customer
+from app.crud import event as crud_event
+from app.crud.pagination import next_cursor
+
+
+def fetch_all_pages(get_func, session, sorts, limit):
+    """Parcourt toutes les pages d'une fonction get_* et renvoie les résultats concaténés."""
+    results = []
+    after = None
+    while True:
+        page = get_func(session, {}, sorts, limit, after)
+        results.extend(page)
+        after = next_cursor(page, sorts, limit)
+        if after is None:
+            return results
+        # Un curseur qui n'avance pas renverrait indéfiniment la même page
+        assert len(results) <= 100, "la pagination ne progresse pas"
+
+
+def test_paginate_with_limit(session):
+    """Vérifie que la limite est appliquée et qu'un curseur est renvoyé."""
+    customers = crud_customer.get_customers(session, {}, {}, limit=2)
+    assert [customer.id for customer in customers] == [1, 2]
+    assert next_cursor(customers, {}, 2) is not None
+
+
+def test_paginate_after_id(session):
+    """Vérifie qu'un simple id peut servir de curseur sans critère de tri."""
+    customers = crud_customer.get_customers(session, {}, {}, limit=2, after="2")
+    assert [customer.id for customer in customers] == [3]
+    assert next_cursor(customers, {}, 2) is None
+
+
+def test_paginate_matches_full_sort(session):
+    """Vérifie que le parcours page par page donne le même ordre que la requête complète."""
+    sorts = {"sale_contact_id": "desc", "last_name": "asc"}
+    expected = [customer.id for customer in crud_customer.get_customers(session, {}, sorts)]
+    paged = [customer.id for customer in fetch_all_pages(crud_customer.get_customers, session, sorts, 1)]
+    assert paged == expected
+
+
+def test_paginate_with_null_values(session):
+    """Vérifie que les valeurs NULL dans une colonne triée ne font pas perdre de lignes."""
+    for order in ("asc", "desc"):
+        sorts = {"support_contact_id": order}
+        paged = fetch_all_pages(crud_event.get_events, session, sorts, 1)
+        assert sorted(event.id for event in paged) == [1, 2, 3]
+
+
+def test_paginate_cursor_with_other_sorts(session):
+    """Vérifie qu'un curseur ne peut pas être réutilisé avec d'autres critères de tri."""
+    customers = crud_customer.get_customers(session, {}, {"last_name": "asc"}, limit=1)
+    cursor = next_cursor(customers, {"last_name": "asc"}, 1)
+
+    with pytest.raises(ValueError):
+        crud_customer.get_customers(session, {}, {"company": "asc"}, limit=1, after=cursor)
+
+
+def test_paginate_invalid_cursor(session):
+    """Vérifie qu'un curseur invalide lève une erreur."""
+    with pytest.raises(ValueError):
+        crud_customer.get_customers(session, {}, {}, limit=1, after="not-a-cursor")
+
+
+@pytest.mark.parametrize("get_func, sorts", [
+    (crud_contract.get_contracts, {"created_at": "desc", "total_amount": "desc"}),
+    (crud_contract.get_contracts, {"created_at": "asc", "id": "desc"}),
+    (crud_customer.get_customers, {"updated_at": "asc"}),
+    (crud_customer.get_customers, {"updated_at": "desc", "created_at": "desc"}),
+])
+def test_paginate_on_server_default_timestamps(session, get_func, sorts):
+    """Vérifie le parcours page par page sur des dates remplies par la base (valeur par défaut du serveur)."""
+    expected = [item.id for item in get_func(session, {}, sorts)]
+    paged = [item.id for item in fetch_all_pages(get_func, session, sorts, 1)]
+    assert len(expected) > 2
+    assert paged == expected
@@ -0,0 +1,104 @@
+import pytest
+from decimal import Decimal
+from app.crud import contract as crud_contract
+from app.crud import customer as crud_customer
+from app.crud import employee as crud_employee
+from app.crud import report as crud_report
+from app.models.models import Contract, Customer, Employee, SalesSummary
+
+
+def assert_summary_matches_contracts(session):
+    """Vérifie que le résumé des ventes donne les mêmes totaux qu'un calcul sur les contrats, pour tous les axes."""
+    by = tuple(crud_report.SALES_DIMENSIONS)
+    assert crud_report.sales_report(session, by) == crud_report.sales_report(session, by, live=True)
+
+
+def test_sales_report_by_sale_contact(session):
+    """Vérifie les totaux par commercial."""
+    rows = crud_report.sales_report(session)
+
+    assert [(row["sale_contact"].employee_number, row["contracts"], row["total_amount"], row["remaining_amount"])
+            for row in rows] == [
+        ("EMP0001", 3, Decimal("5500.00"), Decimal("4500.00")),
+        ("EMP0002", 2, Decimal("9000.00"), Decimal("3000.00")),
+    ]
+    assert_summary_matches_contracts(session)
+
+
+def test_sales_report_by_signed_and_top(session):
+    """Vérifie le regroupement par statut de signature et la limitation aux plus gros montants."""
+    rows = crud_report.sales_report(session, ("signed",))
+    assert [(row["signed"], row["contracts"]) for row in rows] == [(False, 1), (True, 4)]
+
+    rows = crud_report.sales_report(session, ("customer",), top=1)
+    assert [(row["customer"].id, row["total_amount"]) for row in rows] == [(3, Decimal("9000.00"))]
+
+
+def test_sales_report_invalid_dimension(session):
+    """Vérifie le rejet d'un axe de regroupement inconnu."""
+    with pytest.raises(ValueError, match="L'axe 'region' n'existe pas"):
+        crud_report.sales_report(session, ("region",))
+
+
+def test_sales_summary_follows_contract_changes(session):
+    """Vérifie que le résumé suit les créations, modifications et suppressions de contrats."""
+    contract = crud_contract.create_contract(session, {
+        "customer_id": 2, "sale_contact_id": 2, "total_amount": 1000.1, "remaining_amount": 1000.1, "signed": False,
+    })
+    assert_summary_matches_contracts(session)
+
+    crud_contract.update_contract(session, contract.id, {"remaining_amount": "250.05", "signed": "oui"}, "EMP0005")
+    assert_summary_matches_contracts(session)
+
+    crud_contract.delete_contract(session, session.get(Contract, contract.id))
+    assert_summary_matches_contracts(session)
+
+    # Aucune ligne vide ne subsiste
+    assert session.query(SalesSummary).filter(SalesSummary.contracts <= 0).count() == 0
+
+
+def test_sales_summary_with_duplicate_keys(session):
+    """Vérifie que les sommes restent justes lorsque plusieurs lignes du résumé portent la même clé."""
+    kept = crud_contract.create_contract(session, {
+        "customer_id": 2, "sale_contact_id": 2, "total_amount": 100, "remaining_amount": 100, "signed": False,
+    })
+
+    # Contrat dont la ligne du résumé est insérée à part, comme par une transaction concurrente
+    removed = Contract(customer_id=2, sale_contact_id=2, total_amount=50, remaining_amount=50, signed=False,
+                       created_at=kept.created_at)
+    session.add(removed)
+    session.add(SalesSummary(sale_contact_id=2, customer_id=2, month=f"{kept.created_at:%Y-%m}", signed=False,
+                             contracts=1, total_amount=50, remaining_amount=50))
+    session.commit()
+    assert_summary_matches_contracts(session)
+
+    crud_contract.delete_contract(session, removed)
+    assert_summary_matches_contracts(session)
+
+    crud_contract.delete_contract(session, kept)
+    assert_summary_matches_contracts(session)
+
+
+def test_sales_summary_follows_bulk_changes(session):
+    """Vérifie que le résumé suit les réaffectations et suppressions qui modifient plusieurs contrats."""
+    crud_customer.update_customer_sale_contact(session, 1, "EMP0002")
+    assert_summary_matches_contracts(session)
+
+    crud_employee.handover_sale_contact(session, "EMP0002", "EMP0001")
+    assert_summary_matches_contracts(session)
+
+    crud_customer.delete_customer(session, session.get(Customer, 3))
+    assert_summary_matches_contracts(session)
+
+    crud_employee.delete_employee(session, session.get(Employee, 1))
+    assert_summary_matches_contracts(session)
+
+
+def test_refresh_sales_summary(session):
+    """Vérifie le recalcul complet du résumé à partir des contrats."""
+    session.query(SalesSummary).delete()
+    crud_report.refresh_sales_summary(session)
+    session.commit()
+
+    assert_summary_matches_contracts(session)
+    assert crud_report.sales_report(session, ("signed",))[1]["contracts"] == 4
@@ -1,4 +1,20 @@
+import pytest
+from sqlalchemy import event
+from app.crud import customer as crud_customer
+from app.crud import employee as crud_employee
+from app.crud import event as crud_event
 from app.crud import role as crud_role
+from tests.conftest import QueryCounter
+
+
+class FakeClock:
+    """Horloge avancée à la main par les tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
 
 
 def test_get_roles(session):
@@ -10,3 +26,74 @@ def test_get_roles(session):
         "Management",
     ]
     assert [role.name for role in db_roles] == expected_names
+
+
+def test_role_cache_reads_roles_once(session):
+    """Vérifie que les rôles ne sont lus qu'une fois tant que le cache est valide."""
+    cache = crud_role.RoleCache(ttl=60)
+
+    with QueryCounter(session.get_bind()) as counter:
+        assert cache.id_of("Support", session) == 2
+        assert cache.name_of(3, session) == "Management"
+        assert cache.name_of("1", session) == "Commercial"
+        assert [role.id for role in cache.roles(session)] == [1, 2, 3]
+
+    assert counter.count == 1
+    assert cache.loads == 1
+
+
+def test_role_cache_ttl_and_invalidate(session):
+    """Vérifie que les rôles sont relus après expiration du délai ou invalidation."""
+    clock = FakeClock()
+    cache = crud_role.RoleCache(ttl=60, clock=clock)
+
+    cache.roles(session)
+    clock.now = 59
+    cache.roles(session)
+    assert cache.loads == 1
+
+    clock.now = 60
+    cache.roles(session)
+    assert cache.loads == 2
+
+    cache.invalidate()
+    cache.roles(session)
+    assert cache.loads == 3
+
+
+def test_role_cache_unknown_role(session):
+    """Vérifie le comportement du cache pour un rôle inconnu."""
+    cache = crud_role.RoleCache()
+
+    with pytest.raises(ValueError, match="Le rôle 'Stagiaire' n'existe pas."):
+        cache.id_of("Stagiaire", session)
+    assert cache.name_of(99, session) is None
+    assert cache.name_of("abc", session) is None
+
+
+def test_role_checks_do_not_load_role(session):
+    """Vérifie que les contrôles de rôle des fonctions CRUD n'interrogent pas la table des rôles."""
+    statements = []
+
+    def on_execute(connection, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        crud_customer.update_customer_sale_contact(session, 1, "EMP0002")
+        with pytest.raises(ValueError, match="n'est pas un commercial"):
+            crud_customer.update_customer_sale_contact(session, 1, "EMP0003")
+        with pytest.raises(ValueError, match="n'est pas un support"):
+            crud_event.update_event_support_contact(session, 1, "EMP0001")
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert statements
+    assert not [statement for statement in statements if "FROM role" in statement]
+
+
+def test_update_employee_unknown_role(session):
+    """Vérifie que le message d'erreur liste les rôles du cache."""
+    with pytest.raises(ValueError, match=r"1 \(Commercial\), 2 \(Support\), 3 \(Management\)"):
+        crud_employee.update_employee(session, "EMP0001", {"role_id": "9"})
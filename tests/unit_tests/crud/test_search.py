@@ -0,0 +1,137 @@
+import pytest
+from app.crud import search as crud_search
+from app.crud import customer as crud_customer
+from app.crud import event as crud_event
+from app.crud.pagination import encode_cursor
+from sqlalchemy.dialects import mysql
+from tests.conftest import fulltext_sees_test_data
+
+
+@fulltext_sees_test_data
+def test_search_all_kinds(session):
+    """Vérifie que la recherche parcourt clients, événements et employés en une seule liste classée."""
+    results, cursor = crud_search.search(session, "gmail")
+
+    assert cursor is None
+    assert {kind for kind, _, _ in results} == {"customer"}
+    assert sorted(item.id for _, _, item in results) == [1, 2, 3]
+    scores = [score for _, score, _ in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+@fulltext_sees_test_data
+def test_search_prefix_and_accents(session):
+    """Vérifie la recherche par début de mot, sans tenir compte de la casse ni des accents."""
+    results, _ = crud_search.search(session, "DUP")
+    assert [(kind, item.employee_number) for kind, _, item in results] == [("employee", "EMP0001")]
+
+    results, _ = crud_search.search(session, "conference")
+    assert [(kind, item.id) for kind, _, item in results] == [("event", 2)]
+
+
+@fulltext_sees_test_data
+def test_search_requires_every_term(session):
+    """Vérifie que chaque mot recherché doit être présent."""
+    results, _ = crud_search.search(session, "alice dupont")
+    assert len(results) == 1
+
+    results, _ = crud_search.search(session, "alice moreau")
+    assert results == []
+
+
+def test_search_filters_kinds(session):
+    """Vérifie la restriction à certains types de résultats."""
+    results, _ = crud_search.search(session, "gmail", kinds=["employee", "event"])
+    assert results == []
+
+
+@fulltext_sees_test_data
+def test_search_pagination(session):
+    """Vérifie le découpage en pages et le curseur de la page suivante."""
+    first_page, cursor = crud_search.search(session, "gmail", limit=2)
+    assert len(first_page) == 2
+    assert cursor is not None
+
+    second_page, cursor = crud_search.search(session, "gmail", limit=2, after=cursor)
+    assert len(second_page) == 1
+    assert cursor is None
+    assert {item.id for _, _, item in first_page + second_page} == {1, 2, 3}
+
+
+@fulltext_sees_test_data
+def test_search_pagination_keeps_ranking(session):
+    """Vérifie que les pages successives d'un résultat reprennent le classement complet, sans doublon."""
+    everything, _ = crud_search.search(session, "gmail")
+
+    pages = []
+    results, cursor = crud_search.search(session, "gmail", limit=1)
+    pages += results
+    while cursor:
+        results, cursor = crud_search.search(session, "gmail", limit=1, after=cursor)
+        pages += results
+
+    assert [(kind, item.id) for kind, _, item in pages] == [(kind, item.id) for kind, _, item in everything]
+
+
+@fulltext_sees_test_data
+def test_search_index_follows_changes(session):
+    """Vérifie que l'index suit les créations, modifications et suppressions."""
+    customer = crud_customer.create_customer(session, {
+        "first_name": "Zoé", "last_name": "Quintal", "email": "zoe.quintal@test.com", "sale_contact_id": 1,
+    })
+    assert [item.id for _, _, item in crud_search.search(session, "quintal")[0]] == [customer.id]
+
+    crud_event.update_event(session, 1, {"location": "Zanzibar"}, "EMP0003")
+    assert [(kind, item.id) for kind, _, item in crud_search.search(session, "zanzibar")[0]] == [("event", 1)]
+
+    crud_customer.delete_customer(session, customer)
+    assert crud_search.search(session, "quintal")[0] == []
+
+
+@fulltext_sees_test_data
+def test_search_pagination_with_tied_scores(session):
+    """Vérifie que des résultats de même score sont parcourus page par page sans doublon ni oubli."""
+    ids = {
+        crud_customer.create_customer(session, {
+            "first_name": "Ex", "last_name": "Aequo", "email": f"ex.aequo{number}@test.com", "sale_contact_id": 1,
+        }).id
+        for number in range(5)
+    }
+
+    found = []
+    results, cursor = crud_search.search(session, "aequo", limit=2)
+    found += results
+    while cursor:
+        results, cursor = crud_search.search(session, "aequo", limit=2, after=cursor)
+        found += results
+
+    assert len({score for _, score, _ in found}) == 1
+    assert sorted(item.id for _, _, item in found) == sorted(ids)
+
+
+def test_search_mysql_cursor_on_integer_score():
+    """
+    Vérifie que la requête MySQL classe et reprend la pagination sur le score entier, sans flottant.
+
+    Les autres tests de recherche sont ignorés sous MySQL (voir fulltext_sees_test_data).
+    """
+    query = crud_search._mysql_search(["dupont"], ["customer"], [1234567, "customer", 3])
+    sql = str(query.compile(dialect=mysql.dialect()))
+
+    assert "CAST(round((MATCH (customer.first_name" in sql
+    assert "AS SIGNED INTEGER) AS score" in sql
+    assert "ORDER BY anon_1.score DESC, anon_1.kind, anon_1.id" in sql
+
+
+def test_search_rejects_float_score_cursor(session):
+    """Vérifie le rejet d'un curseur dont le score n'est pas entier."""
+    after = encode_cursor(crud_search.SQLITE_SEARCH_KEYS, [-0.5, 12])
+    with pytest.raises(ValueError):
+        crud_search.search(session, "gmail", after=after)
+
+
+@pytest.mark.parametrize("text, after", [("  ", None), ("*+-", None), ("gmail", "abc"), ("gmail", "2")])
+def test_search_invalid(session, text, after):
+    """Vérifie le rejet d'une recherche sans mot ou d'un curseur invalide."""
+    with pytest.raises(ValueError):
+        crud_search.search(session, text, after=after)
@@ -0,0 +1,23 @@
+from app.crud import event as crud_event
+from app.db.explain import check_query_shapes, explain, full_scans, QUERY_SHAPES
+
+
+def test_explain_returns_plan(session):
+    """Vérifie que explain renvoie le plan d'exécution d'une requête."""
+    plan = explain(session, crud_event.query_events(session, {"support_contact_id": "3"}))
+    assert plan
+
+
+def test_full_scans_detected(session):
+    """Vérifie qu'une recherche sur une colonne non indexée est signalée comme parcours complet."""
+    query = crud_event.query_events(session, {"notes": "rock"})
+    assert full_scans(session, query)
+
+
+def test_query_shapes_use_indexes(session):
+    """Vérifie que les formes de requêtes fréquentes ne parcourent pas une table entière."""
+    results = dict(check_query_shapes(session))
+    assert len(results) == len(QUERY_SHAPES)
+
+    for name, scans in results.items():
+        assert scans == [], name
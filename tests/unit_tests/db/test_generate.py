@@ -0,0 +1,63 @@
+import click
+import pytest
+from datetime import datetime
+from sqlalchemy import func, select
+from app.db import generate
+from app.models.models import Contract, Customer, Employee, Event
+
+
+def generate_into(tmp_path, name, **options):
+    """Génère un jeu de données dans un fichier SQLite et renvoie le moteur et le nombre de lignes."""
+    engine = generate.create_generation_engine(f"sqlite:///{tmp_path / name}")
+    generate.reset_tables(engine)
+    return engine, generate.generate(engine, password_hash="hash", **options)
+
+
+def test_parse_count_and_range():
+    """Vérifie la lecture des effectifs (5k, 1M) et des plages (0-5)."""
+    assert generate.parse_count("5k") == 5000
+    assert generate.parse_count("1.5M") == 1_500_000
+    assert generate.parse_count("42") == 42
+    assert generate.parse_range("0-5") == (0, 5)
+    assert generate.parse_range("3") == (3, 3)
+
+    with pytest.raises(click.BadParameter):
+        generate.parse_count("beaucoup")
+    with pytest.raises(click.BadParameter):
+        generate.parse_range("5-2")
+
+
+def test_generate(tmp_path):
+    """Vérifie les volumes, les clés étrangères et les règles métier du jeu généré."""
+    engine, counts = generate_into(tmp_path, "data.db", employees=20, customers=500, contracts_per_customer=(1, 3),
+                                   event_ratio=0.5, seed=1, batch_size=200)
+
+    with engine.connect() as connection:
+        assert counts["employee"] == connection.scalar(select(func.count()).select_from(Employee)) == 20
+        assert counts["customer"] == connection.scalar(select(func.count()).select_from(Customer)) == 500
+        assert 500 <= counts["contract"] <= 1500
+        assert connection.scalar(select(func.count()).select_from(Contract)) == counts["contract"]
+        assert connection.scalar(select(func.count()).select_from(Event)) == counts["event"] > 0
+
+        # Un événement ne concerne que des contrats signés et finit après avoir commencé
+        unsigned = select(func.count()).select_from(Event).join(Contract).where(Contract.signed.is_(False))
+        assert connection.scalar(unsigned) == 0
+        assert connection.scalar(select(func.count()).where(Event.end_date <= Event.start_date)) == 0
+        assert connection.scalar(select(func.count()).where(Contract.remaining_amount > Contract.total_amount)) == 0
+
+        # Distribution asymétrique : le commercial le plus chargé a bien plus de clients que la moyenne
+        per_contact = connection.execute(
+            select(func.count()).where(Customer.sale_contact_id.is_not(None)).group_by(Customer.sale_contact_id)
+        ).scalars().all()
+        assert max(per_contact) > 2 * sum(per_contact) / len(per_contact)
+
+
+def test_generate_is_reproducible(tmp_path):
+    """Vérifie qu'une même graine produit le même jeu de données."""
+    now = datetime(2025, 1, 1)
+    first = generate.DatasetGenerator(seed=7, now=now)
+    second = generate.DatasetGenerator(seed=7, now=now)
+
+    assert list(first.employees(10, "hash")) == list(second.employees(10, "hash"))
+    assert list(first.customers(1, 50, [1, 2], [1, 1.5], ["Acme"], [1])) == \
+        list(second.customers(1, 50, [1, 2], [1, 1.5], ["Acme"], [1]))
@@ -0,0 +1,177 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import Column, String, func, inspect, insert, select, text
+from app.db.database import create_database_engine
+from app.db.migrate import Migration, Operations, find_index, load_migrations, migration_status, upgrade
+from app.models.fulltext import SEARCH_KINDS_FACTOR, SEARCH_SOURCES, drop_search_index
+from app.models.models import Base, Contract, Customer, Role, SalesSummary
+from sqlalchemy.dialects import mysql
+
+
+@pytest.fixture
+def migration_engine(tmp_path):
+    """Moteur SQLite sur un fichier vide."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_load_migrations():
+    """Vérifie que les migrations sont chargées dans l'ordre avec leur description."""
+    migrations = load_migrations()
+
+    assert [migration.version for migration in migrations][:7] == [1, 2, 3, 4, 5, 6, 7]
+    assert migrations[0].description.startswith("Schéma initial")
+
+
+def test_upgrade_creates_schema(migration_engine):
+    """Vérifie que les migrations créent les tables, index et rôles décrits par les modèles."""
+    done = upgrade(migration_engine)
+    assert done == [migration.version for migration in load_migrations()]
+
+    inspector = inspect(migration_engine)
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name)
+        names = {index["name"] for index in inspector.get_indexes(table.name)}
+        # Les index FULLTEXT sont propres à MySQL (FTS5 sous SQLite)
+        expected = {index.name for index in table.indexes if index.dialect_options["mysql"]["prefix"] != "FULLTEXT"}
+        assert expected <= names
+
+    with migration_engine.connect() as connection:
+        assert connection.execute(select(Role.name).order_by(Role.id)).scalars().all() == \
+            ["Commercial", "Support", "Management"]
+
+    assert upgrade(migration_engine) == []
+
+
+def test_upgrade_keeps_existing_data(migration_engine):
+    """Vérifie qu'une base créée avant les migrations est complétée sans perte de données."""
+    Base.metadata.create_all(migration_engine)
+    with migration_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_customer_company"))
+        connection.execute(insert(Customer).values(first_name="Ada", last_name="Lovelace", email="ada@test.com"))
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(Customer)) == 1
+        assert connection.scalar(select(func.count()).select_from(Role)) == 3
+    assert "ix_customer_company" in {index["name"] for index in inspect(migration_engine).get_indexes("customer")}
+
+
+def test_upgrade_target_and_status(migration_engine):
+    """Vérifie l'arrêt à une version donnée et l'état des migrations."""
+    assert upgrade(migration_engine, target=1) == [1]
+
+    statuses = migration_status(migration_engine)
+    assert statuses[0][1] is not None
+    assert all(applied_at is None for _, applied_at in statuses[1:])
+
+
+def test_operations_are_idempotent(migration_engine):
+    """Vérifie qu'une opération déjà appliquée n'est pas rejouée."""
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        op = Operations(connection)
+
+        assert op.create_index(find_index(Base.metadata, "ix_customer_company")) is False
+        assert op.add_column("customer", Column("nickname", String(50))) is True
+        assert op.add_column("customer", Column("nickname", String(50))) is False
+        assert op.has_column("customer", "nickname")
+
+
+def test_backfill_in_batches(migration_engine, mocker):
+    """Vérifie la mise à jour par lots, avec une pause entre deux lots."""
+    upgrade(migration_engine)
+    with migration_engine.begin() as connection:
+        connection.execute(insert(Customer), [
+            {"first_name": "Client", "last_name": str(i), "email": f"client{i}@test.com", "company": None}
+            for i in range(7)
+        ])
+
+    sleep = mocker.patch("app.db.migrate.time.sleep")
+    messages = []
+
+    with migration_engine.connect() as connection:
+        op = Operations(connection, batch_size=3, pause=0.5, log=messages.append)
+        updated = op.backfill(Customer.__table__, {"company": "Inconnue"}, where=Customer.company.is_(None))
+
+        assert updated == 7
+        assert connection.scalar(select(func.count()).where(Customer.company == "Inconnue")) == 7
+
+    assert sleep.call_count == 3
+    assert messages[-1] == "customer : 7 lignes mises à jour"
+
+
+def test_failed_migration_is_not_recorded(migration_engine):
+    """Vérifie qu'une migration en échec reste en attente."""
+    def fail(op):
+        raise RuntimeError("échec")
+
+    migrations = load_migrations() + [Migration(999, "Migration en échec", fail)]
+
+    with pytest.raises(RuntimeError):
+        upgrade(migration_engine, migrations=migrations)
+
+    assert migration_status(migration_engine, migrations)[-1][1] is None
+
+
+def test_search_index_migration(migration_engine):
+    """Vérifie que la migration de l'index plein texte indexe les lignes déjà présentes."""
+    Base.metadata.create_all(migration_engine)
+    with migration_engine.begin() as connection:
+        drop_search_index(connection)
+        connection.execute(insert(Customer).values(first_name="Ada", last_name="Lovelace", email="ada@test.com"))
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        rowids = connection.exec_driver_sql("SELECT rowid FROM search_index WHERE search_index MATCH 'lovelace'")
+        assert rowids.scalars().all() == [1 * SEARCH_KINDS_FACTOR + SEARCH_SOURCES["customer"][0]]
+
+
+def test_fulltext_index_ddl_mysql(mocker):
+    """Vérifie que les index FULLTEXT sont créés sur place sous MySQL, les écritures étant bloquées."""
+    connection = mocker.MagicMock()
+    connection.dialect = mysql.dialect()
+    op = Operations(connection)
+    mocker.patch.object(op, "has_index", return_value=False)
+
+    assert op.create_index(find_index(Base.metadata, "ft_customer_search")) is True
+
+    ddl = connection.exec_driver_sql.call_args.args[0]
+    assert ddl.startswith("CREATE FULLTEXT INDEX ft_customer_search ON customer "
+                          "(first_name, last_name, email, company)")
+    assert ddl.endswith("ALGORITHM=INPLACE LOCK=SHARED")
+
+
+def test_sales_summary_migration(migration_engine):
+    """Vérifie que la migration du résumé des ventes le calcule à partir des contrats existants."""
+    upgrade(migration_engine, target=4)
+    with migration_engine.begin() as connection:
+        customer_id = connection.execute(
+            insert(Customer).values(first_name="Ada", last_name="Lovelace", email="ada@test.com")
+        ).inserted_primary_key[0]
+        connection.execute(insert(Contract).values(customer_id=customer_id, total_amount=100, remaining_amount=40))
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        summary = connection.execute(select(SalesSummary.contracts, SalesSummary.total_amount)).all()
+    assert summary == [(1, Decimal("100.00"))]
+
+
+def test_sqlite_timestamp_format_migration(migration_engine):
+    """Vérifie que les dates SQLite écrites avec des microsecondes sont ramenées à la seconde."""
+    upgrade(migration_engine, target=5)
+    with migration_engine.begin() as connection:
+        connection.execute(insert(Customer).values(first_name="Ada", last_name="Lovelace", email="ada@test.com"))
+        connection.exec_driver_sql("UPDATE customer SET updated_at = '2026-10-18 15:42:19.000000'")
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        created_at, updated_at = connection.exec_driver_sql("SELECT created_at, updated_at FROM customer").one()
+    assert updated_at == "2026-10-18 15:42:19"
+    assert len(created_at) == 19
@@ -0,0 +1,127 @@
+import pytest
+import threading
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+from app.db import database
+from app.db.pool import InstrumentedQueuePool, POOL_STATS
+
+
+@pytest.fixture
+def pool_engine(tmp_path):
+    """Moteur SQLite avec un pool instrumenté d'une connexion et d'un débordement."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=1)
+    POOL_STATS.reset()
+    POOL_STATS.attach(engine)
+    yield engine
+    engine.dispose()
+    POOL_STATS.engine = None
+
+
+def test_pool_stats_checkout_checkin(pool_engine):
+    """Vérifie le comptage des sorties et retours de connexions."""
+    with pool_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert POOL_STATS.snapshot()["checked_out"] == 1
+
+    stats = POOL_STATS.snapshot()
+    assert stats["connections"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["checkins"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["wait_avg_ms"] >= 0
+
+
+def test_pool_stats_overflow(pool_engine):
+    """Vérifie la mesure du débordement du pool."""
+    first = pool_engine.connect()
+    second = pool_engine.connect()
+
+    stats = POOL_STATS.snapshot()
+    assert stats["overflow"] == 1
+    assert stats["peak_checked_out"] == 2
+
+    first.close()
+    second.close()
+
+    stats = POOL_STATS.snapshot()
+    assert stats["peak_overflow"] == 1
+    assert stats["checked_out"] == 0
+
+
+def test_pool_wait_excludes_connection_setup(pool_engine):
+    """Vérifie que l'ouverture d'une connexion et les écouteurs de checkout ne comptent pas dans l'attente."""
+    def slow(*args):
+        time.sleep(0.05)
+
+    event.listen(pool_engine, "connect", slow)
+    event.listen(pool_engine, "checkout", slow)
+
+    with pool_engine.connect():
+        pass
+
+    stats = POOL_STATS.snapshot()
+    assert stats["connections"] == 1
+    assert stats["wait_max_ms"] < 50
+
+
+def test_pool_wait_measures_queue(tmp_path):
+    """Vérifie que l'attente d'une connexion rendue par un autre thread est mesurée."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=5,
+                           connect_args={"check_same_thread": False})
+    POOL_STATS.reset()
+    POOL_STATS.attach(engine)
+
+    first = engine.connect()
+    releaser = threading.Timer(0.1, first.close)
+    releaser.start()
+    try:
+        with engine.connect():
+            pass
+    finally:
+        releaser.join()
+        engine.dispose()
+        POOL_STATS.engine = None
+
+    assert POOL_STATS.snapshot()["wait_max_ms"] >= 90
+
+
+def test_engine_options(monkeypatch):
+    """Vérifie que les options du moteur reprennent la configuration."""
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(database, "DB_ISOLATION_LEVEL", "READ COMMITTED")
+
+    options = database.engine_options()
+
+    assert options["pool_size"] == 3
+    assert options["isolation_level"] == "READ COMMITTED"
+    assert options["poolclass"] is InstrumentedQueuePool
+
+
+def test_engine_options_sqlite_file():
+    """Vérifie que SQLite conserve le pool instrumenté sans les options propres à MySQL."""
+    options = database.engine_options("sqlite:///epic_events.db")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["connect_args"] == {"timeout": database.DB_CONNECT_TIMEOUT}
+    assert "pool_recycle" not in options
+
+
+def test_engine_options_sqlite_memory():
+    """Vérifie qu'une base SQLite en mémoire utilise une connexion unique partagée."""
+    options = database.engine_options("sqlite://")
+
+    assert options["poolclass"] is StaticPool
+    assert "pool_size" not in options
+
+
+def test_create_database_engine_sqlite_foreign_keys():
+    """Vérifie que les clés étrangères sont activées sur les connexions SQLite."""
+    engine = database.create_database_engine("sqlite://")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+    engine.dispose()
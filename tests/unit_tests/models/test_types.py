@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select, text
+from app.crud import contract as crud_contract
+from app.models.models import Contract, Customer, Event
+from app.models.types import unindexed
+
+
+def test_money_is_exact(session):
+    """Vérifie que les montants sont relus exactement, sans erreur d'arrondi de nombre flottant."""
+    contract = session.get(Contract, 1)
+    contract.total_amount = Decimal("0.1") + Decimal("0.2")
+    contract.remaining_amount = 0.3
+    session.commit()
+    session.expire_all()
+
+    contract = session.get(Contract, 1)
+    assert contract.total_amount == Decimal("0.30")
+    assert contract.remaining_amount == Decimal("0.30")
+
+
+def test_money_stored_as_cents_in_sqlite(session):
+    """Vérifie que SQLite stocke les montants en centimes et que les filtres les convertissent."""
+    if session.get_bind().dialect.name != "sqlite":
+        pytest.skip("Stockage en centimes propre à SQLite.")
+
+    assert session.execute(text("SELECT total_amount FROM contract WHERE id = 1")).scalar() == 100000
+
+    contracts = crud_contract.get_contracts(session, {"total_amount": "2000.00..3000"})
+    assert [contract.id for contract in contracts] == [2, 3, 4]
+
+
+def test_money_sum(session):
+    """Vérifie que les agrégats sur un montant sont renvoyés en Decimal."""
+    total = session.execute(select(func.sum(Contract.total_amount))).scalar()
+    assert total == Decimal("14500.00")
+
+
+def test_timestamp_accepts_text(session):
+    """Vérifie qu'une date au format texte est enregistrée comme un TIMESTAMP."""
+    event = session.get(Event, 1)
+    event.start_date = "2024-01-02 03:04:05"
+    session.commit()
+    session.expire_all()
+
+    assert session.get(Event, 1).start_date == datetime(2024, 1, 2, 3, 4, 5)
+
+
+def test_local_now_default(session):
+    """Vérifie que les dates de création et de mise à jour sont renseignées par la base, à l'heure locale."""
+    customer = session.get(Customer, 1)
+    assert abs((datetime.now() - customer.created_at).total_seconds()) < 60
+
+    customer.first_name = "Davy"
+    session.commit()
+    session.refresh(customer)
+    assert customer.updated_at >= customer.created_at
+
+
+def test_unindexed(session):
+    """Vérifie qu'une colonne unindexed reste comparable mais n'est plus proposée aux index sous SQLite."""
+    query = select(Event.id).where(unindexed(Event.start_date) < datetime(2023, 6, 22))
+    assert session.execute(query).scalars().all() == [1]
+
+    sql = str(query.compile(dialect=session.get_bind().dialect))
+    assert ("+event.start_date" in sql) == (session.get_bind().dialect.name == "sqlite")
@@ -0,0 +1,55 @@
+import io
+import json
+import pytest
+from app.ui import formats
+
+
+ROWS = [
+    {"id": 1, "name": "Alice", "amount": None},
+    {"id": 2, "name": "Bob\tMartin", "amount": 10},
+]
+
+
+def test_detect_format():
+    """Vérifie la détection du format à partir de l'extension."""
+    assert formats.detect_format("clients.CSV") == "csv"
+    assert formats.detect_format("clients.jsonl") == "ndjson"
+    with pytest.raises(ValueError):
+        formats.detect_format("clients.xlsx")
+
+
+def test_read_rows_csv_and_ndjson(tmp_path):
+    """Vérifie la lecture ligne à ligne des fichiers CSV et NDJSON."""
+    csv_file = tmp_path / "rows.csv"
+    csv_file.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+    assert list(formats.read_rows(csv_file)) == [(2, {"id": "1", "name": "Alice"}), (3, {"id": "2", "name": "Bob"})]
+
+    ndjson_file = tmp_path / "rows.ndjson"
+    ndjson_file.write_text('{"id": 1}\n\n{invalide\n[1]\n', encoding="utf-8")
+    rows = list(formats.read_rows(ndjson_file))
+    assert rows[0] == (1, {"id": 1})
+    assert rows[1][0] == 3 and "JSON invalide" in rows[1][1]["_error"]
+    assert rows[2] == (4, {"_error": "La ligne n'est pas un objet JSON."})
+
+
+@pytest.mark.parametrize("file_format, expected", [
+    ("csv", "id,name\n1,Alice\n2,Bob\tMartin\n"),
+    ("tsv", 'id\tname\n1\tAlice\n2\t"Bob\tMartin"\n'),
+    ("ndjson", '{"id": 1, "name": "Alice"}\n{"id": 2, "name": "Bob\\tMartin"}\n'),
+])
+def test_write_rows(file_format, expected):
+    """Vérifie l'écriture des lignes (colonnes sélectionnées uniquement) dans chaque format."""
+    stream = io.StringIO()
+    assert formats.write_rows(stream, file_format, ["id", "name"], iter(ROWS)) == 2
+    assert stream.getvalue() == expected
+
+
+def test_write_rows_json():
+    """Vérifie que le format json produit un tableau valide, y compris sans ligne."""
+    stream = io.StringIO()
+    formats.write_rows(stream, "json", ["id", "amount"], iter(ROWS))
+    assert json.loads(stream.getvalue()) == [{"id": 1, "amount": None}, {"id": 2, "amount": 10}]
+
+    stream = io.StringIO()
+    formats.write_rows(stream, "json", ["id"], iter([]))
+    assert json.loads(stream.getvalue()) == []